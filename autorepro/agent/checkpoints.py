@@ -0,0 +1,72 @@
+"""Durable graph checkpoints — LangGraph SQLite savers under DATA_DIR/cache/checkpoints.sqlite.
+
+Each job runs as its own checkpoint thread (thread_id = job_id), so the state after every completed
+node is on disk. A job interrupted by a restart is requeued at startup and resumes from its last
+checkpoint instead of starting over at analyze; a job's checkpoints are deleted once it finishes.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import weakref
+from pathlib import Path
+
+import aiosqlite
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from utils import config
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+_saver: SqliteSaver | None = None
+_async_savers              = weakref.WeakKeyDictionary()  # event loop -> AsyncSqliteSaver
+_lock                      = threading.Lock()
+
+
+def _path() -> Path:
+    path = Path(config.DATA_DIR) / "cache" / "checkpoints.sqlite"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def saver() -> SqliteSaver:
+    """The shared sync saver, opened on first use."""
+    global _saver
+    with _lock:
+        if _saver is None:
+            conn = sqlite3.connect(_path(), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            _saver = SqliteSaver(conn)
+            _saver.setup()
+        return _saver
+
+
+def async_saver() -> AsyncSqliteSaver:
+    """The async saver for the running event loop; it is bound to the loop it was created on."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        if loop not in _async_savers:
+            _async_savers[loop] = AsyncSqliteSaver(aiosqlite.connect(_path()))
+        return _async_savers[loop]
+
+
+def thread(job_id: str) -> RunnableConfig:
+    """Graph config that checkpoints a run under the job's id."""
+    return {"configurable": {"thread_id": job_id}}
+
+
+def discard(job_id: str) -> None:
+    """Delete a finished job's checkpoints."""
+    if config.CHECKPOINTS_ENABLED:
+        saver().delete_thread(job_id)
+
+
+async def aclose() -> None:
+    """At shutdown: close the running loop's async saver, whose connection thread would keep the process alive."""
+    with _lock:
+        saver = _async_savers.pop(asyncio.get_running_loop(), None)
+    if saver is not None:
+        await saver.conn.close()
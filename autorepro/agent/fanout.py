@@ -0,0 +1,33 @@
+"""Speculative fan-out — K diverse candidate scripts per attempt, raced in parallel sandboxes."""
+
+from utils import config
+
+# Appended to the generate/refine prompt so candidates differ in how they find elements, not
+# just in sampling noise. Candidate 0 gets no hint and matches the single-script prompt.
+LOCATOR_HINTS = (
+    "",
+    "Locator strategy for this variant: prefer id, name and data-* attribute selectors.",
+    "Locator strategy for this variant: prefer XPath expressions anchored on visible text and labels.",
+    "Locator strategy for this variant: prefer CSS selectors built from element structure and classes.",
+    "Locator strategy for this variant: prefer link text, ARIA roles and accessible labels.",
+)
+
+
+def enabled() -> bool:
+    return config.FANOUT_K > 1
+
+
+def variants(base_temperature: float) -> list[tuple[float, str]]:
+    """(temperature, prompt suffix) for each of the FANOUT_K candidates."""
+    temps = config.FANOUT_TEMPERATURES
+    out   = []
+    for i in range(config.FANOUT_K):
+        temperature = base_temperature if i == 0 else temps[(i - 1) % len(temps)]
+        hint        = LOCATOR_HINTS[i % len(LOCATOR_HINTS)]
+        out.append((temperature, f"\n\n{hint}" if hint else ""))
+    return out
+
+
+def distinct(scripts: list[str]) -> list[str]:
+    """Drop identical candidates, keeping the first occurrence of each."""
+    return list(dict.fromkeys(scripts))
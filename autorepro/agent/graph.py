@@ -1,13 +1,22 @@
 """LangGraph state machine definition — nodes, edges, and conditional routing."""
 
+import asyncio
+import functools
+import inspect
+import time
+import weakref
+
 from langgraph.graph import StateGraph, END
+from langgraph.graph.state import CompiledStateGraph
 
+from agent import checkpoints
 from agent.state import AgentState
-from agent.nodes.analyze  import analyze_node
-from agent.nodes.generate import generate_node
-from agent.nodes.execute  import execute_node
+from agent.nodes.analyze  import analyze_node, analyze_node_async
+from agent.nodes.generate import generate_node, generate_node_async
+from agent.nodes.execute  import execute_node, execute_node_async
 from agent.nodes.evaluate import evaluate_node
-from agent.nodes.refine   import refine_node
+from agent.nodes.refine   import refine_node, refine_node_async
+from utils import config, events, metrics, tracing
 
 
 def route_after_evaluate(state: AgentState) -> str:
@@ -19,21 +28,85 @@ def route_after_evaluate(state: AgentState) -> str:
     return "end_failure"
 
 
-graph = StateGraph(AgentState)
-graph.add_node("analyze",  analyze_node)
-graph.add_node("generate", generate_node)
-graph.add_node("execute",  execute_node)
-graph.add_node("evaluate", evaluate_node)
-graph.add_node("refine",   refine_node)
-graph.set_entry_point("analyze")
-graph.add_edge("analyze",  "generate")
-graph.add_edge("generate", "execute")
-graph.add_edge("execute",  "evaluate")
-graph.add_conditional_edges("evaluate", route_after_evaluate, {
-    "end_success": END,
-    "refine":      "refine",
-    "end_failure": END,
-})
-graph.add_edge("refine", "generate")
-
-compiled = graph.compile()
+def route_after_refine(state: AgentState) -> str:
+    """Fan-out refine already produced the next race's candidates; otherwise regenerate as before."""
+    return "execute" if state.get("candidates") else "generate"
+
+
+def _traced(name: str, node):
+    """Wrap a node so watchers get node_start/node_end events, and its time lands in the job's
+    timing summary and /metrics. Work done inside the node is attributed to it (see utils.tracing)."""
+    def start(state: AgentState) -> float:
+        events.publish(state["job_id"], "node_start", node=name, attempt=state["attempt_count"])
+        return time.perf_counter()
+
+    def end(state: AgentState, update: dict, started: float) -> None:
+        seconds = time.perf_counter() - started
+        tracing.record(state["job_id"], f"node.{name}", seconds)
+        metrics.NODE_SECONDS.observe(seconds, node=name)
+        events.publish(state["job_id"], "node_end", node=name,
+                       attempt=update.get("attempt_count", state["attempt_count"]),
+                       duration=round(seconds, 3))
+
+    if inspect.iscoroutinefunction(node):
+        @functools.wraps(node)
+        async def traced_async(state: AgentState) -> dict:
+            started = start(state)
+            with tracing.node_scope(state["job_id"], name):
+                update = await node(state)
+            end(state, update, started)
+            return update
+        return traced_async
+
+    @functools.wraps(node)
+    def traced(state: AgentState) -> dict:
+        started = start(state)
+        with tracing.node_scope(state["job_id"], name):
+            update = node(state)
+        end(state, update, started)
+        return update
+    return traced
+
+
+def build_graph(analyze, generate, execute, refine) -> StateGraph:
+    """Wire the analyze → generate → execute → evaluate → refine loop from the given node callables."""
+    graph = StateGraph(AgentState)
+    graph.add_node("analyze",  _traced("analyze",  analyze))
+    graph.add_node("generate", _traced("generate", generate))
+    graph.add_node("execute",  _traced("execute",  execute))
+    graph.add_node("evaluate", _traced("evaluate", evaluate_node))
+    graph.add_node("refine",   _traced("refine",   refine))
+    graph.set_entry_point("analyze")
+    graph.add_edge("analyze",  "generate")
+    graph.add_edge("generate", "execute")
+    graph.add_edge("execute",  "evaluate")
+    graph.add_conditional_edges("evaluate", route_after_evaluate, {
+        "end_success": END,
+        "refine":      "refine",
+        "end_failure": END,
+    })
+    graph.add_conditional_edges("refine", route_after_refine, {
+        "execute":  "execute",
+        "generate": "generate",
+    })
+    return graph
+
+
+_graph       = build_graph(analyze_node, generate_node, execute_node, refine_node)
+_graph_async = build_graph(analyze_node_async, generate_node_async, execute_node_async, refine_node_async)
+_compiled_async: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()  # event loop -> graph
+
+
+@functools.cache
+def compiled() -> CompiledStateGraph:
+    """The sync graph, checkpointing every node transition when CHECKPOINTS_ENABLED."""
+    return _graph.compile(checkpointer=checkpoints.saver() if config.CHECKPOINTS_ENABLED else None)
+
+
+def compiled_async() -> CompiledStateGraph:
+    """The async graph for the running event loop, whose async checkpointer is bound to that loop."""
+    loop = asyncio.get_running_loop()
+    if loop not in _compiled_async:
+        _compiled_async[loop] = _graph_async.compile(
+            checkpointer=checkpoints.async_saver() if config.CHECKPOINTS_ENABLED else None)
+    return _compiled_async[loop]
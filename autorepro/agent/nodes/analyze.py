@@ -1,47 +1,89 @@
 """Node 1 — LLM bug analysis: parse bug report into structured AnalysisResult JSON."""
 
 import json
-from pathlib import Path
 
 from agent.state import AgentState
+from prompts import registry
 from utils import config
+from utils import llm as llm_clients
 from utils.logger import get_logger
 
 log = get_logger(__name__)
 
+TEMPERATURE  = 0
+RETRY_SUFFIX = "\n\nYour previous response was not valid JSON. Return ONLY raw JSON."
 
-def _get_llm():
-    """Return the configured LLM instance."""
-    if config.LLM_PROVIDER == "mock":
-        from utils.mock_llm import MockLLM
-        return MockLLM()
-    if config.LLM_PROVIDER == "anthropic":
-        from langchain_anthropic import ChatAnthropic
-        return ChatAnthropic(model=config.LLM_MODEL, temperature=0)
-    from langchain_openai import ChatOpenAI
-    return ChatOpenAI(model=config.LLM_MODEL, temperature=0)
 
+def _build_prompt(state: AgentState) -> str:
+    return registry.get("analyze").format(bug_report=state["bug_report"], target_url=state["target_url"])
 
-def analyze_node(state: AgentState) -> AgentState:
+
+def _parse(content: str) -> dict:
+    """Parse and validate the analysis JSON. Raises JSONDecodeError/ValueError when malformed."""
+    analysis = json.loads(content)
+    required = {"inferred_steps", "target_elements", "expected_behavior",
+                "success_condition", "risk_factors"}
+    if not required.issubset(analysis.keys()):
+        raise ValueError(f"Missing keys: {required - analysis.keys()}")
+    return analysis
+
+
+def analyze_node(state: AgentState) -> dict:
     """Node 1: Parse bug report into structured AnalysisResult JSON."""
-    template = Path("prompts/analyze.txt").read_text()
-    prompt   = template.format(bug_report=state["bug_report"], target_url=state["target_url"])
-    llm      = _get_llm()
+    prompt = _build_prompt(state)
+    llm    = llm_clients.get(TEMPERATURE, cache=not state.get("bypass_cache"))
 
     for attempt in range(2):
         response = llm.invoke(prompt)
-        content  = response.content.strip()
         try:
-            analysis = json.loads(content)
-            required = {"inferred_steps", "target_elements", "expected_behavior",
-                        "success_condition", "risk_factors"}
-            if not required.issubset(analysis.keys()):
-                raise ValueError(f"Missing keys: {required - analysis.keys()}")
+            analysis = _parse(response.content.strip())
+            log.info("analyze_success", job_id=state["job_id"])
+            return {"analysis": analysis}
+        except (json.JSONDecodeError, ValueError) as e:
+            log.warning("analyze_parse_error", attempt=attempt, error=str(e))
+            llm.discard(prompt)
+            if attempt == 0:
+                prompt += RETRY_SUFFIX
+
+    raise RuntimeError("analyze_node: LLM returned malformed JSON after 2 attempts")
+
+
+async def analyze_node_async(state: AgentState) -> dict:
+    """Async variant of analyze_node using llm.ainvoke."""
+    prompt = _build_prompt(state)
+    llm    = llm_clients.get(TEMPERATURE, cache=not state.get("bypass_cache"))
+
+    for attempt in range(2):
+        response = await llm.ainvoke(prompt)
+        try:
+            analysis = _parse(response.content.strip())
             log.info("analyze_success", job_id=state["job_id"])
-            return {**state, "analysis": analysis}
+            return {"analysis": analysis}
         except (json.JSONDecodeError, ValueError) as e:
             log.warning("analyze_parse_error", attempt=attempt, error=str(e))
+            llm.discard(prompt)
             if attempt == 0:
-                prompt += "\n\nYour previous response was not valid JSON. Return ONLY raw JSON."
+                prompt += RETRY_SUFFIX
 
     raise RuntimeError("analyze_node: LLM returned malformed JSON after 2 attempts")
+
+
+def prime(reports: list[tuple[str, str]]) -> int:
+    """Warm the response cache for many (bug_report, target_url) pairs with one batched LLM call.
+
+    Used for bulk submissions so each job's analyze step is a cache hit. Responses that do not
+    parse are dropped from the cache again. Returns how many analyses were primed.
+    """
+    llm = llm_clients.get(TEMPERATURE)
+    if not llm.enabled or not reports:
+        return 0
+    prompts = list(dict.fromkeys(_build_prompt({"bug_report": r, "target_url": u}) for r, u in reports))
+    primed  = 0
+    for prompt, response in zip(prompts, llm.batch(prompts, max_concurrency=config.BATCH_CONCURRENCY)):
+        try:
+            _parse(response.content.strip())
+            primed += 1
+        except (json.JSONDecodeError, ValueError):
+            llm.discard(prompt)
+    log.info("analyze_primed", prompts=len(prompts), primed=primed)
+    return primed
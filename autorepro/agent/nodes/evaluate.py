@@ -6,25 +6,21 @@ from utils.logger import get_logger
 log = get_logger(__name__)
 
 
-def evaluate_node(state: AgentState) -> AgentState:
-    """Node 4: Deterministic success/failure classifier. Zero LLM calls."""
+def evaluate_node(state: AgentState) -> dict:
+    """Node 4: Deterministic success/failure classifier. Zero LLM calls.
+
+    Success and the failure type were decided by the sandbox classifier while the whole output
+    streamed in, before it was cut to its head and tail; this node normalises the type onto FailureType.
+    """
     result  = state["execution_result"]
-    stdout  = result.get("stdout", "")
-    stderr  = result.get("stderr", "")
-    success = "REPRODUCED" in stdout
+    success = bool(result.get("reproduced"))
 
     if not success:
-        if "NoSuchElementException" in stderr:
-            failure_type = FailureType.ELEMENT_NOT_FOUND
-        elif "TimeoutException" in stderr:
-            failure_type = FailureType.TIMEOUT
-        elif "AssertionError" in stderr:
-            failure_type = FailureType.ASSERTION_ERROR
-        elif "ConnectionRefused" in stdout or "5xx" in stdout:
-            failure_type = FailureType.NETWORK_ERROR
-        else:
+        try:
+            failure_type = FailureType(result.get("error_type"))
+        except ValueError:
             failure_type = FailureType.UNKNOWN
         result = {**result, "error_type": failure_type.value}
 
     log.info("evaluate_complete", job_id=state["job_id"], success=success, attempt=state["attempt_count"])
-    return {**state, "success": success, "execution_result": result}
+    return {"success": success, "execution_result": result}
@@ -1,40 +1,193 @@
-"""Node 3 — Docker execution: write script to disk and run in sandbox (no LLM)."""
+"""Node 3 — sandbox execution: write script to disk and run it on the configured backend (no LLM)."""
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 from agent.state import AgentState
 from sandbox import runner
+from sandbox.log_stream import LogCollector
 from sandbox.security import SecurityError
+from storage import attempts, locators
 from utils import config
 from utils.logger import get_logger
 
 log = get_logger(__name__)
 
 
-def execute_node(state: AgentState) -> AgentState:
-    """Node 3: Write script to disk and run it in the Docker sandbox."""
+def _artifacts_dir(state: AgentState) -> Path:
+    return Path(config.DATA_DIR) / "artifacts" / state["job_id"]
+
+
+def _write_script(state: AgentState) -> tuple[int, Path]:
     attempt_num   = state["attempt_count"] + 1
-    artifacts_dir = Path(config.DATA_DIR) / "artifacts" / state["job_id"]
+    artifacts_dir = _artifacts_dir(state)
     artifacts_dir.mkdir(parents=True, exist_ok=True)
     script_path   = artifacts_dir / f"attempt_{attempt_num}.py"
     script_path.write_text(state["script"])
+    return attempt_num, script_path
+
+
+def _security_result(e: SecurityError) -> dict:
+    return {
+        "stdout": "", "stderr": str(e), "exit_code": -1, "reproduced": False,
+        "error_type": "SecurityViolation", "error_message": str(e),
+        "stack_trace": None, "screenshot_paths": [], "duration_seconds": 0,
+    }
+
+
+def _timeout_result() -> dict:
+    return {
+        "stdout": "", "stderr": "Execution timed out.", "exit_code": -1, "reproduced": False,
+        "error_type": "Timeout", "error_message": "Container timeout",
+        "stack_trace": None, "screenshot_paths": [], "duration_seconds": config.SANDBOX_TIMEOUT_SECONDS,
+    }
+
+
+def _record(state: AgentState, attempt_num: int, result: dict) -> dict:
+    """Append the full attempt to the job's log and teach the locator index; state only keeps its compact summary."""
+    entry = attempts.record_attempt(state["job_id"], attempt_num, state["script"], result)
+    locators.learn(state["target_url"], state["script"], result, _artifacts_dir(state))
+    log.info("execute_complete", job_id=state["job_id"], attempt=attempt_num, exit_code=result["exit_code"])
+    return {"attempt_count": attempt_num, "execution_result": result, "history": [*state["history"], entry],
+            "candidate_runs": []}
+
+
+def _write_candidates(state: AgentState) -> tuple[int, list[Path]]:
+    attempt_num   = state["attempt_count"] + 1
+    artifacts_dir = _artifacts_dir(state)
+    artifacts_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i, script in enumerate(state["candidates"]):
+        path = artifacts_dir / f"attempt_{attempt_num}_{i}.py"
+        path.write_text(script)
+        paths.append(path)
+    return attempt_num, paths
+
+
+def _reproduced(result: dict | None) -> bool:
+    return result is not None and bool(result.get("reproduced"))
+
 
+def _record_race(state: AgentState, attempt_num: int, results: list[dict | None], finished: list[int]) -> dict:
+    """Log every candidate that ran; the first to reproduce, in finishing order, stands for the attempt
+    (or candidate 0's failure if none did)."""
+    ran = [(i, script, result) for i, (script, result) in enumerate(zip(state["candidates"], results))
+           if result is not None]
+    for i, script, result in ran:
+        attempts.record_candidate(state["job_id"], attempt_num, i, script, result)
+    by_index = {run[0]: run for run in ran}
+    winner   = next((by_index[i] for i in finished if i in by_index and _reproduced(by_index[i][2])), ran[0])
+    for run in ran:
+        if run is not winner:  # _record teaches the index the winner's outcome
+            locators.learn(state["target_url"], run[1], run[2], _artifacts_dir(state))
+    update = _record({**state, "script": winner[1]}, attempt_num, winner[2])
+    update["history"][-1] = {**update["history"][-1], "candidates": len(ran)}
+    log.info("execute_race_complete", job_id=state["job_id"], attempt=attempt_num,
+             candidates=len(state["candidates"]), ran=len(ran), winner=winner[0] if _reproduced(winner[2]) else None)
+    return {
+        **update,
+        "script":         winner[1],
+        "candidate_runs": [{"candidate": i, "script": script, "result": result}
+                           for i, script, result in ran if not _reproduced(result)],
+    }
+
+
+def _race(state: AgentState) -> dict:
+    """Run every candidate concurrently; the first to reproduce cancels the rest."""
+    attempt_num, paths = _write_candidates(state)
+    collectors         = [LogCollector(state["job_id"]) for _ in paths]
+
+    def run_one(i: int) -> dict | None:
+        try:
+            return runner.run(str(paths[i]), state["job_id"], collector=collectors[i], shared_session=False)
+        except SecurityError as e:
+            return _security_result(e)
+        except runner.TimeoutError:
+            return _timeout_result()
+        except runner.Cancelled:
+            return None
+
+    results  = [None] * len(paths)
+    finished = []
+    with ThreadPoolExecutor(max_workers=len(paths), thread_name_prefix="fanout") as ex:
+        futures = {ex.submit(run_one, i): i for i in range(len(paths))}
+        try:
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                finished.append(futures[future])
+                if _reproduced(results[futures[future]]):
+                    for c in collectors:
+                        c.cancel()
+        except Exception:
+            for c in collectors:
+                c.cancel()
+            raise
+    return _record_race(state, attempt_num, results, finished)
+
+
+async def _race_async(state: AgentState) -> dict:
+    """Async variant of _race."""
+    attempt_num, paths = _write_candidates(state)
+    collectors         = [LogCollector(state["job_id"]) for _ in paths]
+
+    async def run_one(i: int) -> dict | None:
+        try:
+            return await runner.run_async(str(paths[i]), state["job_id"], collector=collectors[i],
+                                          shared_session=False)
+        except SecurityError as e:
+            return _security_result(e)
+        except runner.TimeoutError:
+            return _timeout_result()
+        except runner.Cancelled:
+            return None
+
+    results  = [None] * len(paths)
+    finished = []
+    tasks    = {asyncio.ensure_future(run_one(i)): i for i in range(len(paths))}
+    pending  = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                results[tasks[task]] = task.result()
+                finished.append(tasks[task])
+                if _reproduced(results[tasks[task]]):
+                    for c in collectors:
+                        c.cancel()
+    except BaseException:
+        for c in collectors:
+            c.cancel()
+        raise
+    return await asyncio.to_thread(_record_race, state, attempt_num, results, finished)
+
+
+def execute_node(state: AgentState) -> dict:
+    """Node 3: Write script to disk and run it in the Docker sandbox.
+
+    With several fan-out candidates in state they are raced in parallel sandboxes instead.
+    """
+    if len(state.get("candidates") or []) > 1:
+        return _race(state)
+    attempt_num, script_path = _write_script(state)
     try:
         result = runner.run(str(script_path), state["job_id"])
     except SecurityError as e:
-        result = {
-            "stdout": "", "stderr": str(e), "exit_code": -1,
-            "error_type": "SecurityViolation", "error_message": str(e),
-            "stack_trace": None, "screenshot_paths": [], "duration_seconds": 0,
-        }
+        result = _security_result(e)
     except runner.TimeoutError:
-        result = {
-            "stdout": "", "stderr": "Execution timed out.", "exit_code": -1,
-            "error_type": "Timeout", "error_message": "Container timeout",
-            "stack_trace": None, "screenshot_paths": [], "duration_seconds": config.SANDBOX_TIMEOUT_SECONDS,
-        }
+        result = _timeout_result()
+    return _record(state, attempt_num, result)
 
-    new_history = list(state["history"]) + [{"attempt": attempt_num, "script": state["script"], "result": result}]
-    log.info("execute_complete", job_id=state["job_id"], attempt=attempt_num, exit_code=result["exit_code"])
 
-    return {**state, "attempt_count": attempt_num, "execution_result": result, "history": new_history}
+async def execute_node_async(state: AgentState) -> dict:
+    """Async variant of execute_node; the container run does not block the event loop."""
+    if len(state.get("candidates") or []) > 1:
+        return await _race_async(state)
+    attempt_num, script_path = _write_script(state)
+    try:
+        result = await runner.run_async(str(script_path), state["job_id"])
+    except SecurityError as e:
+        result = _security_result(e)
+    except runner.TimeoutError:
+        result = _timeout_result()
+    return await asyncio.to_thread(_record, state, attempt_num, result)
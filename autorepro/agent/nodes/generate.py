@@ -1,26 +1,24 @@
 """Node 2 — LLM script generation: analysis → Python/Selenium script."""
 
 import ast
+import asyncio
 import json
-from pathlib import Path
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
 
+from agent import fanout
 from agent.state import AgentState
-from utils import config
+from prompts import budget, registry
+from storage import fragments, locators
+from utils import config, tracing
+from utils import llm as llm_clients
+from utils.llm_cache import CachedLLM
 from utils.logger import get_logger
 
 log = get_logger(__name__)
 
 
-def _get_llm():
-    """Return the configured LLM instance with slight temperature for creativity."""
-    if config.LLM_PROVIDER == "mock":
-        from utils.mock_llm import MockLLM
-        return MockLLM()
-    if config.LLM_PROVIDER == "anthropic":
-        from langchain_anthropic import ChatAnthropic
-        return ChatAnthropic(model=config.LLM_MODEL, temperature=0.2)
-    from langchain_openai import ChatOpenAI
-    return ChatOpenAI(model=config.LLM_MODEL, temperature=0.2)
+TEMPERATURE = 0.2
 
 
 def _strip_fences(text: str) -> str:
@@ -33,31 +31,90 @@ def _strip_fences(text: str) -> str:
     return "\n".join(lines)
 
 
-def generate_node(state: AgentState) -> AgentState:
-    """Node 2: Generate a Python/Selenium script from the structured analysis."""
-    prior = "\n".join(
-        f"Attempt {h['attempt']}: {h.get('refinement_note', 'No note')}"
-        for h in state["history"]
+def _build_prompt(state: AgentState) -> str:
+    prior = "\n".join(budget.dedupe_notes([
+        (h["attempt"], h.get("refinement_note", "No note")) for h in state["history"]
+    ])) or "None"
+
+    verified = fragments.lookup(state["target_url"], state["analysis"].get("inferred_steps") or [])
+    offered  = "\n\n".join(
+        f"# @fragment {f.id} — step {f.step}: {f.text}\n{textwrap.indent(f.code, '    ')}" for f in verified
     ) or "None"
 
-    template = Path("prompts/generate.txt").read_text()
-    prompt   = template.format(
-        analysis_json=json.dumps(state["analysis"], indent=2),
-        target_url=state["target_url"],
-        prior_failures=prior,
-    )
-    llm = _get_llm()
+    return budget.assemble("generate", registry.get("generate"), [
+        budget.Section("analysis_json",  json.dumps(state["analysis"], indent=2), budget.REQUIRED),
+        budget.Section("target_url",     state["target_url"], budget.REQUIRED),
+        budget.Section("prior_failures", prior, budget.MEDIUM, "tail"),
+        budget.Section("known_elements", locators.describe(state["target_url"]), budget.MEDIUM),
+        budget.Section("fragments",      offered, budget.LOW),
+    ]).text
+
 
+def _generate(llm: CachedLLM, prompt: str, job_id: str) -> str:
+    """Ask for a script, retrying once with the syntax error appended if it does not parse."""
     for attempt in range(2):
         response = llm.invoke(prompt)
-        script   = _strip_fences(response.content)
+        script   = fragments.expand(_strip_fences(response.content))
         try:
             ast.parse(script)
-            log.info("generate_success", job_id=state["job_id"])
-            return {**state, "script": script}
+            log.info("generate_success", job_id=job_id)
+            return script
         except SyntaxError as e:
             log.warning("generate_syntax_error", attempt=attempt, error=str(e))
+            llm.discard(prompt)
             if attempt == 0:
                 prompt += f"\n\nSyntax error: {e}. Fix it and return ONLY the corrected script."
+    return script
+
+
+async def _generate_async(llm: CachedLLM, prompt: str, job_id: str) -> str:
+    for attempt in range(2):
+        response = await llm.ainvoke(prompt)
+        script   = await asyncio.to_thread(fragments.expand, _strip_fences(response.content))
+        try:
+            ast.parse(script)
+            log.info("generate_success", job_id=job_id)
+            return script
+        except SyntaxError as e:
+            log.warning("generate_syntax_error", attempt=attempt, error=str(e))
+            llm.discard(prompt)
+            if attempt == 0:
+                prompt += f"\n\nSyntax error: {e}. Fix it and return ONLY the corrected script."
+    return script
+
+
+def _candidates(scripts: list[str]) -> dict:
+    scripts = fanout.distinct(scripts)
+    return {"script": scripts[0], "candidates": scripts}
+
+
+def generate_node(state: AgentState) -> dict:
+    """Node 2: Generate a Python/Selenium script from the structured analysis.
+
+    In fan-out mode FANOUT_K diverse candidates are generated concurrently instead.
+    """
+    prompt = _build_prompt(state)
+    cache  = config.LLM_CACHE_SAMPLED_NODES and not state.get("bypass_cache")
+    if not fanout.enabled():
+        return {"script": _generate(llm_clients.get(TEMPERATURE, cache), prompt, state["job_id"])}
+
+    with ThreadPoolExecutor(max_workers=config.FANOUT_K, thread_name_prefix="generate") as ex:
+        scripts = list(ex.map(
+            tracing.bind(lambda v: _generate(llm_clients.get(v[0], cache), prompt + v[1], state["job_id"])),
+            fanout.variants(TEMPERATURE),
+        ))
+    return _candidates(scripts)
+
+
+async def generate_node_async(state: AgentState) -> dict:
+    """Async variant of generate_node using llm.ainvoke."""
+    prompt = await asyncio.to_thread(_build_prompt, state)
+    cache  = config.LLM_CACHE_SAMPLED_NODES and not state.get("bypass_cache")
+    if not fanout.enabled():
+        return {"script": await _generate_async(llm_clients.get(TEMPERATURE, cache), prompt, state["job_id"])}
 
-    return {**state, "script": script}
+    scripts = await asyncio.gather(*(
+        _generate_async(llm_clients.get(temperature, cache), prompt + suffix, state["job_id"])
+        for temperature, suffix in fanout.variants(TEMPERATURE)
+    ))
+    return _candidates(list(scripts))
@@ -1,26 +1,22 @@
 """Node 5 — LLM script refinement: rewrite script based on failure feedback."""
 
 import ast
+import asyncio
 import json
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
+from agent import fanout
 from agent.state import AgentState
-from utils import config
+from prompts import budget, registry
+from storage import attempts, fragments
+from utils import config, tracing
+from utils import llm as llm_clients
 from utils.logger import get_logger
 
 log = get_logger(__name__)
 
 
-def _get_llm():
-    """Return the configured LLM instance with moderate temperature for variation."""
-    if config.LLM_PROVIDER == "mock":
-        from utils.mock_llm import MockLLM
-        return MockLLM()
-    if config.LLM_PROVIDER == "anthropic":
-        from langchain_anthropic import ChatAnthropic
-        return ChatAnthropic(model=config.LLM_MODEL, temperature=0.3)
-    from langchain_openai import ChatOpenAI
-    return ChatOpenAI(model=config.LLM_MODEL, temperature=0.3)
+TEMPERATURE = 0.3
 
 
 def _strip_fences(text: str) -> str:
@@ -33,25 +29,45 @@ def _strip_fences(text: str) -> str:
     return "\n".join(lines)
 
 
-def refine_node(state: AgentState) -> AgentState:
-    """Node 5: LLM rewrites the script based on failure feedback."""
-    history_summary = "\n".join(
-        f"Attempt {h['attempt']}: error_type={h['result'].get('error_type')}, note={h.get('refinement_note', 'N/A')}"
+# Structured fields sent as JSON; the bulky ones get their own budgeted sections.
+_FEEDBACK_FIELDS = ("error_type", "error_message", "exit_code", "duration_seconds", "terminated_early",
+                    "truncated", "screenshot_paths")
+
+
+def _build_prompt(state: AgentState) -> str:
+    result  = state["execution_result"]
+    history = budget.dedupe_notes([
+        (h["attempt"], f"error_type={h.get('error_type')}, note={h.get('refinement_note', 'N/A')}")
         for h in state["history"]
-    )
-    template = Path("prompts/refine.txt").read_text()
-    prompt   = template.format(
-        previous_script=state["script"],
-        failure_json=json.dumps(state["execution_result"], indent=2),
-        history_summary=history_summary,
-    )
-    llm      = _get_llm()
-    response = llm.invoke(prompt)
-    content  = response.content.strip()
+    ])
+    output  = f"stdout:\n{result.get('stdout') or ''}\nstderr:\n{result.get('stderr') or ''}"
+    others  = [run for run in state.get("candidate_runs") or [] if run["script"] != state["script"]]
+    other_candidates = ""
+    if others:
+        other_candidates  = "\n\nOther candidate scripts from the same attempt also failed; avoid their mistakes too:\n"
+        other_candidates += "\n".join(
+            f"\n--- CANDIDATE {run['candidate']} ---\n{run['script']}\n--- ITS FAILURE ---\n"
+            f"error_type={run['result'].get('error_type')}, error_message={run['result'].get('error_message')}"
+            for run in others
+        )
+
+    return budget.assemble("refine", registry.get("refine"), [
+        budget.Section("previous_script",  state["script"], budget.REQUIRED),
+        budget.Section("failure_json",     json.dumps({k: result.get(k) for k in _FEEDBACK_FIELDS}, indent=2),
+                       budget.REQUIRED),
+        budget.Section("stack_trace",      result.get("stack_trace") or "None", budget.HIGH, "tail"),
+        budget.Section("error_excerpts",   "\n".join(result.get("error_excerpts") or []) or "None", budget.HIGH),
+        budget.Section("history_summary",  "\n".join(history), budget.MEDIUM, "tail"),
+        budget.Section("other_candidates", other_candidates, budget.MEDIUM),
+        budget.Section("output",           output, budget.LOW, "tail"),
+    ]).text
+
 
+def _apply(state: AgentState, content: str) -> dict:
+    """Split the LLM reply into a refinement note and corrected script and update state."""
     lines            = content.splitlines()
     refinement_note  = " ".join(lines[:2]) if len(lines) >= 2 else content[:200]
-    corrected_script = _strip_fences(content)
+    corrected_script = fragments.expand(_strip_fences(content))
 
     try:
         ast.parse(corrected_script)
@@ -61,6 +77,48 @@ def refine_node(state: AgentState) -> AgentState:
     updated_history = list(state["history"])
     if updated_history:
         updated_history[-1] = {**updated_history[-1], "refinement_note": refinement_note}
+        attempts.record_refinement(state["job_id"], updated_history[-1]["attempt"], refinement_note)
 
     log.info("refine_complete", job_id=state["job_id"], attempt=state["attempt_count"])
-    return {**state, "script": corrected_script, "history": updated_history}
+    return {"script": corrected_script, "history": updated_history, "candidates": []}
+
+
+def _fan_out(state: AgentState, contents: list[str]) -> dict:
+    """Apply the first reply as usual and keep every reply's script as a candidate."""
+    update  = _apply(state, contents[0])
+    scripts = fanout.distinct([update["script"], *(fragments.expand(_strip_fences(c)) for c in contents[1:])])
+    return {**update, "candidates": scripts}
+
+
+def refine_node(state: AgentState) -> dict:
+    """Node 5: LLM rewrites the script based on failure feedback.
+
+    In fan-out mode the feedback covers every failed candidate, and FANOUT_K rewrites are
+    requested concurrently for the next race.
+    """
+    prompt = _build_prompt(state)
+    cache  = config.LLM_CACHE_SAMPLED_NODES and not state.get("bypass_cache")
+    if not fanout.enabled():
+        return _apply(state, llm_clients.get(TEMPERATURE, cache).invoke(prompt).content.strip())
+
+    with ThreadPoolExecutor(max_workers=config.FANOUT_K, thread_name_prefix="refine") as ex:
+        contents = list(ex.map(
+            tracing.bind(lambda v: llm_clients.get(v[0], cache).invoke(prompt + v[1]).content.strip()),
+            fanout.variants(TEMPERATURE),
+        ))
+    return _fan_out(state, contents)
+
+
+async def refine_node_async(state: AgentState) -> dict:
+    """Async variant of refine_node using llm.ainvoke."""
+    prompt = await asyncio.to_thread(_build_prompt, state)
+    cache  = config.LLM_CACHE_SAMPLED_NODES and not state.get("bypass_cache")
+    if not fanout.enabled():
+        response = await llm_clients.get(TEMPERATURE, cache).ainvoke(prompt)
+        return await asyncio.to_thread(_apply, state, response.content.strip())
+
+    responses = await asyncio.gather(*(
+        llm_clients.get(temperature, cache).ainvoke(prompt + suffix)
+        for temperature, suffix in fanout.variants(TEMPERATURE)
+    ))
+    return await asyncio.to_thread(_fan_out, state, [r.content.strip() for r in responses])
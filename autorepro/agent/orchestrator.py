@@ -1,21 +1,48 @@
 """Public entrypoint — runs the full agent loop and persists the result."""
 
+import asyncio
 from datetime import datetime, timezone
+from typing import Callable
 
-from agent.graph import compiled
+from agent import checkpoints
+from agent.graph import compiled, compiled_async
+from agent.nodes.evaluate import evaluate_node
+from agent.nodes.execute import execute_node, execute_node_async
 from agent.state import AgentState
+from sandbox import runner
+from storage import fragments
 from storage import jobs as job_store
-from utils import config
+from utils import config, events, metrics, tracing
 from utils.id_generator import new_job_id
 from utils.logger import get_logger
 
 log = get_logger(__name__)
 
 
-def run_agent(bug_report: str, target_url: str, job_id: str | None = None) -> dict:
-    """Public entrypoint. Runs the full agent loop and persists the result."""
-    if job_id is None:
-        job_id = new_job_id()
+class JobCancelled(Exception):
+    """Raised between graph steps when the job's cancellation hook fires."""
+    pass
+
+
+# Submission metadata written by the API that must survive the job's own saves.
+_META_KEYS = ("tenant", "priority", "fingerprint", "batch_id")
+
+
+def _interrupted(job_id: str) -> AgentState | None:
+    """The state a previous run of the job checkpointed before it was interrupted, if it has nodes left."""
+    if not config.CHECKPOINTS_ENABLED:
+        return None
+    snapshot = compiled().get_state(checkpoints.thread(job_id))
+    return snapshot.values if snapshot.values and snapshot.next else None
+
+
+def _start(bug_report: str, target_url: str, job_id: str, bypass_cache: bool) -> tuple[AgentState, dict, bool]:
+    """Build the initial state, or pick up an interrupted run's checkpointed one, persist the job as
+    processing, and return the state with its metadata and whether it was resumed."""
+    tracing.begin(job_id)
+    existing = job_store.get(job_id) or {}
+    meta     = {k: existing[k] for k in _META_KEYS if k in existing}
+    meta["created_at"] = existing.get("created_at") or datetime.now(timezone.utc).isoformat()
     initial_state: AgentState = {
         "job_id": job_id,
         "bug_report": bug_report,
@@ -27,30 +54,147 @@ def run_agent(bug_report: str, target_url: str, job_id: str | None = None) -> di
         "execution_result": {},
         "success": False,
         "history": [],
+        "bypass_cache": bypass_cache,
+        "candidates": [],
+        "candidate_runs": [],
+    }
+    resumed = _interrupted(job_id)
+    if resumed is not None:
+        initial_state = resumed
+        log.info("agent_resume", job_id=job_id, attempt=resumed["attempt_count"])
+    job_store.save(job_id, {**meta, **initial_state, "status": "processing"})
+    events.publish(job_id, "status", status="processing")
+    return initial_state, meta, resumed is not None
+
+
+def _reuse_state(initial_state: AgentState, reuse_from: str | None) -> AgentState | None:
+    """State seeded with a previous job's verified script, or None if it has none."""
+    if reuse_from is None:
+        return None
+    source = job_store.get(reuse_from) or {}
+    if not (source.get("success") and source.get("final_script")):
+        return None
+    return {**initial_state, "analysis": source.get("analysis", {}), "script": source["final_script"]}
+
+
+def _after_revalidation(initial_state: AgentState, checked: AgentState, reuse_from: str) -> AgentState:
+    """Starting state for the full loop once a revalidation run failed; it counts as attempt 1."""
+    log.info("agent_revalidate", job_id=checked["job_id"], reuse_from=reuse_from, success=checked["success"])
+    return {**initial_state, "attempt_count": checked["attempt_count"], "history": checked["history"]}
+
+
+def _done(final_state: AgentState) -> dict:
+    if final_state["success"]:
+        fragments.record(final_state["target_url"], final_state["analysis"].get("inferred_steps") or [],
+                         final_state["script"])
+    return {
+        **final_state,
+        "status": "done",
+        "final_script": final_state["script"],
+        "completed_at": datetime.now(timezone.utc).isoformat(),
     }
-    job_store.save(job_id, {
+
+
+def _cancelled(final_state: AgentState) -> dict:
+    log.info("agent_cancelled", job_id=final_state["job_id"], attempt=final_state["attempt_count"])
+    return {
+        **final_state,
+        "status": "cancelled",
+        "completed_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def _failed(initial_state: AgentState, e: Exception) -> dict:
+    log.error("agent_error", job_id=initial_state["job_id"], error=str(e))
+    return {
         **initial_state,
-        "status": "processing",
-        "created_at": datetime.now(timezone.utc).isoformat(),
-    })
+        "status": "failed",
+        "error": str(e),
+        "completed_at": datetime.now(timezone.utc).isoformat(),
+    }
 
-    try:
-        final_state = compiled.invoke(initial_state)
-        result = {
-            **final_state,
-            "status": "done",
-            "final_script": final_state["script"],
-            "completed_at": datetime.now(timezone.utc).isoformat(),
-        }
-    except Exception as e:
-        log.error("agent_error", job_id=job_id, error=str(e))
-        result = {
-            **initial_state,
-            "status": "failed",
-            "error": str(e),
-            "completed_at": datetime.now(timezone.utc).isoformat(),
-        }
 
+def _finish(job_id: str, result: dict, meta: dict) -> dict:
+    checkpoints.discard(job_id)
+    timings = tracing.finish(job_id)
+    result  = {**meta, **result, "history_log": f"attempts/{job_id}", "timings": timings}
+    metrics.JOBS.inc(status=result.get("status"), success=str(bool(result.get("success"))).lower())
+    if timings:
+        metrics.JOB_SECONDS.observe(timings["wall_seconds"])
     job_store.save(job_id, result)
+    events.publish(job_id, events.TERMINAL, status=result.get("status"), success=result.get("success"),
+                   attempt_count=result.get("attempt_count"))
     log.info("agent_complete", job_id=job_id, success=result.get("success"))
     return result
+
+
+def run_agent(bug_report: str, target_url: str, job_id: str | None = None,
+              should_cancel: Callable[[], bool] | None = None, bypass_cache: bool = False,
+              reuse_from: str | None = None) -> dict:
+    """Public entrypoint. Runs the full agent loop and persists the result.
+
+    should_cancel is polled after every node; when it returns True the job stops and is
+    persisted with status "cancelled". bypass_cache skips the LLM response cache. reuse_from
+    names a previous successful job whose final script is re-run once first; the LLM loop
+    only starts if that run no longer reproduces the bug. A job whose earlier run was interrupted
+    (e.g. by a restart) resumes from its last checkpointed node instead.
+    """
+    if job_id is None:
+        job_id = new_job_id()
+    initial_state, meta, resumed = _start(bug_report, target_url, job_id, bypass_cache)
+
+    try:
+        reuse = None if resumed else _reuse_state(initial_state, reuse_from)
+        if reuse is not None:
+            checked = {**reuse, **execute_node(reuse)}
+            checked = {**checked, **evaluate_node(checked)}
+            if checked["success"]:
+                return _finish(job_id, {**_done(checked), "reused_from": reuse_from}, meta)
+            initial_state = _after_revalidation(initial_state, checked, reuse_from)
+        final_state = initial_state
+        for final_state in compiled().stream(None if resumed else initial_state, checkpoints.thread(job_id),
+                                             stream_mode="values"):
+            if should_cancel is not None and should_cancel():
+                raise JobCancelled(f"Job {job_id} cancelled")
+        result = _done(final_state)
+    except JobCancelled:
+        result = _cancelled(final_state)
+    except Exception as e:
+        result = _failed(initial_state, e)
+    finally:
+        runner.end_session(job_id)
+
+    return _finish(job_id, result, meta)
+
+
+async def run_agent_async(bug_report: str, target_url: str, job_id: str | None = None,
+                          should_cancel: Callable[[], bool] | None = None, bypass_cache: bool = False,
+                          reuse_from: str | None = None) -> dict:
+    """Async entrypoint: drives the async graph so one event loop can run many jobs concurrently."""
+    if job_id is None:
+        job_id = new_job_id()
+    initial_state, meta, resumed = await asyncio.to_thread(_start, bug_report, target_url, job_id, bypass_cache)
+
+    try:
+        reuse = None if resumed else await asyncio.to_thread(_reuse_state, initial_state, reuse_from)
+        if reuse is not None:
+            checked = {**reuse, **await execute_node_async(reuse)}
+            checked = {**checked, **evaluate_node(checked)}
+            if checked["success"]:
+                done = await asyncio.to_thread(_done, checked)
+                return await asyncio.to_thread(_finish, job_id, {**done, "reused_from": reuse_from}, meta)
+            initial_state = _after_revalidation(initial_state, checked, reuse_from)
+        final_state = initial_state
+        async for final_state in compiled_async().astream(None if resumed else initial_state,
+                                                           checkpoints.thread(job_id), stream_mode="values"):
+            if should_cancel is not None and should_cancel():
+                raise JobCancelled(f"Job {job_id} cancelled")
+        result = await asyncio.to_thread(_done, final_state)
+    except JobCancelled:
+        result = _cancelled(final_state)
+    except Exception as e:
+        result = _failed(initial_state, e)
+    finally:
+        await asyncio.to_thread(runner.end_session, job_id)
+
+    return await asyncio.to_thread(_finish, job_id, result, meta)
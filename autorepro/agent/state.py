@@ -6,11 +6,18 @@ from enum import Enum
 
 class FailureType(str, Enum):
     """Classification of script execution failures."""
-    ELEMENT_NOT_FOUND = "ElementNotFound"
-    TIMEOUT           = "Timeout"
-    ASSERTION_ERROR   = "AssertionError"
-    NETWORK_ERROR     = "NetworkError"
-    UNKNOWN           = "Unknown"
+    BROWSER_CRASH      = "BrowserCrash"
+    DNS_ERROR          = "DNSError"
+    ELEMENT_NOT_FOUND  = "ElementNotFound"
+    STALE_ELEMENT      = "StaleElement"
+    CLICK_INTERCEPTED  = "ClickIntercepted"
+    TIMEOUT            = "Timeout"
+    ASSERTION_ERROR    = "AssertionError"
+    NETWORK_ERROR      = "NetworkError"
+    HTTP_ERROR         = "HTTPError"
+    WEBDRIVER_ERROR    = "WebDriverError"
+    SECURITY_VIOLATION = "SecurityViolation"
+    UNKNOWN            = "Unknown"
 
 
 class AgentState(TypedDict):
@@ -25,3 +32,6 @@ class AgentState(TypedDict):
     execution_result: dict
     success:          bool
     history:          list
+    bypass_cache:     bool
+    candidates:       list  # fan-out: scripts to race in the next execute
+    candidate_runs:   list  # fan-out: failed candidates ({candidate, script, result}) of the last attempt
@@ -1,14 +1,18 @@
 """FastAPI app, middleware, CORS, and lifespan hooks."""
 
-import docker
 from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
+from agent import checkpoints
 from api.routes import router
-from utils import config
+from prompts import registry
+from sandbox import pool, runner
+from scheduler import workers as scheduler
+from utils import config, llm_cache, metrics
 from utils.logger import get_logger
 
 log = get_logger(__name__)
@@ -16,15 +20,20 @@ log = get_logger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Startup: verify Docker daemon is reachable and create data directories."""
-    try:
-        docker.from_env().ping()
-        log.info("docker_daemon_ok")
-    except Exception as e:
-        raise RuntimeError(f"Docker daemon unreachable: {e}") from e
+    """Startup: load prompts, create data directories, verify the sandbox backend and warm the pool
+    (unless jobs run on remote workers), requeue jobs interrupted by the last shutdown (they resume
+    from their checkpoints) and start the scheduler."""
+    registry.load()
     Path(config.DATA_DIR, "jobs").mkdir(parents=True, exist_ok=True)
     Path(config.DATA_DIR, "artifacts").mkdir(parents=True, exist_ok=True)
+    if config.SCHEDULER_MODE != "remote":
+        runner.start()
+    scheduler.recover()
+    scheduler.start()
     yield
+    scheduler.shutdown()
+    await checkpoints.aclose()
+    runner.shutdown()
 
 
 app = FastAPI(title="AutoRepro", version="1.0.0", lifespan=lifespan)
@@ -39,5 +48,22 @@ app.include_router(router)
 
 @app.get("/health")
 async def health():
-    """Health check endpoint."""
-    return {"status": "ok"}
+    """Health check endpoint, including sandbox pool, scheduler and LLM cache metrics."""
+    return {"status": "ok", "pool": pool.stats(), "scheduler": scheduler.stats(), "llm_cache": llm_cache.stats()}
+
+
+metrics.Gauge("autorepro_queue_depth", "Jobs waiting in the scheduler queue.",
+              lambda: scheduler.stats().get("queue_depth", 0))
+metrics.Gauge("autorepro_workers_busy", "Scheduler workers currently running a job.",
+              lambda: scheduler.stats().get("busy", 0))
+metrics.Gauge("autorepro_pool_containers", "Warm pool containers by state.",
+              lambda: {k: v for k, v in pool.stats().items() if k in ("idle", "leased", "pinned", "starting")},
+              label="state")
+metrics.Gauge("autorepro_llm_cache_entries", "Responses held in the LLM cache.",
+              lambda: llm_cache.stats().get("entries", 0))
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint: node, sandbox phase, LLM and job store latencies, tokens and cost."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
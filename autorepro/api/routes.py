@@ -1,32 +1,254 @@
 """FastAPI endpoint handlers for AutoRepro API."""
 
+import json
+import threading
 from datetime import datetime, timezone
+from typing import Literal
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse, StreamingResponse
+from pydantic import ValidationError
 
-from api.schemas import ReproduceRequest, JobCreatedResponse, JobResultResponse
-from agent.orchestrator import run_agent
+from agent.nodes import analyze
+from api.schemas import (
+    ReproduceRequest, JobCreatedResponse, JobResultResponse, JobListResponse,
+    BatchCreatedResponse, BatchStatusResponse,
+)
+from scheduler import workers as scheduler
+from storage import attempts, batches
 from storage import jobs as job_store
 from storage.artifacts import artifacts_dir
+from utils import config, events
+from utils.fingerprint import fingerprint
 from utils.id_generator import new_job_id
+from utils.logger import get_logger
 
+log    = get_logger(__name__)
 router = APIRouter()
 
+# Serialises the duplicate check with job registration so concurrent duplicates coalesce.
+_submit_lock = threading.Lock()
+
+
+def _prepare(request: ReproduceRequest, batch_id: str | None = None,
+             pending: dict[str, str] | None = None) -> tuple[JobCreatedResponse, dict | None]:
+    """Coalesce one report onto an existing job, or build the record of a new one (not yet saved).
+
+    pending maps fingerprints to the IDs of new jobs not saved yet (earlier items of a batch).
+    Caller holds _submit_lock.
+    """
+    fp         = fingerprint(str(request.bug_report), str(request.target_url))
+    reuse_from = None
+    if not request.force_new and pending and fp in pending:
+        return JobCreatedResponse(job_id=pending[fp], status="queued", deduplicated=True), None
+    previous   = None if request.force_new else job_store.find_by_fingerprint(fp)
+    if previous is not None:
+        if previous.get("status") in ("queued", "processing"):
+            return JobCreatedResponse(job_id=previous["job_id"], status=previous["status"], deduplicated=True), None
+        if previous.get("status") == "done" and previous.get("success"):
+            if not config.DEDUP_REVALIDATE:
+                return JobCreatedResponse(job_id=previous["job_id"], status="done", deduplicated=True), None
+            reuse_from = previous["job_id"]
 
-@router.post("/reproduce", response_model=JobCreatedResponse, status_code=202)
-async def reproduce(request: ReproduceRequest, background_tasks: BackgroundTasks):
-    """Accept a bug report and start asynchronous reproduction."""
     job_id = new_job_id()
-    job_store.save(job_id, {
+    job    = {
         "job_id": job_id,
-        "status": "processing",
+        "status": "queued",
         "bug_report": str(request.bug_report),
         "target_url": str(request.target_url),
+        "tenant": request.tenant,
+        "priority": request.priority,
+        "fingerprint": fp,
         "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+    if batch_id is not None:
+        job["batch_id"] = batch_id
+    return JobCreatedResponse(job_id=job_id, status="queued", reused_from=reuse_from), job
+
+
+def _options(request: ReproduceRequest, created: JobCreatedResponse) -> dict:
+    """run_agent keyword arguments for a new job."""
+    return {"bypass_cache": request.bypass_cache, "reuse_from": created.reused_from}
+
+
+def _submit(request: ReproduceRequest) -> JobCreatedResponse:
+    """Coalesce or register one report and hand it to the scheduler. Caller holds _submit_lock."""
+    created, job = _prepare(request)
+    if job is None:
+        return created
+    job_store.save(created.job_id, job)
+    try:
+        scheduler.get().submit(created.job_id, job["bug_report"], job["target_url"],
+                               tenant=request.tenant, priority=request.priority, **_options(request, created))
+    except scheduler.QueueFullError:
+        job_store.delete(created.job_id)
+        raise
+    job_store.index_fingerprint(job["fingerprint"], created.job_id)
+    return created
+
+
+def _submit_batch(items: list[ReproduceRequest], batch_id: str, concurrency: int) -> tuple[list, list]:
+    """Coalesce or register every report of a batch and enqueue the new jobs in one step, so the
+    batch is queued whole or not at all. New jobs are held when their analyze prompts are to be
+    primed first. Returns the per-item responses and the (bug_report, target_url) pairs to prime.
+    Caller holds _submit_lock."""
+    created, new, pending = [], [], {}
+    for item in items:
+        response, job = _prepare(item, batch_id, pending)
+        created.append(response)
+        if job is not None:
+            pending[job["fingerprint"]] = response.job_id
+            new.append((item, response, job))
+
+    prime = []
+    if config.BATCH_PRIME_ANALYZE:
+        prime = [(job["bug_report"], job["target_url"]) for item, response, job in new
+                 if not response.reused_from and not item.bypass_cache]
+    try:
+        for _, response, job in new:
+            job_store.save(response.job_id, job)
+        scheduler.get().submit_batch(
+            [{**job, "options": _options(item, response)} for item, response, job in new],
+            batch_id, concurrency, held=bool(prime),
+        )
+    except Exception:
+        for _, response, _ in new:
+            job_store.delete(response.job_id)
+        raise
+    for _, response, job in new:
+        job_store.index_fingerprint(job["fingerprint"], response.job_id)
+    return created, prime
+
+
+def _prime(batch_id: str, reports: list[tuple[str, str]]) -> None:
+    """Warm the analyze cache for a held batch, then let its jobs run whatever the outcome."""
+    try:
+        analyze.prime(reports)
+    except Exception as e:
+        log.warning("batch_prime_failed", batch_id=batch_id, error=str(e))
+    finally:
+        scheduler.get().release_batch(batch_id)
+
+
+def _queue_full(e: "scheduler.QueueFullError") -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail={"code": "QUEUE_FULL", "message": str(e)},
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
+@router.post("/reproduce", response_model=JobCreatedResponse, status_code=202)
+async def reproduce(request: ReproduceRequest):
+    """Accept a bug report and queue it for reproduction.
+
+    A report identical (after normalisation) to one already queued or running is coalesced onto
+    that job. If the last identical job succeeded, its script is either returned as-is or, with
+    DEDUP_REVALIDATE, re-run once in a new job before falling back to the full LLM loop.
+    """
+    with _submit_lock:
+        try:
+            return _submit(request)
+        except scheduler.QueueFullError as e:
+            raise _queue_full(e)
+
+
+def _parse_batch(body: bytes, content_type: str) -> list[ReproduceRequest]:
+    """Validate a JSON array or NDJSON body into requests, reporting every bad item at once."""
+    try:
+        if "ndjson" in content_type or "jsonl" in content_type:
+            raw = [json.loads(line) for line in body.decode("utf-8").splitlines() if line.strip()]
+        else:
+            raw = json.loads(body)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise HTTPException(status_code=400, detail={"code": "INVALID_BODY", "message": str(e)})
+    if not isinstance(raw, list) or not raw:
+        raise HTTPException(
+            status_code=400,
+            detail={"code": "INVALID_BODY", "message": "Expected a non-empty JSON array or NDJSON stream."},
+        )
+    if len(raw) > config.BATCH_MAX_JOBS:
+        raise HTTPException(
+            status_code=413,
+            detail={"code": "BATCH_TOO_LARGE", "message": f"At most {config.BATCH_MAX_JOBS} reports per batch."},
+        )
+
+    requests, errors = [], []
+    for i, item in enumerate(raw):
+        try:
+            requests.append(ReproduceRequest.model_validate(item))
+        except ValidationError as e:
+            errors.append({"index": i, "errors": e.errors(include_url=False, include_context=False)})
+    if errors:
+        raise HTTPException(status_code=422, detail={"code": "INVALID_ITEMS", "items": errors})
+    return requests
+
+
+@router.post("/reproduce/batch", response_model=BatchCreatedResponse, status_code=202)
+async def reproduce_batch(
+    request:     Request,
+    concurrency: int                              = Query(config.BATCH_CONCURRENCY, ge=1, le=100),
+    priority:    Literal["high", "normal", "low"] = "low",
+):
+    """Accept many bug reports (JSON array or NDJSON) as one batch.
+
+    Items go through the same deduplication as POST /reproduce. At most `concurrency` jobs of the
+    batch run at once, and items that set no priority of their own get the batch's (default low,
+    so bulk imports queue behind interactive requests). The batch is accepted whole or not at all.
+    """
+    items = _parse_batch(await request.body(), request.headers.get("content-type", ""))
+    for item in items:
+        if "priority" not in item.model_fields_set:
+            item.priority = priority
+
+    batch_id = new_job_id()
+    with _submit_lock:
+        try:
+            scheduler.get().reserve_batch(len(items))
+        except scheduler.QueueFullError as e:
+            raise _queue_full(e)
+        created, prime = _submit_batch(items, batch_id, concurrency)
+
+    batches.save({
+        "batch_id":    batch_id,
+        "created_at":  datetime.now(timezone.utc).isoformat(),
+        "concurrency": concurrency,
+        "jobs":        [{"index": i, "job_id": c.job_id, "deduplicated": c.deduplicated} for i, c in enumerate(created)],
     })
-    background_tasks.add_task(run_agent, str(request.bug_report), str(request.target_url), job_id)
-    return JobCreatedResponse(job_id=job_id, status="processing")
+    if prime:
+        threading.Thread(target=_prime, args=(batch_id, prime), name="batch-prime", daemon=True).start()
+    log.info("batch_submitted", batch_id=batch_id, total=len(items), concurrency=concurrency)
+    return BatchCreatedResponse(batch_id=batch_id, total=len(items), concurrency=concurrency, jobs=created)
+
+
+@router.get("/batch/{batch_id}", response_model=BatchStatusResponse)
+async def get_batch(batch_id: str):
+    """Aggregate progress of a batch: status counts, success rate and a link per job."""
+    batch = batches.get(batch_id)
+    if batch is None:
+        raise HTTPException(
+            status_code=404,
+            detail={"code": "BATCH_NOT_FOUND", "message": "No batch with that ID exists."},
+        )
+    return batches.progress(batch)
+
+
+def _full_history(job_id: str, job: dict) -> list[dict]:
+    """History rebuilt from the attempt log; jobs stored before the log existed keep it inline."""
+    return attempts.history(job_id) if attempts.exists(job_id) else job.get("history", [])
+
+
+@router.get("/jobs", response_model=JobListResponse)
+async def list_jobs(
+    status:  str | None  = None,
+    success: bool | None = None,
+    host:    str | None  = None,
+    limit:   int         = Query(50, ge=1, le=500),
+    offset:  int         = Query(0, ge=0),
+):
+    """List jobs newest first, optionally filtered by status, outcome or target host."""
+    items, total = job_store.list_jobs(status=status, success=success, host=host, limit=limit, offset=offset)
+    return JobListResponse(total=total, limit=limit, offset=offset, items=items)
 
 
 @router.get("/result/{job_id}")
@@ -38,8 +260,10 @@ async def get_result(job_id: str):
             status_code=404,
             detail={"code": "JOB_NOT_FOUND", "message": "No job with that ID exists."},
         )
-    if job.get("status") == "processing":
-        return {"job_id": job_id, "status": "processing"}
+    if job.get("status") in ("queued", "processing"):
+        progress = [attempts.summary(r["attempt"], r["result"])
+                    for r in attempts.read(job_id) if r["type"] == "attempt"]
+        return {"job_id": job_id, "status": job["status"], "attempt_count": len(progress), "attempts": progress}
 
     screenshots = [
         f"/result/{job_id}/screenshot/{p.name}"
@@ -47,8 +271,12 @@ async def get_result(job_id: str):
     ]
     logs = "".join(
         h.get("result", {}).get("stdout", "")
-        for h in job.get("history", [])
+        for h in _full_history(job_id, job)
     )
+    log_urls = [
+        f"/result/{job_id}/logs/{p.name}"
+        for p in sorted((artifacts_dir(job_id) / "logs").glob("*.log"))
+    ]
 
     return JobResultResponse(
         job_id=job_id,
@@ -58,11 +286,131 @@ async def get_result(job_id: str):
         final_script=job.get("final_script") or job.get("script"),
         screenshot_urls=screenshots,
         logs=logs,
+        log_urls=log_urls,
         created_at=job.get("created_at"),
         completed_at=job.get("completed_at"),
+        timings=job.get("timings"),
     )
 
 
+@router.get("/result/{job_id}/history")
+async def get_history(job_id: str):
+    """Full attempt history (scripts, execution results, refinement notes), live while running."""
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail={"code": "JOB_NOT_FOUND", "message": "No job with that ID exists."},
+        )
+    return {"job_id": job_id, "status": job.get("status"), "history": _full_history(job_id, job)}
+
+
+# Seconds between SSE keep-alive comments, so idle proxies don't drop a quiet stream. A quiet stream
+# also re-reads the job, and with remote workers (whose events never reach this process) it does so
+# every SCHEDULER_POLL_SECONDS instead.
+_KEEPALIVE_SECONDS = 15
+_WAIT_SECONDS      = config.SCHEDULER_POLL_SECONDS if config.SCHEDULER_MODE == "remote" else _KEEPALIVE_SECONDS
+
+
+def _end_event(job: dict) -> dict | None:
+    """Terminal event for a job that has already finished, or None while it is still active."""
+    if job.get("status") in ("queued", "processing"):
+        return None
+    return {"type": events.TERMINAL, "job_id": job["job_id"], "status": job.get("status"),
+            "success": job.get("success"), "attempt_count": job.get("attempt_count")}
+
+
+def _finished(job_id: str) -> dict | None:
+    """Terminal event for a job that finished without its end event reaching this process."""
+    job = job_store.get(job_id)
+    return _end_event({**job, "job_id": job_id}) if job is not None else None
+
+
+def _subscribe(job_id: str) -> tuple[events.Subscription, dict | None]:
+    """Subscribe before reading the job, so an event published in between cannot be missed."""
+    sub = events.subscribe(job_id)
+    job = job_store.get(job_id)
+    if job is None:
+        sub.close()
+        raise HTTPException(
+            status_code=404,
+            detail={"code": "JOB_NOT_FOUND", "message": "No job with that ID exists."},
+        )
+    return sub, _end_event({**job, "job_id": job_id})
+
+
+@router.get("/result/{job_id}/stream")
+async def stream_result(job_id: str):
+    """Server-Sent Events feed of a job's progress: node transitions, container log lines, end."""
+    sub, finished = _subscribe(job_id)
+
+    async def feed():
+        try:
+            if finished is not None:
+                yield f"event: {finished['type']}\ndata: {json.dumps(finished)}\n\n"
+                return
+            while True:
+                event = await sub.get(timeout=_WAIT_SECONDS)
+                if event is None:
+                    event = _finished(job_id)
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+                if event["type"] == events.TERMINAL:
+                    return
+        finally:
+            sub.close()
+
+    return StreamingResponse(feed(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@router.websocket("/result/{job_id}/stream")
+async def stream_result_ws(websocket: WebSocket, job_id: str):
+    """WebSocket variant of the progress feed; each message is one JSON event."""
+    try:
+        sub, finished = _subscribe(job_id)
+    except HTTPException:
+        await websocket.close(code=4404)
+        return
+    await websocket.accept()
+    try:
+        if finished is not None:
+            await websocket.send_json(finished)
+        else:
+            while True:
+                event = await sub.get(timeout=_WAIT_SECONDS)
+                if event is None:
+                    event = _finished(job_id)
+                if event is None:
+                    continue
+                await websocket.send_json(event)
+                if event["type"] == events.TERMINAL:
+                    break
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sub.close()
+
+
+@router.post("/result/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    """Cancel a queued job, or stop a running one after its current step."""
+    if job_store.get(job_id) is None:
+        raise HTTPException(
+            status_code=404,
+            detail={"code": "JOB_NOT_FOUND", "message": "No job with that ID exists."},
+        )
+    if not scheduler.get().cancel(job_id):
+        raise HTTPException(
+            status_code=409,
+            detail={"code": "JOB_NOT_ACTIVE", "message": "Job is not queued or running."},
+        )
+    return {"job_id": job_id, "status": "cancelling"}
+
+
 @router.get("/result/{job_id}/script")
 async def get_script(job_id: str):
     """Download the final reproduction script as a .py file."""
@@ -81,3 +429,28 @@ async def get_screenshot(job_id: str, filename: str):
     if not p.exists():
         raise HTTPException(status_code=404, detail="Screenshot not found")
     return FileResponse(str(p), media_type="image/png")
+
+
+@router.get("/result/{job_id}/logs")
+async def list_logs(job_id: str):
+    """List the full stdout/stderr log files captured for each attempt."""
+    if job_store.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    d = artifacts_dir(job_id) / "logs"
+    files = sorted(d.glob("*.log")) if d.is_dir() else []
+    return {
+        "job_id": job_id,
+        "logs": [
+            {"name": p.name, "bytes": p.stat().st_size, "url": f"/result/{job_id}/logs/{p.name}"}
+            for p in files
+        ],
+    }
+
+
+@router.get("/result/{job_id}/logs/{name}")
+async def get_log(job_id: str, name: str):
+    """Serve one captured log file; supports Range requests for paging through large logs."""
+    p = artifacts_dir(job_id) / "logs" / name
+    if name != p.name or not name.endswith(".log") or not p.is_file():
+        raise HTTPException(status_code=404, detail="Log not found")
+    return FileResponse(str(p), media_type="text/plain; charset=utf-8")
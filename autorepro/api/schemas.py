@@ -8,12 +8,18 @@ class ReproduceRequest(BaseModel):
     """Request body for POST /reproduce."""
     bug_report: str
     target_url: HttpUrl
+    tenant:       str                               = "default"
+    priority:     Literal["high", "normal", "low"] = "normal"
+    bypass_cache: bool                              = False
+    force_new:    bool                              = False
 
 
 class JobCreatedResponse(BaseModel):
     """Response for accepted reproduction job."""
-    job_id: str
-    status: Literal["processing"]
+    job_id:       str
+    status:       Literal["queued", "processing", "done"]
+    deduplicated: bool          = False
+    reused_from:  Optional[str] = None
 
 
 class JobResultResponse(BaseModel):
@@ -25,5 +31,59 @@ class JobResultResponse(BaseModel):
     final_script:    Optional[str]       = None
     screenshot_urls: Optional[list[str]] = None
     logs:            Optional[str]       = None
+    log_urls:        Optional[list[str]] = None
     created_at:      Optional[str]       = None
     completed_at:    Optional[str]       = None
+    timings:         Optional[dict]      = None
+
+
+class JobSummary(BaseModel):
+    """One row of GET /jobs."""
+    job_id:        str
+    status:        Optional[str]  = None
+    success:       Optional[bool] = None
+    target_url:    Optional[str]  = None
+    attempt_count: Optional[int]  = None
+    created_at:    Optional[str]  = None
+    completed_at:  Optional[str]  = None
+
+
+class JobListResponse(BaseModel):
+    """Paginated response for GET /jobs."""
+    total:  int
+    limit:  int
+    offset: int
+    items:  list[JobSummary]
+
+
+class BatchCreatedResponse(BaseModel):
+    """Response for an accepted POST /reproduce/batch; jobs are in submission order."""
+    batch_id:    str
+    total:       int
+    concurrency: int
+    jobs:        list[JobCreatedResponse]
+
+
+class BatchJob(BaseModel):
+    """One submitted report of a batch and the job handling it."""
+    index:         int
+    job_id:        str
+    deduplicated:  bool           = False
+    status:        str
+    success:       Optional[bool] = None
+    attempt_count: Optional[int]  = None
+    result_url:    str
+
+
+class BatchStatusResponse(BaseModel):
+    """Aggregate progress for GET /batch/{batch_id}."""
+    batch_id:     str
+    created_at:   str
+    concurrency:  int
+    total:        int
+    finished:     int
+    succeeded:    int
+    counts:       dict[str, int]
+    progress:     float
+    success_rate: Optional[float] = None
+    jobs:         list[BatchJob]
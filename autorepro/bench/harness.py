@@ -0,0 +1,233 @@
+"""Offline throughput benchmark — N concurrent run_agent jobs on MockLLM, the fake sandbox and the demo app.
+
+Nothing leaves the machine: the LLM is MockLLM with injected latency and per-attempt failure
+rates, scripts run on the in-process fake sandbox, and the target is tests/demo_server.py served
+on a local port. Reports jobs/sec, end-to-end latency percentiles, per-span timings and memory.
+
+Usage (from the autorepro directory):
+    python -m bench.harness [--jobs 40] [--concurrency 8] [--mode threads|async]
+                            [--compare bench/baseline.json] [--update-baseline bench/baseline.json]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import structlog
+
+BUG_REPORT = (
+    "Login fails with valid credentials. Steps: open the login page, enter username 'testuser' and "
+    "password 'correctpassword123', click Login. Expected: redirect to the dashboard. "
+    "Actual: the page shows 'Invalid credentials'."
+)
+
+# Metrics compared against the baseline, and whether a larger value is better.
+COMPARED = {
+    "jobs_per_sec":        True,
+    "latency_seconds.p50": False,
+    "latency_seconds.p95": False,
+    "latency_seconds.p99": False,
+    "memory.max_rss_mb":   False,
+}
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100) of a non-empty list."""
+    ordered = sorted(values)
+    rank    = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def _environment(args: argparse.Namespace) -> dict[str, str]:
+    """Settings for the run; applied before any autorepro module reads utils.config."""
+    return {
+        "LLM_PROVIDER":                 "mock",
+        "SANDBOX_BACKEND":              "fake",
+        "POOL_MAX_SIZE":                "0",
+        "DATA_DIR":                     tempfile.mkdtemp(prefix="autorepro-bench-"),
+        "SANDBOX_MAX_CONTAINERS":       str(args.concurrency),
+        "FAKE_SANDBOX_LATENCY_SECONDS": str(args.sandbox_latency),
+        "MOCK_LLM_LATENCY_SECONDS":     str(args.llm_latency),
+        "MOCK_LLM_LATENCY_JITTER":      str(args.llm_jitter),
+        "MOCK_LLM_FAILURE_RATES":       args.failure_rates,
+        "MOCK_LLM_SEED":                str(args.seed),
+    }
+
+
+def _serve_demo() -> tuple[object, str]:
+    """Serve tests/demo_server.py on a free local port in a daemon thread."""
+    from werkzeug.serving import make_server
+    from tests.demo_server import app
+
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, name="bench-demo", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/login"
+
+
+def _timed(run_agent, target_url: str) -> dict:
+    start  = time.perf_counter()
+    result = run_agent(BUG_REPORT, target_url, bypass_cache=True)
+    return {**result, "latency_seconds": time.perf_counter() - start}
+
+
+def run_threads(jobs: int, concurrency: int, target_url: str) -> list[dict]:
+    """Run jobs through the sync entrypoint on a thread pool, as the threaded scheduler does."""
+    from agent.orchestrator import run_agent
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bench") as executor:
+        return list(executor.map(lambda _: _timed(run_agent, target_url), range(jobs)))
+
+
+def run_async(jobs: int, concurrency: int, target_url: str) -> list[dict]:
+    """Run jobs through the async entrypoint on one event loop, as the async scheduler does."""
+    from agent import checkpoints
+    from agent.orchestrator import run_agent_async
+
+    async def one(gate: asyncio.Semaphore) -> dict:
+        async with gate:
+            start  = time.perf_counter()
+            result = await run_agent_async(BUG_REPORT, target_url, bypass_cache=True)
+            return {**result, "latency_seconds": time.perf_counter() - start}
+
+    async def all_jobs() -> list[dict]:
+        gate = asyncio.Semaphore(concurrency)
+        try:
+            return await asyncio.gather(*(one(gate) for _ in range(jobs)))
+        finally:
+            await checkpoints.aclose()
+
+    return asyncio.run(all_jobs())
+
+
+def summarise(results: list[dict], wall_seconds: float, scenario: dict, traced_peak: int | None) -> dict:
+    """Aggregate per-job results into the benchmark report."""
+    latencies = [r["latency_seconds"] for r in results]
+    succeeded = [r for r in results if r.get("success")]
+    spans: dict[str, list[float]] = {}
+    for r in results:
+        for name, s in (r.get("timings") or {}).get("spans", {}).items():
+            spans.setdefault(name, []).append(s["seconds"])
+    n = len(results)
+    return {
+        "scenario":        scenario,
+        "jobs":            n,
+        "succeeded":       len(succeeded),
+        "success_rate":    round(len(succeeded) / n, 3),
+        "mean_attempts":   round(sum(r.get("attempt_count") or 0 for r in results) / n, 2),
+        "wall_seconds":    round(wall_seconds, 3),
+        "jobs_per_sec":    round(n / wall_seconds, 3),
+        "latency_seconds": {
+            "p50":  round(percentile(latencies, 50), 4),
+            "p95":  round(percentile(latencies, 95), 4),
+            "p99":  round(percentile(latencies, 99), 4),
+            "max":  round(max(latencies), 4),
+            "mean": round(sum(latencies) / n, 4),
+        },
+        # Seconds per job spent in each span (graph nodes, sandbox phases, LLM calls, store writes).
+        "spans": {
+            name: {"mean_seconds": round(sum(v) / n, 4), "p95_seconds": round(percentile(v, 95), 4)}
+            for name, v in sorted(spans.items())
+        },
+        "memory": {
+            "max_rss_mb":      round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            "traced_peak_mb":  round(traced_peak / 1024 / 1024, 1) if traced_peak is not None else None,
+        },
+    }
+
+
+def _get(report: dict, dotted: str):
+    for part in dotted.split("."):
+        report = (report or {}).get(part)
+    return report
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Return one line per compared metric that is worse than the baseline by more than tolerance."""
+    regressions = []
+    for metric, higher_is_better in COMPARED.items():
+        now, then = _get(report, metric), _get(baseline, metric)
+        if not now or not then:
+            continue
+        change = (then - now) / then if higher_is_better else (now - then) / then
+        if change > tolerance:
+            regressions.append(f"{metric}: {then} -> {now} ({change:+.0%} worse)")
+    return regressions
+
+
+def _print(report: dict) -> None:
+    lat = report["latency_seconds"]
+    print(f"jobs {report['jobs']}  succeeded {report['succeeded']}  mean attempts {report['mean_attempts']}")
+    print(f"throughput {report['jobs_per_sec']} jobs/s over {report['wall_seconds']}s")
+    print(f"latency p50 {lat['p50']}s  p95 {lat['p95']}s  p99 {lat['p99']}s  max {lat['max']}s")
+    print(f"memory max rss {report['memory']['max_rss_mb']} MB  traced peak {report['memory']['traced_peak_mb']} MB")
+    print(f"{'span':<28}{'mean s/job':>12}{'p95 s/job':>12}")
+    for name, s in report["spans"].items():
+        print(f"{name:<28}{s['mean_seconds']:>12}{s['p95_seconds']:>12}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline benchmark of the full reproduction loop.")
+    parser.add_argument("--jobs", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--mode", choices=("threads", "async"), default="threads")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="seconds added to every MockLLM call")
+    parser.add_argument("--llm-jitter", type=float, default=0.02)
+    parser.add_argument("--failure-rates", default="0.5,0.25,0",
+                        help="chance a generated script is broken, per attempt (comma-separated)")
+    parser.add_argument("--sandbox-latency", type=float, default=0.1, help="seconds per fake sandbox run")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--tracemalloc", action="store_true", help="also report the Python heap peak (slower)")
+    parser.add_argument("--json", type=Path, help="write the report here")
+    parser.add_argument("--compare", type=Path, help="baseline report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression")
+    parser.add_argument("--update-baseline", type=Path, help="write the report as the new baseline")
+    args = parser.parse_args()
+
+    # Config, the sandbox slot semaphore and the MockLLM RNG are read at import time.
+    os.environ.update(_environment(args))
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    scenario = {k: getattr(args, k) for k in
+                ("jobs", "concurrency", "mode", "llm_latency", "llm_jitter", "failure_rates", "sandbox_latency", "seed")}
+
+    server, target_url = _serve_demo()
+    if args.tracemalloc:
+        tracemalloc.start()
+    start   = time.perf_counter()
+    runner  = run_threads if args.mode == "threads" else run_async
+    results = runner(args.jobs, args.concurrency, target_url)
+    wall    = time.perf_counter() - start
+    peak    = tracemalloc.get_traced_memory()[1] if args.tracemalloc else None
+    server.shutdown()
+
+    report = summarise(results, wall, scenario, peak)
+    _print(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+    if args.update_baseline:
+        args.update_baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"baseline written to {args.update_baseline}")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if baseline.get("scenario") != scenario:
+            print("warning: baseline was recorded with a different scenario", file=sys.stderr)
+        regressions = compare(report, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions beyond {args.tolerance:.0%} against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
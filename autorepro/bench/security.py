@@ -0,0 +1,89 @@
+"""Security scan benchmark — time the policy check over a corpus of generated scripts, cold and memoised.
+
+The corpus is MockLLM-generated scripts (each made unique, plus longer variants built by repeating
+the body in functions) and, with --corpus, every .py file under a directory such as a data dir's
+artifacts/. Exits non-zero if the mean cold check is slower than --max-mean-ms.
+
+Usage (from the autorepro directory):
+    python -m bench.security [--scripts 200] [--corpus DATA_DIR/artifacts] [--max-mean-ms 5]
+"""
+
+import argparse
+import json
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+from bench.harness import percentile
+from sandbox import security
+from utils.mock_llm import MockLLM
+
+
+def generated(count: int) -> list[str]:
+    """MockLLM scripts, every fourth one repeated into a few functions to vary the size."""
+    scripts = []
+    for i in range(count):
+        script = MockLLM()._generate_script(f"Write a Python script\nAttempt {i % 3}:")
+        script = f"# corpus script {i}\n{script}"
+        if i % 4 == 3:
+            body   = textwrap.indent(script, "    ")
+            script = "\n".join(f"def step_{n}():\n{body}" for n in range(i % 7 + 2))
+        scripts.append(script)
+    return scripts
+
+
+def _timed(fn, scripts: list[str]) -> list[float]:
+    """Milliseconds fn takes on each script; a violation counts like a pass."""
+    times = []
+    for script in scripts:
+        start = time.perf_counter()
+        try:
+            fn(script)
+        except security.SecurityError:
+            pass
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def _stats(times: list[float]) -> dict:
+    return {
+        "mean_ms": round(sum(times) / len(times), 4),
+        "p95_ms":  round(percentile(times, 95), 4),
+        "max_ms":  round(max(times), 4),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark of the sandbox security check.")
+    parser.add_argument("--scripts", type=int, default=200, help="generated scripts in the corpus")
+    parser.add_argument("--corpus", type=Path, help="also check every .py file under this directory")
+    parser.add_argument("--max-mean-ms", type=float, default=5.0, help="fail if a cold check averages more")
+    parser.add_argument("--json", type=Path, help="write the report here")
+    args = parser.parse_args()
+
+    scripts = generated(args.scripts)
+    if args.corpus:
+        scripts += [p.read_text() for p in sorted(args.corpus.rglob("*.py"))]
+
+    security._verdicts.clear()
+    cold    = _timed(security.check, scripts)
+    warm    = _timed(security.check, scripts)
+    blocked = sum(v is not None for v in security._verdicts.values())
+    report  = {
+        "scripts":  len(scripts),
+        "mean_kb":  round(sum(len(s) for s in scripts) / len(scripts) / 1024, 2),
+        "blocked":  blocked,
+        "cold":     _stats(cold),
+        "memoised": _stats(warm),
+    }
+    print(json.dumps(report, indent=2))
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+    if report["cold"]["mean_ms"] > args.max_mean_ms:
+        print(f"REGRESSION cold check mean {report['cold']['mean_ms']}ms > {args.max_mean_ms}ms", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
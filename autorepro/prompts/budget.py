@@ -0,0 +1,99 @@
+"""Token-budgeted prompt assembly — fill a template from prioritised sections, trimming the least useful first.
+
+Each section is measured in tokens. While the rendered prompt is over budget, the lowest-priority
+section that is not required is cut down (keeping its head or its tail, whichever matters) until
+the prompt fits or only required sections are left. The per-section counts are recorded so prompt
+growth across attempts shows up in metrics.
+"""
+
+from functools import lru_cache
+from typing import Literal, NamedTuple
+
+from utils import config, metrics, tokens
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+# Lower numbers are more important and trimmed last.
+REQUIRED = 0
+HIGH     = 1
+MEDIUM   = 2
+LOW      = 3
+
+# Room left for the omission note added to a trimmed section.
+_NOTE_TOKENS = 16
+
+
+class Section(NamedTuple):
+    name:     str
+    text:     str
+    priority: int                     = MEDIUM
+    keep:     Literal["head", "tail"] = "head"  # which end survives trimming
+
+
+class Prompt(NamedTuple):
+    text:     str
+    tokens:   int
+    sections: dict[str, int]   # section name -> tokens after trimming
+    trimmed:  list[str]
+
+
+def _shrink(section: Section, limit: int) -> str:
+    """Cut a section down to about limit tokens, noting what was dropped."""
+    if limit <= 0:
+        return "[omitted to fit the prompt budget]"
+    text = section.text
+    if section.keep == "tail":
+        cut = len(text) - tokens.chars_for(text, limit)
+        return f"[... {cut} earlier characters omitted ...]\n{text[cut:]}"
+    cut = tokens.chars_for(text, limit)
+    return f"{text[:cut]}\n[... {len(text) - cut} further characters omitted ...]"
+
+
+@lru_cache(maxsize=64)
+def _fixed_tokens(template: str, names: tuple[str, ...]) -> int:
+    """Tokens in the template's own text, counted once per template version."""
+    return tokens.count(template.format(**dict.fromkeys(names, "")))
+
+
+def assemble(node: str, template: str, sections: list[Section], budget: int | None = None) -> Prompt:
+    """Render template with each section's text, trimmed to fit budget (default PROMPT_TOKEN_BUDGET) tokens."""
+    budget = budget or config.PROMPT_TOKEN_BUDGET
+    texts  = {s.name: s.text for s in sections}
+    counts = {s.name: tokens.count(s.text) for s in sections}
+    fixed  = _fixed_tokens(template, tuple(s.name for s in sections))
+    over   = fixed + sum(counts.values()) - budget
+
+    trimmed = []
+    for s in sorted(sections, key=lambda s: s.priority, reverse=True):
+        if over <= 0 or s.priority == REQUIRED:
+            break
+        if not counts[s.name]:
+            continue
+        texts[s.name] = _shrink(s, counts[s.name] - over - _NOTE_TOKENS)
+        new           = tokens.count(texts[s.name])
+        over         -= counts[s.name] - new
+        counts[s.name] = new
+        trimmed.append(s.name)
+
+    text   = template.format(**texts)
+    prompt = Prompt(text, fixed + sum(counts.values()), counts, trimmed)
+    for name, n in counts.items():
+        metrics.PROMPT_SECTION_TOKENS.observe(n, node=node, section=name)
+    if trimmed:
+        metrics.PROMPT_TRIMS.inc(node=node)
+        log.info("prompt_trimmed", node=node, tokens=prompt.tokens, budget=budget, trimmed=trimmed)
+    return prompt
+
+
+def dedupe_notes(lines: list[tuple[int, str]]) -> list[str]:
+    """One "Attempt N: ..." line per attempt, pointing back to the first attempt with the same text."""
+    first = {}
+    out   = []
+    for attempt, text in lines:
+        if text in first:
+            out.append(f"Attempt {attempt}: same as attempt {first[text]}")
+        else:
+            first[text] = attempt
+            out.append(f"Attempt {attempt}: {text}")
+    return out
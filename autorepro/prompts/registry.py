@@ -0,0 +1,108 @@
+"""Prompt template registry — every template is read and validated once, then served from memory.
+
+Templates live next to this module, so lookups do not depend on the working directory. load()
+runs at startup and fails fast on a missing template or a placeholder mismatch. With
+PROMPTS_HOT_RELOAD set, get() re-reads a template whose file changed; an edit that does not
+validate is logged and the previous version kept.
+"""
+
+import string
+import threading
+import time
+from pathlib import Path
+
+from utils import config
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+PROMPTS_DIR = Path(__file__).parent
+
+# Template name -> the placeholders its file must contain, no more and no fewer.
+FIELDS: dict[str, frozenset[str]] = {
+    "analyze":  frozenset({"bug_report", "target_url"}),
+    "generate": frozenset({"analysis_json", "target_url", "prior_failures", "known_elements", "fragments"}),
+    "refine":   frozenset({"previous_script", "failure_json", "stack_trace", "error_excerpts", "output",
+                           "history_summary", "other_candidates"}),
+}
+
+# Seconds between file checks when hot reload is on.
+RELOAD_CHECK_SECONDS = 1.0
+
+
+class TemplateError(Exception):
+    """Raised when a prompt template is missing or its placeholders don't match what the node fills in."""
+    pass
+
+
+class _Entry:
+    def __init__(self, text: str, mtime: float, checked: float):
+        self.text    = text
+        self.mtime   = mtime
+        self.checked = checked
+
+
+_templates: dict[str, _Entry] = {}
+_lock                         = threading.Lock()
+
+
+def _read(name: str) -> tuple[str, float]:
+    """Read and validate one template, returning its text and modification time."""
+    path = PROMPTS_DIR / f"{name}.txt"
+    try:
+        mtime = path.stat().st_mtime
+        text  = path.read_text()
+    except OSError as e:
+        raise TemplateError(f"Prompt template {path} cannot be read: {e}") from e
+    try:
+        found = {field for _, field, _, _ in string.Formatter().parse(text) if field is not None}
+    except ValueError as e:
+        raise TemplateError(f"Prompt template {name}: {e}") from e
+    missing, unexpected = FIELDS[name] - found, found - FIELDS[name]
+    if missing or unexpected:
+        raise TemplateError(f"Prompt template {name}: missing placeholders {sorted(missing)}, "
+                            f"unknown placeholders {sorted(unexpected)}")
+    return text, mtime
+
+
+def load() -> None:
+    """Read and validate every template; raises TemplateError on the first bad one."""
+    loaded = {name: _read(name) for name in FIELDS}
+    now    = time.monotonic()
+    with _lock:
+        for name, (text, mtime) in loaded.items():
+            _templates[name] = _Entry(text, mtime, now)
+    log.info("prompts_loaded", templates=sorted(loaded))
+
+
+def get(name: str) -> str:
+    """Return a template's text, loading the registry on first use."""
+    if not _templates:
+        load()
+    entry = _templates[name]
+    if config.PROMPTS_HOT_RELOAD:
+        _maybe_reload(name, entry)
+        entry = _templates[name]
+    return entry.text
+
+
+def _maybe_reload(name: str, entry: _Entry) -> None:
+    now = time.monotonic()
+    if now - entry.checked < RELOAD_CHECK_SECONDS:
+        return
+    entry.checked = now
+    try:
+        mtime = (PROMPTS_DIR / f"{name}.txt").stat().st_mtime
+    except OSError:
+        return
+    if mtime == entry.mtime:
+        return
+    entry.mtime = mtime  # so an edit that fails validation is reported once
+    try:
+        text, mtime = _read(name)
+    except TemplateError as e:
+        log.error("prompt_reload_failed", template=name, error=str(e))
+        return
+    with _lock:
+        _templates[name] = _Entry(text, mtime, now)
+    log.info("prompt_reloaded", template=name)
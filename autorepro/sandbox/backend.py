@@ -0,0 +1,54 @@
+"""SandboxBackend interface — the contract every script execution backend implements.
+
+The runner keeps everything backend-independent (the security gate, the global slot cap,
+cancellation and parsing into an ExecutionResult); a backend only has to run one script and
+return its raw output.
+"""
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from sandbox.log_stream import LogCollector
+from utils import metrics, tracing
+
+# Unbuffered stdout, so the success marker reaches the log stream the moment it is printed.
+SCRIPT_ENV = {"PYTHONUNBUFFERED": "1"}
+
+
+class TimeoutError(Exception):
+    """Raised when script execution exceeds the configured timeout."""
+    pass
+
+
+class ContainerError(Exception):
+    """Raised when the sandbox fails to start or encounters a runtime error."""
+    pass
+
+
+class Cancelled(Exception):
+    """Raised when the attempt's collector was cancelled before the script finished."""
+    pass
+
+
+def phase(job_id: str, name: str, pooled: bool | None = None):
+    """Time one phase of a run into the job's timings and the sandbox phase histogram."""
+    return tracing.span(f"sandbox.{name}", job_id, metrics.SANDBOX_PHASE_SECONDS,
+                        phase=name, pooled="" if pooled is None else str(pooled).lower())
+
+
+class SandboxBackend(ABC):
+    """Base class for sandbox backends."""
+
+    @abstractmethod
+    def execute(self, script_path: Path, script_content: str, artifacts_dir: Path,
+                collector: LogCollector, session: str | None) -> tuple[str, str, int]:
+        """Run one checked script, streaming its output into the collector. Returns (stdout, stderr, exit_code).
+
+        Screenshots the script saves under /screenshots must end up in artifacts_dir. session
+        names the job whose browser session the run may share, if the backend supports one.
+        Raises TimeoutError when the script overruns SANDBOX_TIMEOUT_SECONDS.
+        """
+
+    def end_session(self, job_id: str) -> None:
+        """Release anything kept alive for a finished job's browser session."""
+        pass
@@ -0,0 +1,164 @@
+"""Failure classification — one rule table compiled into a single regex, scanned once over the output.
+
+Scan is fed lines as the log collector receives them, so by the time a run ends its failure
+type, error message, stack trace and screenshot paths are already known and nothing re-reads
+the full output. When several rules match a run, the one listed first in RULES wins.
+"""
+
+import re
+from collections import deque
+from typing import NamedTuple
+
+from utils import config, metrics
+
+SUCCESS_MARKER = "REPRODUCED"
+
+STACK_TRACE_LINES = 10
+EXCERPT_CHARS     = 500
+
+
+class Rule(NamedTuple):
+    error_type: str
+    pattern:    str
+    streams:    tuple[str, ...]
+    fatal:      bool  # an uncaught exception of this kind means the script is finishing
+
+
+# Highest priority first: root causes (crashed browser, unresolvable host) before the exception they surface as.
+RULES: tuple[Rule, ...] = (
+    Rule("BrowserCrash",      r"chrome not reachable|session deleted because of page crash|tab crashed"
+                              r"|DevToolsActivePort file doesn't exist|Chrome failed to start"
+                              r"|chromedriver unexpectedly exited",                          ("stderr",), True),
+    Rule("DNSError",          r"ERR_NAME_NOT_RESOLVED|Name or service not known|Temporary failure in name resolution"
+                              r"|getaddrinfo failed|NameResolutionError",                    ("stdout", "stderr"), False),
+    Rule("ElementNotFound",   r"NoSuchElementException",                                     ("stderr",), True),
+    Rule("StaleElement",      r"StaleElementReferenceException",                             ("stderr",), True),
+    Rule("ClickIntercepted",  r"ElementClickInterceptedException|ElementNotInteractableException",
+                                                                                             ("stderr",), True),
+    Rule("Timeout",           r"TimeoutException",                                           ("stderr",), True),
+    Rule("AssertionError",    r"AssertionError",                                             ("stderr",), True),
+    Rule("NetworkError",      r"ConnectionRefused|ERR_CONNECTION_REFUSED|ERR_CONNECTION_RESET|5xx",
+                                                                                             ("stdout", "stderr"), False),
+    Rule("HTTPError",         r"HTTP(?: Error)? [45]\d\d\b|status(?: code)?[ :=]+[45]\d\d\b"
+                              r"|Status(?: code)?[ :=]+[45]\d\d\b",
+                                                                                             ("stdout", "stderr"), False),
+    Rule("WebDriverError",    r"WebDriverException",                                         ("stderr",), True),
+)
+
+# Tokens the scan looks for besides the rules. "exception" finds the ": message" after any
+# exception class name; rule keywords ending in Error/Exception are checked for one too.
+_TOKENS = (
+    ("exception",  r"(?:Error|Exception)(?=: .)"),
+    ("traceback",  r"Traceback"),
+    ("screenshot", r"/screenshots/[\w_.]+\.png"),
+    ("marker",     SUCCESS_MARKER),
+    *((i, rule.pattern) for i, rule in enumerate(RULES)),
+)
+
+# One flat alternation with no groups around the branches: that keeps the regex engine's
+# literal-prefix check, which makes the scan about ten times faster than named groups do.
+# Every branch must therefore start with a literal: no \b, lookaround or character class.
+_COMBINED = re.compile("|".join(pattern for _, pattern in _TOKENS))
+_EACH     = tuple((kind, re.compile(pattern)) for kind, pattern in _TOKENS)
+
+
+def _kind(text: str, m: re.Match) -> str | int:
+    """Which token a combined-regex match came from (matches are rare, so re-matching is cheap)."""
+    for kind, rx in _EACH:
+        hit = rx.match(text, m.start())
+        if hit is not None and hit.end() == m.end():
+            return kind
+    return "exception"
+
+
+def _message(text: str, m: re.Match) -> str | None:
+    """The rest of the line after "SomeError: " / "SomeException: " when the match ends such a class name."""
+    name = m.group()
+    if not name.endswith(("Error", "Exception")) or not text.startswith(": ", m.end()):
+        return None
+    if name in ("Error", "Exception"):
+        before = text[m.start() - 1] if m.start() else " "
+        if not (before.isalnum() or before == "_"):
+            return None
+    end = text.find("\n", m.end())
+    return text[m.end() + 2:end if end != -1 else None] or None
+
+
+RULE_HITS = metrics.Counter(
+    "autorepro_classifier_rule_hits_total", "Runs in which each failure rule matched.", ("error_type",))
+
+
+class Scan:
+    """Incremental classification of one run's output."""
+
+    def __init__(self):
+        self.reproduced  = False
+        self.fatal       = False
+        self.traceback   = False
+        self.message     = None
+        self.screenshots = []
+        self.excerpts    = []                                # lines that matched a rule, in order
+        self.hits        = {}                                # rule index -> matches
+        self._tail       = deque(maxlen=STACK_TRACE_LINES)   # last stderr lines, for the stack trace
+
+    def feed(self, stream: str, text: str) -> None:
+        """Classify one or more complete lines of output."""
+        if stream == "stderr":
+            self._tail.extend(line for line in text.splitlines()[-STACK_TRACE_LINES:] if line.strip())
+        for m in _COMBINED.finditer(text):
+            kind = _kind(text, m)
+            if kind == "traceback":
+                self.traceback |= stream == "stderr"
+            elif kind == "screenshot":
+                if stream == "stdout":
+                    self.screenshots.append(m.group())
+            elif kind == "marker":
+                self.reproduced |= stream == "stdout"
+            elif kind != "exception":
+                rule = RULES[kind]
+                if stream in rule.streams:
+                    self.hits[kind] = self.hits.get(kind, 0) + 1
+                    self.fatal     |= rule.fatal
+                    self._excerpt(text, m)
+            if self.message is None and stream == "stderr":
+                self.message = _message(text, m)
+
+    def _excerpt(self, text: str, m: re.Match) -> None:
+        if len(self.excerpts) >= config.LOG_EXCERPT_LINES:
+            return
+        end  = text.find("\n", m.end())
+        line = text[text.rfind("\n", 0, m.start()) + 1:end if end != -1 else None][:EXCERPT_CHARS]
+        if line not in self.excerpts:
+            self.excerpts.append(line)
+
+    def result(self, exit_code: int) -> dict:
+        """The classification fields of an ExecutionResult, recording which rules matched.
+
+        A run that reproduced has no error type: output such as "status: 500" is often the very bug
+        being reproduced. A clean exit still reports a rule that matched (a script may catch and log
+        the exception), but is not Unknown when none did.
+        """
+        if self.reproduced:
+            error_type = None
+        elif self.hits:
+            for i in self.hits:
+                RULE_HITS.inc(error_type=RULES[i].error_type)
+            error_type = RULES[min(self.hits)].error_type
+        else:
+            error_type = None if exit_code == 0 else "Unknown"
+        return {
+            "reproduced":       self.reproduced,
+            "error_type":       error_type,
+            "error_message":    self.message if self.traceback else None,
+            "stack_trace":      "\n".join(self._tail).rstrip() if self.traceback else None,
+            "screenshot_paths": self.screenshots,
+            "error_excerpts":   self.excerpts,
+        }
+
+
+def scan(stdout: str, stderr: str) -> Scan:
+    """Classify complete output in one pass per stream, for callers without a live Scan."""
+    s = Scan()
+    s.feed("stdout", stdout)
+    s.feed("stderr", stderr)
+    return s
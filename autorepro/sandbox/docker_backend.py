@@ -0,0 +1,177 @@
+"""Docker sandbox backend — each script runs in a warm pooled container or a fresh cold one."""
+
+import threading
+from concurrent.futures import TimeoutError as FutureTimeout
+from pathlib import Path
+
+from sandbox import docker_client, pool
+from sandbox.backend import SCRIPT_ENV, ContainerError, SandboxBackend, TimeoutError, phase
+from sandbox.log_stream import LogCollector, follow, follow_exec
+from utils import config
+
+
+class DockerBackend(SandboxBackend):
+    """Runs scripts in the sandbox image, leasing from the warm pool when it is enabled."""
+
+    def execute(self, script_path: Path, script_content: str, artifacts_dir: Path,
+                collector: LogCollector, session: str | None) -> tuple[str, str, int]:
+        warm   = pool.get()
+        leased = None
+        if warm is not None:
+            with phase(collector.job_id, "lease", True):
+                leased = warm.lease(session)
+        if leased is not None:
+            return _run_pooled(leased, warm, script_content, artifacts_dir, session, collector)
+        return _run_cold(script_path, artifacts_dir, collector)
+
+    def end_session(self, job_id: str) -> None:
+        warm = pool.get()
+        if warm is not None:
+            warm.end_session(job_id)
+
+
+def _run_pooled(leased: "pool.PooledContainer", warm: "pool.ContainerPool", script_content: str,
+                artifacts_dir: Path, session: str | None, collector: LogCollector) -> tuple[str, str, int]:
+    """Hand the script to a pre-started container and execute it with a hard timeout.
+
+    In browser-session mode the script runs through the in-container bootstrap, which attaches
+    it to the job's long-lived Chromium, and the container stays pinned to the job afterwards.
+    When the attempt is finalized early, the script is killed and the container released from
+    a background thread.
+    """
+    job_id     = collector.job_id
+    broken     = False
+    background = False
+    try:
+        if session is not None and not leased.session:
+            with phase(job_id, "session", True):
+                leased.open_session()
+        with phase(job_id, "copy", True):
+            leased.put_script(script_content)
+        entry = ["python", "/scripts/script.py"]
+        if leased.session:
+            entry.insert(1, pool.BOOTSTRAP)
+        # timeout(1) leads its own process group; its pid is recorded so an early exit can kill the group.
+        api = leased.container.client.api
+        with phase(job_id, "exec", True):
+            exec_id = api.exec_create(
+                leased.container.id,
+                ["sh", "-c", f'echo $$ > {pool.ATTEMPT_PIDFILE}; exec timeout -s KILL {config.SANDBOX_TIMEOUT_SECONDS} "$@"',
+                 "sh", *entry],
+                user="1000",
+                workdir="/app",
+                environment=SCRIPT_ENV,
+            )["Id"]
+            follow_exec(api, exec_id, collector)
+            if not collector.wait(config.SANDBOX_TIMEOUT_SECONDS + 5):
+                raise TimeoutError(f"Container exceeded {config.SANDBOX_TIMEOUT_SECONDS}s timeout")
+            settled = collector.settle(config.EARLY_EXIT_GRACE_SECONDS)
+        if settled:
+            exit_code = api.exec_inspect(exec_id)["ExitCode"]
+            if exit_code in (124, 137):
+                raise TimeoutError(f"Container exceeded {config.SANDBOX_TIMEOUT_SECONDS}s timeout")
+        else:
+            exit_code  = collector.implied_exit_code
+            background = True
+        with phase(job_id, "artifacts", True):
+            leased.fetch_screenshots(artifacts_dir)
+        return collector.text("stdout"), collector.text("stderr"), exit_code
+    except TimeoutError:
+        broken = True
+        raise
+    except Exception as e:
+        broken = True
+        raise ContainerError(f"Pooled container failed: {e}") from e
+    finally:
+        if background and not broken:
+            _in_background(_stop_and_release, leased, warm, session)
+        else:
+            with phase(job_id, "release", True):
+                warm.release(leased, broken=broken, keep_for=session)
+
+
+def _stop_and_release(leased: "pool.PooledContainer", warm: "pool.ContainerPool", session: str | None) -> None:
+    broken = False
+    try:
+        leased.stop_attempt()
+    except Exception:
+        broken = True
+    warm.release(leased, broken=broken, keep_for=session)
+
+
+def _run_cold(script_path: Path, artifacts_dir: Path, collector: LogCollector) -> tuple[str, str, int]:
+    """Create a fresh container for this script, wait for it and tear it down."""
+    job_id       = collector.job_id
+    container    = None
+    container_id = None
+    exited       = None
+
+    try:
+        with phase(job_id, "create", False):
+            container = docker_client.create(
+                image=config.SANDBOX_IMAGE,
+                volumes={
+                    str(script_path.resolve()):   {"bind": "/scripts/script.py", "mode": "ro"},
+                    str(artifacts_dir.resolve()): {"bind": "/screenshots",       "mode": "rw"},
+                },
+                environment=SCRIPT_ENV,
+                mem_limit=f"{config.SANDBOX_MEMORY_MB}m",
+                nano_cpus=1_000_000_000,
+                network_mode="bridge",
+                user="1000",
+                auto_remove=False,
+            )
+        container_id = container.id
+        exited       = docker_client.watcher().expect(container_id)
+        with phase(job_id, "start", False):
+            container.start()
+
+        # Followed log streams end when the container exits, so the collector doubles as the wait.
+        with phase(job_id, "wait", False):
+            follow(container, collector)
+            if not collector.wait(config.SANDBOX_TIMEOUT_SECONDS):
+                container.kill()
+                raise TimeoutError(f"Container exceeded {config.SANDBOX_TIMEOUT_SECONDS}s timeout")
+            settled = collector.settle(config.EARLY_EXIT_GRACE_SECONDS)
+
+        if settled:
+            exit_code = _exit_code(container, exited)
+        else:
+            exit_code = collector.implied_exit_code
+            _in_background(_remove, container)
+            container = None
+
+    finally:
+        if exited is not None:
+            docker_client.watcher().forget(container_id)
+        if container:
+            with phase(job_id, "remove", False):
+                _remove(container)
+
+    return collector.text("stdout"), collector.text("stderr"), exit_code
+
+
+def _exit_code(container, exited) -> int:
+    """Exit code from the container's die event, falling back to a wait bounded by the sandbox timeout
+    if the event is late."""
+    try:
+        return exited.result(timeout=config.DOCKER_EXIT_EVENT_TIMEOUT_SECONDS)
+    except FutureTimeout:
+        pass
+    try:
+        return container.wait(timeout=config.SANDBOX_TIMEOUT_SECONDS)["StatusCode"]
+    except Exception:
+        container.kill()
+        raise TimeoutError(f"Container exceeded {config.SANDBOX_TIMEOUT_SECONDS}s timeout")
+
+
+def _remove(container) -> None:
+    try:
+        container.remove(force=True)
+    except Exception:
+        pass
+
+
+def _in_background(fn, *args) -> None:
+    """Run teardown off the request path so a finalized attempt returns immediately."""
+    threading.Thread(target=fn, args=args, name="sandbox-teardown", daemon=True).start()
@@ -0,0 +1,184 @@
+"""Process-wide Docker client — one connection pool for every sandbox call, plus one thread for container exits.
+
+The client's HTTP pool is sized to the sandbox concurrency, so concurrent runs reuse connections
+instead of opening (and discarding) their own. Calls made through call() survive a daemon restart:
+on a connection error the client is rebuilt and the call retried. Containers are created through
+create(), which removes whatever a try with a lost response left behind before retrying. Cold runs learn that their
+container exited from a single "die" event subscription instead of a blocking wait each.
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from typing import Callable, TypeVar
+
+import docker
+import requests
+
+from utils import config, metrics
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+T = TypeVar("T")
+
+_client: docker.DockerClient | None = None
+_lock                               = threading.Lock()
+
+
+def pool_size() -> int:
+    """HTTP connections kept per client: DOCKER_MAX_POOL_SIZE, or enough for every sandbox at once.
+
+    A cold run holds two followed log streams plus a control call; a pooled run one exec stream
+    plus a control call. A few more cover the pool maintainer and the event subscription.
+    """
+    return config.DOCKER_MAX_POOL_SIZE or 3 * config.SANDBOX_MAX_CONTAINERS + 4
+
+
+def get() -> docker.DockerClient:
+    """Return the shared client, connecting on first use."""
+    global _client
+    with _lock:
+        if _client is None:
+            _client = docker.DockerClient.from_env(max_pool_size=pool_size())
+        return _client
+
+
+def reset() -> None:
+    """Drop the shared client so the next get() reconnects.
+
+    The old client is not closed: containers it created still hold it and keep working once the
+    daemon is reachable again.
+    """
+    global _client
+    with _lock:
+        _client = None
+    metrics.DOCKER_RECONNECTS.inc()
+
+
+# Set to a fresh token per create(), so a container whose create response was lost can be found.
+CREATE_LABEL = "autorepro.create"
+
+
+def call(fn: Callable[[docker.DockerClient], T]) -> T:
+    """Run fn with the shared client, reconnecting and retrying on connection failures.
+
+    fn must be safe to repeat; create containers with create() instead.
+    """
+    for attempt in range(config.DOCKER_RECONNECT_ATTEMPTS + 1):
+        try:
+            return fn(get())
+        except (requests.exceptions.ConnectionError, docker.errors.DockerException) as e:
+            if isinstance(e, docker.errors.APIError) or attempt == config.DOCKER_RECONNECT_ATTEMPTS:
+                raise
+            log.warning("docker_reconnect", attempt=attempt + 1, error=str(e))
+            reset()
+            time.sleep(min(2 ** attempt * 0.5, 5))
+
+
+def create(start: bool = False, **kwargs) -> docker.models.containers.Container:
+    """containers.create (or containers.run with start=True) through call(). Before a retry, any
+    container the failed try did create is removed, so a lost response cannot leak a duplicate."""
+    token  = uuid.uuid4().hex
+    labels = {**kwargs.pop("labels", {}), CREATE_LABEL: token}
+    tries  = 0
+
+    def fn(client: docker.DockerClient):
+        nonlocal tries
+        if tries:
+            for orphan in client.containers.list(all=True, filters={"label": f"{CREATE_LABEL}={token}"}):
+                orphan.remove(force=True)
+        tries += 1
+        return (client.containers.run if start else client.containers.create)(labels=labels, **kwargs)
+
+    return call(fn)
+
+
+def ping() -> None:
+    """Raise if the daemon is unreachable."""
+    call(lambda c: c.ping())
+
+
+class ExitWatcher:
+    """Follows the daemon's container "die" events on one thread and resolves per-container futures.
+
+    Register with expect() after create and before start, so the exit cannot be missed. If the
+    event stream breaks it is re-opened from the last event seen, replaying anything in between.
+    """
+
+    def __init__(self):
+        self._waiters: dict[str, Future] = {}
+        self._lock    = threading.Lock()
+        self._stop    = threading.Event()
+        self._stream  = None
+        self._since   = None
+        self._thread  = threading.Thread(target=self._run, name="docker-events", daemon=True)
+
+    def start(self) -> None:
+        self._since = int(time.time())
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        stream = self._stream
+        if stream is not None:
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+    def expect(self, container_id: str) -> Future:
+        """Return a future that resolves to the container's exit code when it dies."""
+        future = Future()
+        with self._lock:
+            self._waiters[container_id] = future
+        return future
+
+    def forget(self, container_id: str) -> None:
+        with self._lock:
+            self._waiters.pop(container_id, None)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._stream = get().events(decode=True, since=self._since,
+                                            filters={"type": "container", "event": "die"})
+                for event in self._stream:
+                    self._since = event.get("time", self._since)
+                    with self._lock:
+                        future = self._waiters.pop(event.get("id"), None)
+                    if future is not None:
+                        code = event.get("Actor", {}).get("Attributes", {}).get("exitCode", "-1")
+                        future.set_result(int(code))
+            except Exception as e:
+                if self._stop.is_set():
+                    return
+                log.warning("docker_events_disconnected", error=str(e))
+                reset()
+            self._stop.wait(1)
+
+
+_watcher: ExitWatcher | None = None
+
+
+def watcher() -> ExitWatcher:
+    """Return the process-wide exit watcher, starting it on first use."""
+    global _watcher
+    with _lock:
+        if _watcher is None:
+            _watcher = ExitWatcher()
+            _watcher.start()
+        return _watcher
+
+
+def shutdown() -> None:
+    """Stop the exit watcher and close the shared client."""
+    global _watcher, _client
+    with _lock:
+        w, _watcher = _watcher, None
+        c, _client  = _client, None
+    if w is not None:
+        w.stop()
+    if c is not None:
+        c.close()
@@ -0,0 +1,93 @@
+"""In-process fake sandbox backend — no browser, no container; walks the script against the live target.
+
+Selected with SANDBOX_BACKEND=fake (the benchmark harness and offline tests use it). The script is never
+executed: its `print("...")` literals (and the autorepro_helpers step()/reproduced() calls) are
+echoed in order and every `By.ID` locator is checked
+against the ids present on the target page (and the page its form posts back), so a script with
+a wrong locator fails with a NoSuchElementException just as it would under Selenium, and the page
+source is saved to the artifacts directory as autorepro_helpers.session() does.
+"""
+
+import re
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from sandbox.backend import SandboxBackend, phase
+from sandbox.log_stream import LogCollector
+from utils import config
+
+_GET   = re.compile(r'driver\.get\(\s*f?"([^"]+)"')
+_PRINT = re.compile(r'^\s*print\(\s*"([^"{}]*)"\s*\)')
+_STEP  = re.compile(r'^\s*step\(\s*(\d+)\s*,\s*"([^"{}]*)"\s*\)')
+_DONE  = re.compile(r'^\s*reproduced\(\s*(?:"([^"{}]*)")?\s*\)')
+_BY_ID = re.compile(r'By\.ID\s*,\s*"([^"]+)"')
+_IDS   = re.compile(r'\bid="([^"]+)"')
+
+_TRACEBACK = (
+    "Traceback (most recent call last):\n"
+    '  File "/scripts/script.py", line {line}, in <module>\n'
+    "{error}\n"
+)
+
+
+def _pages(url: str, submits: bool) -> list[str]:
+    """The page at url, plus the response to posting its form when the script submits."""
+    html = []
+    for data in (None, b"") if submits else (None,):
+        with urllib.request.urlopen(urllib.request.Request(url, data=data), timeout=10) as r:
+            html.append(r.read().decode("utf-8", errors="replace"))
+    return html
+
+
+class FakeBackend(SandboxBackend):
+    """Simulates runs in-process after FAKE_SANDBOX_LATENCY_SECONDS of pretend startup."""
+
+    def execute(self, script_path: Path, script_content: str, artifacts_dir: Path,
+                collector: LogCollector, session: str | None) -> tuple[str, str, int]:
+        with phase(collector.job_id, "exec"):
+            return _simulate(script_content, artifacts_dir, collector)
+
+
+def _simulate(script_content: str, artifacts_dir: Path, collector: LogCollector) -> tuple[str, str, int]:
+    time.sleep(config.FAKE_SANDBOX_LATENCY_SECONDS)
+    exit_code = 0
+    try:
+        url = _GET.search(script_content)
+        submits = any(call in script_content for call in (".click()", ".submit()", "click(driver"))
+        pages   = _pages(url.group(1), submits) if url else []
+        ids     = set(_IDS.findall("\n".join(pages)))
+    except (urllib.error.URLError, OSError) as e:
+        collector.feed("stdout", f"Error: ConnectionRefused {e}\n".encode())
+        collector.feed("stderr", _TRACEBACK.format(line=1, error=f"ConnectionRefusedError: {e}").encode())
+        collector.close()
+        return collector.text("stdout"), collector.text("stderr"), 1
+
+    for n, line in enumerate(script_content.splitlines(), 1):
+        if collector.cancelled:
+            break
+        printed = _PRINT.match(line)
+        if printed:
+            collector.feed("stdout", f"{printed.group(1)}\n".encode())
+        stepped = _STEP.match(line)
+        if stepped:
+            collector.feed("stdout", f"Step {stepped.group(1)}: {stepped.group(2)}\n".encode())
+        done = _DONE.match(line)
+        if done:
+            message = f"Bug confirmed: {done.group(1)}\n" if done.group(1) else ""
+            collector.feed("stdout", f"{message}REPRODUCED\n".encode())
+        missing = [i for i in _BY_ID.findall(line) if i not in ids]
+        if missing:
+            error = (f"selenium.common.exceptions.NoSuchElementException: Message: no such element: "
+                     f'Unable to locate element: {{"method":"css selector","selector":"[id=\\"{missing[0]}\\"]"}}')
+            collector.feed("stdout", f"Error: {error}\n".encode())
+            if pages:
+                name = f"page_{int(time.time())}.html"
+                (artifacts_dir / name).write_text("\n".join(pages))
+                collector.feed("stdout", f"Page source saved: /screenshots/{name}\n".encode())
+            collector.feed("stderr", _TRACEBACK.format(line=n, error=error).encode())
+            exit_code = 1
+            break
+    collector.close()
+    return collector.text("stdout"), collector.text("stderr"), exit_code
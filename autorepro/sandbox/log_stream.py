@@ -0,0 +1,208 @@
+"""Incremental capture of sandbox stdout/stderr, forwarding complete lines to job watchers.
+
+Memory use is bounded: only the first LOG_HEAD_BYTES and last LOG_TAIL_BYTES of each stream are
+kept, while the full output is written to log files under the job's artifacts directory.
+
+Each line is also fed to the run's classifier Scan, so the runner can finalize an attempt as soon
+as the success marker or a fatal exception shows up, without waiting for the script (and its
+browser teardown) to exit, and can parse the result without rescanning the output.
+"""
+
+import threading
+from pathlib import Path
+
+from sandbox.classifier import Scan
+from utils import config, events
+
+
+class _Window:
+    """The head and tail of one stream, plus how many bytes it had in total."""
+
+    def __init__(self, head: int, tail: int):
+        self.head_max = head
+        self.tail_max = tail
+        self.head     = bytearray()
+        self.tail     = bytearray()
+        self.total    = 0
+
+    def add(self, chunk: bytes) -> None:
+        self.total += len(chunk)
+        room = self.head_max - len(self.head)
+        if room > 0:
+            self.head += chunk[:room]
+            chunk      = chunk[room:]
+        if chunk:
+            self.tail += chunk
+            if len(self.tail) > self.tail_max:
+                del self.tail[:len(self.tail) - self.tail_max]
+
+    @property
+    def dropped(self) -> int:
+        return self.total - len(self.head) - len(self.tail)
+
+
+class LogCollector:
+    """Accumulates raw output chunks per stream and publishes each finished line as it arrives."""
+
+    def __init__(self, job_id: str):
+        self.job_id    = job_id
+        self.verdict   = None   # "reproduced" or "fatal" once a deciding line has been printed
+        self.cut_short = False  # set when the attempt was finalized before its output ended
+        self.cancelled = False  # set by cancel(), e.g. when a sibling fan-out candidate reproduced
+        self.scan      = Scan()
+        self.log_files = {}     # stream -> full log file, once spill() was called
+        self._windows  = {s: _Window(config.LOG_HEAD_BYTES, config.LOG_TAIL_BYTES) for s in ("stdout", "stderr")}
+        self._files    = {}
+        self._partial  = {"stdout": b"", "stderr": b""}
+        self._lock     = threading.Lock()
+        self._drained  = threading.Event()
+        self._ready    = threading.Event()
+
+    def spill(self, directory: Path, name: str) -> None:
+        """Also write each stream in full to <directory>/<name>.<stream>.log."""
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            for stream in ("stdout", "stderr"):
+                path = directory / f"{name}.{stream}.log"
+                self._files[stream]    = path.open("wb")
+                self.log_files[stream] = path
+
+    def feed(self, stream: str, chunk: bytes) -> None:
+        """Record a chunk of output from one stream."""
+        with self._lock:
+            self._windows[stream].add(chunk)
+            if stream in self._files:
+                self._files[stream].write(chunk)
+            data  = self._partial[stream] + chunk
+            lines = data.split(b"\n")
+            self._partial[stream] = lines.pop()
+        for line in lines:
+            self._emit(stream, line)
+
+    def close(self) -> None:
+        """Flush any trailing line that had no newline and mark the output complete."""
+        with self._lock:
+            pending       = dict(self._partial)
+            self._partial = {"stdout": b"", "stderr": b""}
+        for stream, line in pending.items():
+            if line:
+                self._emit(stream, line)
+        with self._lock:
+            files, self._files = self._files, {}
+        for f in files.values():
+            f.close()
+        self._drained.set()
+        self._ready.set()
+
+    def wait(self, timeout: float) -> bool:
+        """Block until the output is complete or a verdict line arrived; False on timeout."""
+        return self._ready.wait(timeout)
+
+    def cancel(self) -> None:
+        """Abandon the attempt: unblocks wait() and skips the grace period. No-op once output ended."""
+        if self._drained.is_set():
+            return
+        self.cancelled = True
+        self._ready.set()
+
+    def settle(self, grace: float) -> bool:
+        """Give trailing output up to grace seconds to finish; True if the output ended on its own."""
+        if self.cancelled:
+            grace = 0
+        elif self.verdict is None:
+            grace = None
+        if not self._drained.wait(grace):
+            self.cut_short = True
+        return not self.cut_short
+
+    @property
+    def implied_exit_code(self) -> int:
+        """Exit code to report for an attempt finalized before its process exited."""
+        return 0 if self.verdict == "reproduced" else 1
+
+    def text(self, stream: str) -> str:
+        """The stream so far, decoded; when it outgrew the window, its head and tail around an omission note."""
+        with self._lock:
+            w = self._windows[stream]
+            if w.dropped <= 0:
+                return (w.head + w.tail).decode("utf-8", errors="replace")
+            where = f"see {self.log_files[stream].name}" if stream in self.log_files else "not kept"
+            note  = f"\n... [{w.dropped} bytes omitted; full log {where}] ...\n"
+            return w.head.decode("utf-8", errors="replace") + note + w.tail.decode("utf-8", errors="replace")
+
+    def truncated(self) -> bool:
+        with self._lock:
+            return any(w.dropped > 0 for w in self._windows.values())
+
+    def _emit(self, stream: str, line: bytes) -> None:
+        text = line.decode("utf-8", errors="replace")
+        with self._lock:
+            self.scan.feed(stream, text)
+        if self.verdict is None and config.EARLY_EXIT_ENABLED:
+            if self.scan.reproduced:
+                self.verdict = "reproduced"
+            elif self.scan.fatal:
+                self.verdict = "fatal"
+            if self.verdict is not None:
+                self._ready.set()
+        events.publish(self.job_id, "log", stream=stream, line=text)
+
+
+def follow(container, collector: LogCollector) -> list[threading.Thread]:
+    """Feed a container's stdout and stderr into the collector from two daemon threads."""
+    return _pump_streams(collector, "logs", {
+        stream: (lambda stream=stream: container.logs(stdout=stream == "stdout", stderr=stream == "stderr",
+                                                      stream=True, follow=True))
+        for stream in ("stdout", "stderr")
+    })
+
+
+def follow_process(proc, collector: LogCollector) -> list[threading.Thread]:
+    """Feed a child process's stdout and stderr pipes into the collector from two daemon threads."""
+    return _pump_streams(collector, "proc", {
+        "stdout": lambda: iter(lambda: proc.stdout.read1(65536), b""),
+        "stderr": lambda: iter(lambda: proc.stderr.read1(65536), b""),
+    })
+
+
+def _pump_streams(collector: LogCollector, name: str, sources: dict) -> list[threading.Thread]:
+    """Drain each stream's chunk iterator in its own thread; the last one to finish closes the collector."""
+    remaining = [len(sources)]
+    lock      = threading.Lock()
+
+    def pump(stream: str):
+        try:
+            for chunk in sources[stream]():
+                collector.feed(stream, chunk)
+        except Exception:
+            pass
+        finally:
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                collector.close()
+
+    threads = [threading.Thread(target=pump, args=(s,), name=f"{name}-{s}", daemon=True) for s in sources]
+    for t in threads:
+        t.start()
+    return threads
+
+
+def follow_exec(api, exec_id: str, collector: LogCollector) -> threading.Thread:
+    """Feed a started exec's demultiplexed output into the collector from a daemon thread."""
+    def pump():
+        try:
+            for out, err in api.exec_start(exec_id, stream=True, demux=True):
+                if out:
+                    collector.feed("stdout", out)
+                if err:
+                    collector.feed("stderr", err)
+        except Exception:
+            pass
+        finally:
+            collector.close()
+
+    t = threading.Thread(target=pump, name="logs-exec", daemon=True)
+    t.start()
+    return t
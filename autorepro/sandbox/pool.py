@@ -0,0 +1,359 @@
+"""Warm pool of pre-started sandbox containers leased by runner.run instead of cold starts."""
+
+import io
+import tarfile
+import threading
+import time
+from pathlib import Path
+
+import docker
+
+from sandbox import docker_client
+from utils import config
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+IDLE_COMMAND          = ["sleep", "infinity"]
+RESET_COMMAND         = ["sh", "-c", "rm -rf /scripts/* /screenshots/* /tmp/* 2>/dev/null; true"]
+ATTEMPT_RESET_COMMAND = ["sh", "-c", "rm -rf /scripts/* /screenshots/* 2>/dev/null; true"]
+BOOTSTRAP             = "/opt/autorepro/session_bootstrap.py"
+ATTEMPT_PIDFILE       = "/tmp/attempt.pid"
+# Session mode kills only the attempt's process group so the shared browser survives;
+# otherwise every sandbox-user process except PID 1 (the idle command) goes, browser included.
+STOP_ATTEMPT_COMMAND  = ["sh", "-c", f"kill -KILL -- -$(cat {ATTEMPT_PIDFILE}) 2>/dev/null; true"]
+STOP_ALL_COMMAND      = ["sh", "-c", "kill -KILL -1 2>/dev/null; true"]
+CHROMEDRIVER_COMMAND  = ["sh", "-c", "mkdir -p /tmp/autorepro && chromedriver --port=9515 "
+                                     "> /tmp/autorepro/chromedriver.log 2>&1 & "
+                                     "echo $! > /tmp/autorepro/chromedriver.pid"]
+SESSION_CLOSE_COMMAND = ["sh", "-c", f"python {BOOTSTRAP} --close; "
+                                     "kill $(cat /tmp/autorepro/chromedriver.pid) 2>/dev/null; true"]
+
+
+class PooledContainer:
+    """A pre-started sandbox container plus its usage bookkeeping."""
+
+    def __init__(self, container):
+        self.container  = container
+        self.runs       = 0
+        self.created_at = time.time()
+        self.session    = False
+
+    @property
+    def id(self) -> str:
+        return self.container.id
+
+    def put_script(self, script_content: str) -> None:
+        """Copy the script into /scripts/script.py inside the container."""
+        data = script_content.encode("utf-8")
+        buf  = io.BytesIO()
+        with tarfile.open(fileobj=buf, mode="w") as tar:
+            info       = tarfile.TarInfo("script.py")
+            info.size  = len(data)
+            info.uid   = info.gid = 1000
+            info.mode  = 0o444
+            info.mtime = int(time.time())
+            tar.addfile(info, io.BytesIO(data))
+        self.container.put_archive("/scripts", buf.getvalue())
+
+    def fetch_screenshots(self, dest: Path) -> None:
+        """Copy every file written under /screenshots back into the job's artifacts dir."""
+        try:
+            stream, _ = self.container.get_archive("/screenshots/.")
+        except docker.errors.NotFound:
+            return
+        buf = io.BytesIO(b"".join(stream))
+        with tarfile.open(fileobj=buf) as tar:
+            for member in tar.getmembers():
+                if not member.isfile():
+                    continue
+                f = tar.extractfile(member)
+                if f is not None:
+                    (dest / Path(member.name).name).write_bytes(f.read())
+
+    def reset(self) -> None:
+        """Wipe scripts, screenshots and temp files left by the previous run."""
+        if self.session:
+            self.close_session()
+        self.container.exec_run(RESET_COMMAND, user="root")
+
+    def open_session(self) -> None:
+        """Start chromedriver so attempts can share one long-lived browser session."""
+        self.container.exec_run(CHROMEDRIVER_COMMAND, user="1000", detach=True)
+        self.session = True
+
+    def close_session(self) -> None:
+        """Quit the shared browser session and stop chromedriver."""
+        self.container.exec_run(SESSION_CLOSE_COMMAND, user="1000")
+        self.session = False
+
+    def stop_attempt(self) -> None:
+        """Kill a script that is still running after its attempt was finalized early."""
+        self.container.exec_run(STOP_ATTEMPT_COMMAND if self.session else STOP_ALL_COMMAND, user="1000")
+
+    def healthy(self) -> bool:
+        """Return True if the container is still running and responds to exec."""
+        try:
+            self.container.reload()
+            if self.container.status != "running":
+                return False
+            return self.container.exec_run(["true"]).exit_code == 0
+        except Exception:
+            return False
+
+    def destroy(self) -> None:
+        try:
+            self.container.remove(force=True)
+        except Exception:
+            pass
+
+
+class ContainerPool:
+    """Thread-safe pool of idle sandbox containers with min/max sizing and recycling."""
+
+    def __init__(self, min_size: int, max_size: int, recycle_after: int, lease_timeout: float):
+        self.min_size      = min_size
+        self.max_size      = max(max_size, min_size)
+        self.recycle_after = recycle_after
+        self.lease_timeout = lease_timeout
+
+        self._idle: list[PooledContainer]        = []
+        self._leased: set[str]                   = set()
+        self._pinned: dict[str, PooledContainer] = {}
+        self._starting                           = 0
+        self._cond                               = threading.Condition()
+        self._stop                               = threading.Event()
+        self._maintainer                         = None
+
+        self._stats = {
+            "leases": 0, "lease_wait_seconds_total": 0.0, "lease_wait_seconds_max": 0.0,
+            "exhausted": 0, "created": 0, "recycled": 0, "unhealthy": 0, "session_reuses": 0,
+        }
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def start(self) -> None:
+        """Fill the pool up to min_size and start the background maintainer."""
+        self._fill()
+        self._maintainer = threading.Thread(target=self._maintain, name="sandbox-pool", daemon=True)
+        self._maintainer.start()
+        log.info("pool_started", min_size=self.min_size, max_size=self.max_size)
+
+    def shutdown(self) -> None:
+        """Stop the maintainer and remove every pooled container."""
+        self._stop.set()
+        with self._cond:
+            idle, self._idle = self._idle, []
+            idle.extend(self._pinned.values())
+            self._pinned.clear()
+            self._cond.notify_all()
+        for pc in idle:
+            pc.destroy()
+        log.info("pool_shutdown", removed=len(idle))
+
+    # -- leasing -----------------------------------------------------------
+
+    def lease(self, job_id: str | None = None) -> PooledContainer | None:
+        """Lease an idle container, waiting up to lease_timeout. Returns None when exhausted.
+
+        With a job_id, a container pinned to that job by a previous release(keep_for=...) is
+        returned first so its browser session can be reused.
+        """
+        if job_id is not None:
+            with self._cond:
+                pc = self._pinned.pop(job_id, None)
+                if pc is not None:
+                    self._leased.add(pc.id)
+                    self._stats["leases"] += 1
+                    self._stats["session_reuses"] += 1
+                    return pc
+
+        start    = time.time()
+        deadline = start + self.lease_timeout
+        grow     = False
+        with self._cond:
+            while not self._idle:
+                if self._total() < self.max_size:
+                    self._starting += 1
+                    grow = True
+                    break
+                remaining = deadline - time.time()
+                if remaining <= 0 or self._stop.is_set():
+                    self._stats["exhausted"] += 1
+                    log.warning("pool_exhausted", leased=len(self._leased), max_size=self.max_size)
+                    return None
+                self._cond.wait(remaining)
+            pc = None if grow else self._idle.pop()
+
+        if grow:
+            try:
+                pc = self._create()
+            finally:
+                with self._cond:
+                    self._starting -= 1
+            if pc is None:
+                with self._cond:
+                    self._stats["exhausted"] += 1
+                return None
+
+        waited = time.time() - start
+        with self._cond:
+            self._leased.add(pc.id)
+            self._stats["leases"] += 1
+            self._stats["lease_wait_seconds_total"] += waited
+            self._stats["lease_wait_seconds_max"] = max(self._stats["lease_wait_seconds_max"], waited)
+        return pc
+
+    def release(self, pc: PooledContainer, broken: bool = False, keep_for: str | None = None) -> None:
+        """Return a leased container: reset and re-idle it, or destroy it if spent or broken.
+
+        With keep_for, a healthy container is pinned to that job (only per-attempt files are
+        cleared) until end_session() hands it back to the idle set.
+        """
+        pc.runs += 1
+        self._return(pc, broken, keep_for)
+
+    def end_session(self, job_id: str) -> None:
+        """Release the container pinned to a finished job back into the idle set."""
+        with self._cond:
+            pc = self._pinned.pop(job_id, None)
+            if pc is None:
+                return
+            self._leased.add(pc.id)
+        self._return(pc)
+
+    def stats(self) -> dict:
+        """Return occupancy and lease-wait metrics."""
+        with self._cond:
+            leases = self._stats["leases"]
+            return {
+                "enabled":   True,
+                "min_size":  self.min_size,
+                "max_size":  self.max_size,
+                "idle":      len(self._idle),
+                "leased":    len(self._leased),
+                "pinned":    len(self._pinned),
+                "starting":  self._starting,
+                **self._stats,
+                "lease_wait_seconds_avg": round(self._stats["lease_wait_seconds_total"] / leases, 4) if leases else 0.0,
+            }
+
+    # -- internals ---------------------------------------------------------
+
+    def _total(self) -> int:
+        return len(self._idle) + len(self._leased) + len(self._pinned) + self._starting
+
+    def _return(self, pc: PooledContainer, broken: bool = False, keep_for: str | None = None) -> None:
+        retire = broken or pc.runs >= self.recycle_after or self._stop.is_set()
+        if keep_for is not None and not retire:
+            try:
+                pc.container.exec_run(ATTEMPT_RESET_COMMAND, user="root")
+                with self._cond:
+                    self._leased.discard(pc.id)
+                    self._pinned[keep_for] = pc
+                return
+            except Exception as e:
+                log.warning("pool_reset_failed", container=pc.id[:12], error=str(e))
+                retire = True
+        if not retire:
+            try:
+                pc.reset()
+            except Exception as e:
+                log.warning("pool_reset_failed", container=pc.id[:12], error=str(e))
+                retire = True
+        if retire:
+            pc.destroy()
+        with self._cond:
+            if retire and not broken:
+                self._stats["recycled"] += 1
+            self._leased.discard(pc.id)
+            if not retire:
+                self._idle.append(pc)
+            self._cond.notify()
+
+    def _create(self) -> PooledContainer | None:
+        try:
+            container = docker_client.create(
+                start=True,
+                image=config.SANDBOX_IMAGE,
+                command=IDLE_COMMAND,
+                mem_limit=f"{config.SANDBOX_MEMORY_MB}m",
+                nano_cpus=1_000_000_000,
+                network_mode="bridge",
+                user="1000",
+                labels={"autorepro.pool": "1"},
+                detach=True,
+                auto_remove=False,
+            )
+        except Exception as e:
+            log.error("pool_create_failed", error=str(e))
+            return None
+        with self._cond:
+            self._stats["created"] += 1
+        return PooledContainer(container)
+
+    def _fill(self) -> None:
+        while not self._stop.is_set():
+            with self._cond:
+                if self._total() >= self.min_size or self._total() >= self.max_size:
+                    return
+                self._starting += 1
+            pc = self._create()
+            with self._cond:
+                self._starting -= 1
+                if pc is None:
+                    return
+                self._idle.append(pc)
+                self._cond.notify()
+
+    def _maintain(self) -> None:
+        while not self._stop.wait(config.POOL_HEALTH_INTERVAL_SECONDS):
+            with self._cond:
+                idle, self._idle = self._idle, []
+            alive = []
+            for pc in idle:
+                if pc.healthy():
+                    alive.append(pc)
+                else:
+                    log.warning("pool_container_unhealthy", container=pc.id[:12])
+                    pc.destroy()
+            with self._cond:
+                self._stats["unhealthy"] += len(idle) - len(alive)
+                self._idle.extend(alive)
+                self._cond.notify_all()
+            self._fill()
+
+
+_pool: ContainerPool | None = None
+
+
+def start() -> None:
+    """Create and warm the process-wide pool if enabled in config."""
+    global _pool
+    if config.POOL_MAX_SIZE <= 0 or _pool is not None:
+        return
+    _pool = ContainerPool(
+        min_size=config.POOL_MIN_SIZE,
+        max_size=config.POOL_MAX_SIZE,
+        recycle_after=config.POOL_RECYCLE_AFTER,
+        lease_timeout=config.POOL_LEASE_TIMEOUT_SECONDS,
+    )
+    _pool.start()
+
+
+def shutdown() -> None:
+    """Tear down the process-wide pool."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+
+
+def get() -> ContainerPool | None:
+    """Return the process-wide pool, or None when pooling is disabled."""
+    return _pool
+
+
+def stats() -> dict:
+    """Return pool metrics, or a disabled marker when pooling is off."""
+    return _pool.stats() if _pool is not None else {"enabled": False}
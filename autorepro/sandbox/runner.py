@@ -1,9 +1,19 @@
-"""Container lifecycle management — runs Selenium scripts in isolated Docker containers."""
+"""Script execution facade — security gate, global slot cap and parsing over the configured SandboxBackend.
 
+SANDBOX_BACKEND selects docker (default), subprocess (confined local processes) or fake
+(in-process, no browser).
+"""
+
+import asyncio
+import threading
 import time
-import docker
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 
+# The exceptions are re-exported: callers catch runner.TimeoutError, runner.Cancelled, ...
+from sandbox.backend import Cancelled, ContainerError, SandboxBackend, TimeoutError, phase
+from sandbox.log_stream import LogCollector
 from sandbox.feedback_parser import parse
 from sandbox.security import check, SecurityError
 from utils import config
@@ -11,63 +21,117 @@ from utils.logger import get_logger
 
 log = get_logger(__name__)
 
-
-class TimeoutError(Exception):
-    """Raised when container execution exceeds the configured timeout."""
-    pass
-
-
-class ContainerError(Exception):
-    """Raised when container fails to start or encounters a runtime error."""
-    pass
-
-
-def run(script_path: str, job_id: str) -> dict:
-    """Run a Selenium script in an isolated Docker container. Returns ExecutionResult dict."""
+# Global cap on sandboxes running at once in this process, whatever the number of workers.
+_slots = threading.BoundedSemaphore(config.SANDBOX_MAX_CONTAINERS)
+
+# Blocking sandbox calls made on behalf of async callers run here, sized to the sandbox cap so
+# waiting on scripts never starves the event loop's default executor.
+_executor = ThreadPoolExecutor(max_workers=config.SANDBOX_MAX_CONTAINERS, thread_name_prefix="sandbox")
+
+_backend: SandboxBackend | None = None
+_backend_lock                   = threading.Lock()
+
+
+def get_backend() -> SandboxBackend:
+    """Return the process-wide sandbox backend, creating it on first use."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            if config.SANDBOX_BACKEND == "subprocess":
+                from sandbox.subprocess_backend import SubprocessBackend
+                _backend = SubprocessBackend()
+            elif config.SANDBOX_BACKEND == "fake":
+                from sandbox.fake import FakeBackend
+                _backend = FakeBackend()
+            else:
+                from sandbox.docker_backend import DockerBackend
+                _backend = DockerBackend()
+        return _backend
+
+
+def start() -> None:
+    """Prepare this process to run scripts: check the Docker daemon and warm the pool when on docker."""
+    if config.SANDBOX_BACKEND == "docker":
+        from sandbox import docker_client
+        try:
+            docker_client.ping()
+            log.info("docker_daemon_ok")
+        except Exception as e:
+            raise RuntimeError(f"Docker daemon unreachable: {e}") from e
+    get_backend()
+    if config.SANDBOX_BACKEND == "docker":
+        from sandbox import pool
+        pool.start()
+
+
+def shutdown() -> None:
+    """Stop the warm pool and close the Docker client."""
+    if config.SANDBOX_BACKEND == "docker":
+        from sandbox import docker_client, pool
+        pool.shutdown()
+        docker_client.shutdown()
+
+
+def run(script_path: str, job_id: str, collector: LogCollector | None = None, shared_session: bool = True) -> dict:
+    """Run a Selenium script in the configured sandbox. Returns ExecutionResult dict.
+
+    Passing a collector lets the caller cancel the run from another thread. shared_session=False
+    keeps the run out of the job's pinned browser session, for attempts that run side by side.
+    """
     script_content = Path(script_path).read_text()
     check(script_content)
 
-    client = docker.from_env()
     artifacts_dir = Path(config.DATA_DIR) / "artifacts" / job_id
     artifacts_dir.mkdir(parents=True, exist_ok=True)
 
-    container = None
-    start = time.time()
-
+    start     = time.time()
+    collector = collector or LogCollector(job_id)
+    collector.spill(artifacts_dir / "logs", Path(script_path).stem)
+    session   = job_id if config.SANDBOX_BROWSER_SESSION and shared_session else None
     try:
-        container = client.containers.run(
-            image=config.SANDBOX_IMAGE,
-            volumes={
-                str(Path(script_path).resolve()): {"bind": "/scripts/script.py", "mode": "ro"},
-                str(artifacts_dir.resolve()):      {"bind": "/screenshots",       "mode": "rw"},
-            },
-            mem_limit=f"{config.SANDBOX_MEMORY_MB}m",
-            nano_cpus=1_000_000_000,
-            network_mode="bridge",
-            user="1000",
-            detach=True,
-            auto_remove=False,
-        )
+        with _slot(collector):
+            stdout, stderr, exit_code = get_backend().execute(Path(script_path), script_content, artifacts_dir,
+                                                              collector, session)
+    except Exception:
+        collector.close()  # releases the log files if the streams never started or ended
+        raise
+    if collector.cancelled and collector.cut_short:
+        raise Cancelled(f"Attempt {Path(script_path).name} cancelled")
+
+    duration = round(time.time() - start, 2)
+    with phase(job_id, "parse"):
+        result = parse(stdout, stderr, exit_code, collector.scan)
+    result["duration_seconds"] = duration
+    result["terminated_early"] = collector.cut_short
+    result["log_files"]        = {stream: p.name for stream, p in collector.log_files.items()}
+    result["truncated"]        = collector.truncated()
+    log.info("container_run_complete", job_id=job_id, exit_code=exit_code, duration=duration,
+             backend=config.SANDBOX_BACKEND, terminated_early=collector.cut_short)
+    return result
 
-        try:
-            container.wait(timeout=config.SANDBOX_TIMEOUT_SECONDS)
-        except Exception:
-            container.kill()
-            raise TimeoutError(f"Container exceeded {config.SANDBOX_TIMEOUT_SECONDS}s timeout")
 
-        stdout    = container.logs(stdout=True,  stderr=False).decode("utf-8", errors="replace")
-        stderr    = container.logs(stdout=False, stderr=True).decode("utf-8",  errors="replace")
-        exit_code = container.wait()["StatusCode"]
+async def run_async(script_path: str, job_id: str, collector: LogCollector | None = None,
+                    shared_session: bool = True) -> dict:
+    """Async variant of run: the blocking backend calls are offloaded to the sandbox executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, run, script_path, job_id, collector, shared_session)
 
+
+@contextmanager
+def _slot(collector: LogCollector):
+    """Hold one of the global sandbox slots, giving up if the attempt is cancelled while queued."""
+    with phase(collector.job_id, "slot"):
+        while not _slots.acquire(timeout=0.5):
+            if collector.cancelled:
+                raise Cancelled("Attempt cancelled while waiting for a sandbox slot")
+    try:
+        if collector.cancelled:
+            raise Cancelled("Attempt cancelled while waiting for a sandbox slot")
+        yield
     finally:
-        if container:
-            try:
-                container.remove(force=True)
-            except Exception:
-                pass
+        _slots.release()
 
-    duration = round(time.time() - start, 2)
-    result   = parse(stdout, stderr, exit_code)
-    result["duration_seconds"] = duration
-    log.info("container_run_complete", job_id=job_id, exit_code=exit_code, duration=duration)
-    return result
+
+def end_session(job_id: str) -> None:
+    """Release anything the backend keeps alive for a finished job's browser session."""
+    get_backend().end_session(job_id)
@@ -0,0 +1,122 @@
+"""Step library for generated scripts — driver setup, waits, screenshots and teardown in one import.
+
+Baked into the sandbox image at /opt/autorepro/ (on PYTHONPATH and byte-compiled at build time),
+so a generated script can write ``with session() as driver:`` and a few helper calls instead of
+emitting the same Chrome options, WebDriverWait boilerplate and try/except/finally every time.
+Works under the session bootstrap too: it patches ``webdriver.Chrome``, which new_driver() calls.
+
+Example:
+    from autorepro_helpers import By, session, step, click, type_text, wait_for, reproduced
+
+    with session() as driver:
+        step(1, "Open the login page")
+        driver.get("http://host.docker.internal:5000/login")
+        type_text(driver, By.ID, "username", "testuser")
+        click(driver, By.ID, "submit")
+        if "Invalid credentials" in wait_for(driver, By.ID, "error").text:
+            reproduced("Login rejects valid credentials")
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By  # noqa: F401  (re-exported for scripts)
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+SCREENSHOT_DIR = os.environ.get("AUTOREPRO_SCREENSHOTS", "/screenshots")
+CHROMIUM       = os.environ.get("AUTOREPRO_CHROMIUM", "/usr/bin/chromium")
+CHROMEDRIVER   = os.environ.get("AUTOREPRO_CHROMEDRIVER", "/usr/bin/chromedriver")
+SUCCESS_MARKER = "REPRODUCED"
+TIMEOUT        = 10
+
+
+def new_driver() -> webdriver.Chrome:
+    """Headless Chromium with the options the sandbox needs."""
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.binary_location = CHROMIUM
+    return webdriver.Chrome(service=Service(CHROMEDRIVER), options=options)
+
+
+def step(n: int, text: str) -> None:
+    """Announce a step on stdout, as every script must before each significant action."""
+    print(f"Step {n}: {text}", flush=True)
+
+
+def wait_for(driver, by: str, value: str, timeout: float = TIMEOUT) -> WebElement:
+    """The element once it is present."""
+    return WebDriverWait(driver, timeout).until(EC.presence_of_element_located((by, value)))
+
+
+def wait_visible(driver, by: str, value: str, timeout: float = TIMEOUT) -> WebElement:
+    """The element once it is visible."""
+    return WebDriverWait(driver, timeout).until(EC.visibility_of_element_located((by, value)))
+
+
+def click(driver, by: str, value: str, timeout: float = TIMEOUT) -> WebElement:
+    """Wait until the element is clickable, then click it."""
+    element = WebDriverWait(driver, timeout).until(EC.element_to_be_clickable((by, value)))
+    element.click()
+    return element
+
+
+def type_text(driver, by: str, value: str, text: str, clear: bool = True, timeout: float = TIMEOUT) -> WebElement:
+    """Wait for an input, optionally clear it, and type into it."""
+    element = wait_for(driver, by, value, timeout)
+    if clear:
+        element.clear()
+    element.send_keys(text)
+    return element
+
+
+def screenshot(driver, name: str = "failure") -> str:
+    """Save a screenshot under the screenshot directory and print its path."""
+    path = f"{SCREENSHOT_DIR}/{name}_{int(time.time())}.png"
+    driver.save_screenshot(path)
+    print(f"Screenshot saved: {path}", flush=True)
+    return path
+
+
+def page_source(driver, name: str = "page") -> str:
+    """Save the current page's HTML next to the screenshots and print its path."""
+    path = f"{SCREENSHOT_DIR}/{name}_{int(time.time())}.html"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(driver.page_source)
+    print(f"Page source saved: {path}", flush=True)
+    return path
+
+
+def reproduced(message: str | None = None) -> None:
+    """Report that the bug was confirmed."""
+    if message:
+        print(f"Bug confirmed: {message}", flush=True)
+    print(SUCCESS_MARKER, flush=True)
+
+
+@contextmanager
+def session():
+    """A driver for the script's body: screenshot, save the page source and re-raise on failure, always quit."""
+    driver = None
+    try:
+        driver = new_driver()
+        yield driver
+    except Exception as e:
+        print(f"Error: {e}", flush=True)
+        if driver is not None:
+            for capture in (screenshot, page_source):
+                try:
+                    capture(driver)
+                except Exception:
+                    pass
+        raise
+    finally:
+        if driver is not None:
+            driver.quit()
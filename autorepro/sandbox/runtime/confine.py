@@ -0,0 +1,71 @@
+"""Launcher for the subprocess sandbox backend: applies resource limits and a seccomp filter, then execs the script.
+
+Runs as its own interpreter (optionally inside unshare namespaces) rather than as a preexec_fn,
+so nothing is done between fork and exec in the multi-threaded server. The seccomp filter needs
+the libseccomp Python bindings; without them only the rlimits apply.
+
+Usage:
+    python confine.py --memory-mb 512 --cpu-seconds 60 [--seccomp] -- script.py
+"""
+
+import argparse
+import errno
+import os
+import resource
+import sys
+
+# Syscalls no browser automation script needs; denied with EPERM.
+DENIED_SYSCALLS = (
+    "ptrace", "process_vm_readv", "process_vm_writev", "kexec_load", "kexec_file_load", "reboot",
+    "init_module", "finit_module", "delete_module", "bpf", "perf_event_open", "keyctl", "add_key",
+    "request_key", "swapon", "swapoff", "acct", "mount", "umount2", "pivot_root", "settimeofday",
+    "clock_settime",
+)
+
+MAX_FILE_BYTES  = 64 * 1024 * 1024
+MAX_OPEN_FILES  = 1024
+
+
+def _limit(which: int, value: int) -> None:
+    _, hard = resource.getrlimit(which)
+    if hard != resource.RLIM_INFINITY:
+        value = min(value, hard)
+    resource.setrlimit(which, (value, value))
+
+
+def _seccomp() -> bool:
+    try:
+        import seccomp
+    except ImportError:
+        return False
+    f = seccomp.SyscallFilter(defaction=seccomp.ALLOW)
+    for name in DENIED_SYSCALLS:
+        try:
+            f.add_rule(seccomp.ERRNO(errno.EPERM), name)
+        except (RuntimeError, ValueError):
+            pass  # not a syscall on this architecture
+    f.load()
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--memory-mb", type=int, required=True)
+    parser.add_argument("--cpu-seconds", type=int, required=True)
+    parser.add_argument("--seccomp", action="store_true")
+    parser.add_argument("script")
+    args = parser.parse_args()
+
+    # RLIMIT_DATA rather than RLIMIT_AS: Chromium reserves far more address space than it uses.
+    _limit(resource.RLIMIT_DATA, args.memory_mb * 1024 * 1024)
+    _limit(resource.RLIMIT_CPU, args.cpu_seconds)
+    _limit(resource.RLIMIT_FSIZE, MAX_FILE_BYTES)
+    _limit(resource.RLIMIT_NOFILE, MAX_OPEN_FILES)
+    _limit(resource.RLIMIT_CORE, 0)
+    if args.seccomp and not _seccomp():
+        print("confine: libseccomp bindings not installed, running without a syscall filter", file=sys.stderr)
+    os.execv(sys.executable, [sys.executable, args.script])
+
+
+if __name__ == "__main__":
+    main()
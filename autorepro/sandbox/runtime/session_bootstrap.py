@@ -0,0 +1,111 @@
+"""In-container launcher that runs an attempt script against the job's long-lived browser session.
+
+Baked into the sandbox image at /opt/autorepro/. The first attempt of a job creates a headless
+Chromium session on the chromedriver the pool started; later attempts re-attach to it, wipe
+cookies/storage, and run the script with ``driver`` pre-bound. ``webdriver.Chrome(...)`` returns
+the shared driver and ``driver.quit()`` is a no-op, so ordinary generated scripts work unchanged.
+
+Usage:
+    python session_bootstrap.py /scripts/script.py   # run one attempt
+    python session_bootstrap.py --close              # end the session
+"""
+
+import json
+import runpy
+import sys
+import time
+from pathlib import Path
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+CHROMEDRIVER_URL = "http://127.0.0.1:9515"
+SESSION_FILE     = Path("/tmp/autorepro/session.json")
+
+
+def _options() -> Options:
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.binary_location = "/usr/bin/chromium"
+    return options
+
+
+class _AttachedDriver(webdriver.Remote):
+    """Remote driver bound to an already-running session instead of creating a new one."""
+
+    def __init__(self, session_id: str):
+        self._attach_to = session_id
+        super().__init__(command_executor=CHROMEDRIVER_URL, options=_options())
+
+    def start_session(self, capabilities: dict) -> None:
+        self.session_id = self._attach_to
+        self.caps       = {"browserName": "chrome"}
+
+
+def _new_session() -> webdriver.Remote:
+    deadline = time.time() + 15
+    while True:
+        try:
+            driver = webdriver.Remote(command_executor=CHROMEDRIVER_URL, options=_options())
+            break
+        except Exception:
+            if time.time() > deadline:
+                raise
+            time.sleep(0.2)
+    SESSION_FILE.parent.mkdir(parents=True, exist_ok=True)
+    SESSION_FILE.write_text(json.dumps({"session_id": driver.session_id}))
+    return driver
+
+
+def _attach() -> webdriver.Remote | None:
+    if not SESSION_FILE.exists():
+        return None
+    try:
+        driver = _AttachedDriver(json.loads(SESSION_FILE.read_text())["session_id"])
+        driver.current_url
+        return driver
+    except Exception:
+        return None
+
+
+def _reset(driver: webdriver.Remote) -> None:
+    """Clear cookies and web storage left by the previous attempt and park on about:blank."""
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+    driver.execute("executeCdpCommand", {"cmd": "Network.clearBrowserCookies", "params": {}})
+    driver.execute("executeCdpCommand", {"cmd": "Network.clearBrowserCache", "params": {}})
+    origin = driver.execute_script("return window.location.origin")
+    if origin and origin != "null":
+        driver.execute("executeCdpCommand", {
+            "cmd": "Storage.clearDataForOrigin",
+            "params": {"origin": origin, "storageTypes": "all"},
+        })
+    driver.get("about:blank")
+
+
+def main(argv: list[str]) -> None:
+    if argv[:1] == ["--close"]:
+        driver = _attach()
+        if driver is not None:
+            driver.quit()
+        SESSION_FILE.unlink(missing_ok=True)
+        return
+
+    driver = _attach()
+    if driver is None:
+        driver = _new_session()
+    else:
+        _reset(driver)
+
+    driver.quit      = lambda: None
+    webdriver.Chrome = lambda *args, **kwargs: driver
+    runpy.run_path(argv[0], init_globals={"driver": driver}, run_name="__main__")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,9 +1,58 @@
-"""AST-based static code analysis for security — blocks dangerous constructs before execution."""
+"""AST-based static code analysis for security — blocks dangerous constructs before execution.
+
+The policy is the set of tables below, checked by one visitor in a single pass over the tree:
+imports, names and builtins, attribute chains, file paths and network hosts. Verdicts are
+memoised by script hash, so a refine that returns an unchanged script is not parsed again.
+"""
 
 import ast
+import hashlib
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+from utils import config
+
+# Modules (and their submodules) a script may not import.
+BLOCKED_IMPORTS = {
+    "os", "subprocess", "socket", "shutil", "sys", "pathlib", "importlib", "builtins", "ctypes",
+    "multiprocessing", "pty", "signal", "io", "codecs", "tempfile", "glob", "fileinput", "pickle",
+    "marshal", "runpy", "code", "codeop", "posix", "nt", "_thread",
+}
+
+# Blocked modules whose names are distinctive enough to block as attributes too, e.g. a library's
+# "service.subprocess" or "module.os" re-export.
+BLOCKED_MODULE_ATTRIBUTES = {
+    "os", "subprocess", "socket", "shutil", "sys", "builtins", "importlib", "ctypes", "pty", "posix",
+}
+
+# Builtins that run or look up code dynamically; blocked whether called or merely referenced.
+BLOCKED_BUILTINS = {
+    "eval", "exec", "compile", "__import__", "globals", "locals", "vars", "breakpoint",
+}
+
+# Other names that expose the interpreter's internals.
+BLOCKED_NAMES = {"__builtins__", "__loader__", "__spec__"}
+
+# Attributes that spawn processes or read files even on an allowed module (asyncio, selenium internals).
+BLOCKED_ATTRIBUTES = {
+    "create_subprocess_exec", "create_subprocess_shell", "system", "popen", "spawn", "execv", "execve",
+    "read_text", "read_bytes", "write_text", "write_bytes",
+}
+
+# Dunder attributes a script may use; any other (__globals__, __subclasses__, ...) is blocked.
+ALLOWED_DUNDERS = {"__name__", "__qualname__", "__class__", "__doc__", "__init__", "__enter__", "__exit__"}
+
+# Builtins that take an attribute name, which must then be a literal, non-dunder string.
+ATTRIBUTE_BUILTINS = {"getattr", "setattr", "delattr", "hasattr"}
+
+# Builtins checked at their call sites, so they may not be aliased or passed around.
+CALL_ONLY = ATTRIBUTE_BUILTINS | {"open"}
 
-BLOCKED_IMPORTS = {"os", "subprocess", "socket", "shutil", "sys", "pathlib"}
-BLOCKED_BUILTINS = {"eval", "exec", "compile", "__import__"}
+# open() may only write under this directory.
+WRITABLE_PATH = "/screenshots/"
+
+BLOCKED_SCHEMES = {"file", "ftp", "gopher", "dict", "ldap", "chrome", "view-source"}
 
 
 class SecurityError(Exception):
@@ -11,28 +60,138 @@ class SecurityError(Exception):
     pass
 
 
-def check(script: str) -> None:
-    """Raise SecurityError if the script contains unsafe constructs."""
+def _dunder(name: str) -> bool:
+    return name.startswith("__") and name.endswith("__") and name not in ALLOWED_DUNDERS
+
+
+class _Policy:
+    """Raises SecurityError at the first construct the policy forbids.
+
+    One ast.walk over the tree with a per-node-type dispatch table; walk is breadth-first, so a
+    call is seen before the name it calls.
+    """
+
+    def __init__(self):
+        self._direct = set()  # ids of Name nodes that are the callee of a checked call
+
+    def check(self, tree: ast.AST) -> None:
+        dispatch = _DISPATCH
+        for node in ast.walk(tree):
+            handler = dispatch.get(type(node))
+            if handler is not None:
+                handler(self, node)
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self._module(alias.name)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if node.module:
+            self._module(node.module)
+        for alias in node.names:
+            # "from selenium.webdriver.common.service import subprocess" reaches a blocked module too.
+            self._module(alias.name)
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if node.id in BLOCKED_BUILTINS:
+            raise SecurityError(f"Blocked builtin: {node.id}()")
+        if node.id in BLOCKED_NAMES:
+            raise SecurityError(f"Blocked name: {node.id}")
+        if node.id in CALL_ONLY and id(node) not in self._direct:
+            raise SecurityError(f"{node.id} may only be called directly")
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        if node.attr in BLOCKED_MODULE_ATTRIBUTES:
+            raise SecurityError(f"Blocked module reached through an attribute: .{node.attr}")
+        if node.attr in BLOCKED_ATTRIBUTES or _dunder(node.attr):
+            raise SecurityError(f"Blocked attribute: .{node.attr}")
+
+    def visit_Call(self, node: ast.Call) -> None:
+        func = node.func
+        if not isinstance(func, ast.Name) or func.id not in CALL_ONLY:
+            return
+        self._direct.add(id(func))
+        if func.id == "open":
+            self._open(node)
+        elif len(node.args) >= 2:
+            name = node.args[1]
+            if not (isinstance(name, ast.Constant) and isinstance(name.value, str)):
+                raise SecurityError(f"{func.id}() with a computed attribute name is blocked")
+            if name.value in BLOCKED_MODULE_ATTRIBUTES or name.value in BLOCKED_ATTRIBUTES or _dunder(name.value):
+                raise SecurityError(f"Blocked attribute: {func.id}(..., {name.value!r})")
+
+    def visit_Constant(self, node: ast.Constant) -> None:
+        if isinstance(node.value, str) and "://" in node.value:
+            self._urls(node.value)
+
+    def _module(self, name: str) -> None:
+        root = name.split(".")[0]
+        if root in BLOCKED_IMPORTS:
+            raise SecurityError(f"Blocked import: {root}")
+
+    def _open(self, node: ast.Call) -> None:
+        path = node.args[0] if node.args else next((k.value for k in node.keywords if k.arg == "file"), None)
+        if isinstance(path, ast.JoinedStr) and path.values:
+            path = path.values[0]  # an f-string must start with its literal directory
+        if not (isinstance(path, ast.Constant) and isinstance(path.value, str)):
+            raise SecurityError("open() with a computed path is blocked")
+        if not path.value.startswith(WRITABLE_PATH) or ".." in path.value:
+            raise SecurityError(f"open() outside {WRITABLE_PATH} is blocked")
+
+    def _urls(self, text: str) -> None:
+        for word in text.split():
+            if "://" not in word:
+                continue
+            try:
+                url = urlsplit(word.strip("\"'()<>,;"))
+                host = url.hostname
+            except ValueError:
+                continue
+            if url.scheme.lower() in BLOCKED_SCHEMES:
+                raise SecurityError(f"Blocked URL scheme: {url.scheme}://")
+            if host and host.lower() in config.SECURITY_BLOCKED_HOSTS:
+                raise SecurityError(f"Blocked network host: {host}")
+
+
+_DISPATCH = {
+    ast.Import:     _Policy.visit_Import,
+    ast.ImportFrom: _Policy.visit_ImportFrom,
+    ast.Name:       _Policy.visit_Name,
+    ast.Attribute:  _Policy.visit_Attribute,
+    ast.Call:       _Policy.visit_Call,
+    ast.Constant:   _Policy.visit_Constant,
+}
+
+
+_verdicts: OrderedDict[str, str | None] = OrderedDict()  # script hash -> violation, None if allowed
+_lock                                  = threading.Lock()
+
+
+def _scan(script: str) -> str | None:
     try:
         tree = ast.parse(script)
-    except SyntaxError as e:
-        raise SecurityError(f"Syntax error: {e}") from e
-
-    for node in ast.walk(tree):
-        if isinstance(node, (ast.Import, ast.ImportFrom)):
-            names = [a.name.split(".")[0] for a in node.names]
-            if isinstance(node, ast.ImportFrom) and node.module:
-                names.append(node.module.split(".")[0])
-            for name in names:
-                if name in BLOCKED_IMPORTS:
-                    raise SecurityError(f"Blocked import: {name}")
-
-        if isinstance(node, ast.Call):
-            if isinstance(node.func, ast.Name) and node.func.id in BLOCKED_BUILTINS:
-                raise SecurityError(f"Blocked builtin: {node.func.id}()")
-
-        if isinstance(node, ast.Call):
-            if isinstance(node.func, ast.Name) and node.func.id == "open":
-                if node.args and isinstance(node.args[0], ast.Constant):
-                    if "/screenshots/" not in str(node.args[0].value):
-                        raise SecurityError("open() outside /screenshots/ is blocked")
+    except (SyntaxError, ValueError, RecursionError) as e:
+        return f"Syntax error: {e}"
+    try:
+        _Policy().check(tree)
+    except SecurityError as e:
+        return str(e)
+    return None
+
+
+def check(script: str) -> None:
+    """Raise SecurityError if the script contains unsafe constructs."""
+    key = hashlib.sha256(script.encode("utf-8")).hexdigest()
+    with _lock:
+        found = key in _verdicts
+        if found:
+            _verdicts.move_to_end(key)
+            violation = _verdicts[key]
+    if not found:
+        violation = _scan(script)
+        with _lock:
+            _verdicts[key] = violation
+            while len(_verdicts) > config.SECURITY_CACHE_SIZE:
+                _verdicts.popitem(last=False)
+    if violation is not None:
+        raise SecurityError(violation)
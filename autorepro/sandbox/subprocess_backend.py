@@ -0,0 +1,86 @@
+"""Subprocess sandbox backend — scripts run as local child processes, with no image or container startup.
+
+Each script runs under runtime/confine.py (rlimits and, when the libseccomp bindings are
+installed, a syscall deny-list), optionally inside unshare(1) user/pid/ipc/uts namespaces. This
+is much weaker isolation than Docker: use it only on hosts whose scripts and targets are trusted.
+The host needs Chromium and chromedriver at the paths generated scripts use. The runtime
+directory is put on PYTHONPATH, so scripts can import autorepro_helpers as in the image.
+"""
+
+import os
+import signal
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+from sandbox.backend import SCRIPT_ENV, SandboxBackend, TimeoutError, phase
+from sandbox.log_stream import LogCollector, follow_process
+from utils import config
+
+CONFINE = Path(__file__).parent / "runtime" / "confine.py"
+
+# The network namespace is shared: scripts have to reach the target.
+UNSHARE = ["unshare", "--user", "--map-root-user", "--pid", "--fork", "--kill-child", "--mount-proc", "--ipc", "--uts"]
+
+
+class SubprocessBackend(SandboxBackend):
+    """Runs scripts as confined local processes in a throwaway working directory."""
+
+    def __init__(self):
+        if config.SUBPROCESS_UNSHARE and shutil.which("unshare") is None:
+            raise RuntimeError("SUBPROCESS_UNSHARE is set but unshare(1) is not installed")
+
+    def execute(self, script_path: Path, script_content: str, artifacts_dir: Path,
+                collector: LogCollector, session: str | None) -> tuple[str, str, int]:
+        job_id = collector.job_id
+        with tempfile.TemporaryDirectory(prefix="autorepro-run-") as workdir:
+            script = Path(workdir) / "script.py"
+            script.write_text(_localise(script_content, artifacts_dir))
+            command = [
+                config.SUBPROCESS_PYTHON, str(CONFINE),
+                "--memory-mb", str(config.SANDBOX_MEMORY_MB),
+                "--cpu-seconds", str(config.SANDBOX_TIMEOUT_SECONDS),
+                *(["--seccomp"] if config.SUBPROCESS_SECCOMP else []),
+                str(script),
+            ]
+            if config.SUBPROCESS_UNSHARE:
+                command = UNSHARE + command
+
+            with phase(job_id, "start"):
+                proc = subprocess.Popen(
+                    command,
+                    cwd=workdir,
+                    env={**SCRIPT_ENV, "PATH": os.environ.get("PATH", ""), "HOME": workdir, "LANG": "C.UTF-8",
+                         "PYTHONPATH": str(CONFINE.parent), "AUTOREPRO_SCREENSHOTS": str(artifacts_dir.resolve())},
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    start_new_session=True,
+                )
+            try:
+                with phase(job_id, "wait"):
+                    follow_process(proc, collector)
+                    if not collector.wait(config.SANDBOX_TIMEOUT_SECONDS):
+                        raise TimeoutError(f"Script exceeded {config.SANDBOX_TIMEOUT_SECONDS}s timeout")
+                    settled = collector.settle(config.EARLY_EXIT_GRACE_SECONDS)
+                exit_code = proc.wait() if settled else collector.implied_exit_code
+            finally:
+                # The script's session includes any browser it left behind.
+                _kill_group(proc)
+        return collector.text("stdout"), collector.text("stderr"), exit_code
+
+
+def _localise(script_content: str, artifacts_dir: Path) -> str:
+    """Point the container paths and hostnames generated scripts use at their local equivalents."""
+    return (script_content
+            .replace("/screenshots/", f"{artifacts_dir.resolve()}/")
+            .replace("host.docker.internal", "localhost"))
+
+
+def _kill_group(proc: subprocess.Popen) -> None:
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+    proc.wait()
@@ -0,0 +1,96 @@
+"""Persistent job queue — module-level facade over the configured JobQueue backend (QUEUE_BACKEND=sqlite|redis)."""
+
+import threading
+from pathlib import Path
+
+from scheduler.queue_backend import PRIORITIES, JobQueue  # noqa: F401  (PRIORITIES re-exported)
+from utils import config
+
+_queue: JobQueue | None = None
+_lock                   = threading.Lock()
+
+
+def get_queue() -> JobQueue:
+    """Return the process-wide job queue, creating it on first use."""
+    global _queue
+    with _lock:
+        if _queue is None:
+            if config.QUEUE_BACKEND == "redis":
+                from scheduler.redis_queue import RedisJobQueue
+                _queue = RedisJobQueue(config.REDIS_URL, config.REDIS_QUEUE_PREFIX)
+            else:
+                from scheduler.sqlite_queue import SqliteJobQueue
+                _queue = SqliteJobQueue(Path(config.DATA_DIR) / "queue.sqlite")
+        return _queue
+
+
+def enqueue(job_id: str, payload: dict, tenant: str = "default", priority: str = "normal",
+            batch_id: str | None = None, batch_limit: int | None = None) -> None:
+    """Add a job to the queue. Jobs of one batch never run more than batch_limit at a time."""
+    get_queue().enqueue(job_id, payload, tenant, priority, batch_id=batch_id, batch_limit=batch_limit)
+
+
+def enqueue_batch(jobs: list[tuple[str, dict, str, str]], batch_id: str, batch_limit: int,
+                  held: bool = False) -> None:
+    """Add (job_id, payload, tenant, priority) jobs of one batch atomically, held until release() if held."""
+    get_queue().enqueue_batch(jobs, batch_id, batch_limit, held)
+
+
+def release(batch_id: str | None = None) -> int:
+    """Make the held jobs of a batch (of every batch if None) claimable. Returns how many."""
+    return get_queue().release(batch_id)
+
+
+def claim(worker: str) -> dict | None:
+    """Atomically move the next fair-share job to 'running' and return it, or None if empty."""
+    return get_queue().claim(worker)
+
+
+def finish(job_id: str, worker: str, state: str = "done") -> bool:
+    """Mark a job worker is running as finished; False if it was requeued away from that worker."""
+    return get_queue().finish(job_id, worker, state)
+
+
+def cancel_queued(job_id: str) -> bool:
+    """Cancel a job that has not started yet. Returns True if it was still queued or held."""
+    return get_queue().cancel_queued(job_id)
+
+
+def request_cancel(job_id: str) -> bool:
+    """Ask the worker running a job to stop it after its current node; returns True if it is running."""
+    return get_queue().request_cancel(job_id)
+
+
+def get(job_id: str) -> dict | None:
+    """Return a queue entry by job ID."""
+    return get_queue().get(job_id)
+
+
+def depth(batch: bool | None = None) -> int:
+    """Number of jobs waiting (queued or held); batch=True/False counts only batch/interactive jobs."""
+    return get_queue().depth(batch)
+
+
+def counts() -> dict:
+    """Number of entries per state."""
+    return get_queue().counts()
+
+
+def requeue_running() -> int:
+    """Return jobs left 'running' by a previous process to the queue. Returns how many."""
+    return get_queue().requeue_running()
+
+
+def heartbeat(worker: str, info: dict) -> list[str]:
+    """Mark a worker and its running jobs alive; returns its jobs that have a cancellation request."""
+    return get_queue().heartbeat(worker, info)
+
+
+def requeue_stale() -> int:
+    """Requeue the running jobs of workers silent for WORKER_HEARTBEAT_TIMEOUT_SECONDS. Returns how many."""
+    return get_queue().requeue_stale(config.WORKER_HEARTBEAT_TIMEOUT_SECONDS)
+
+
+def workers() -> list[dict]:
+    """Workers that heartbeated within WORKER_HEARTBEAT_TIMEOUT_SECONDS."""
+    return get_queue().workers(config.WORKER_HEARTBEAT_TIMEOUT_SECONDS)
@@ -0,0 +1,76 @@
+"""JobQueue interface — the contract every job queue backend implements.
+
+Entries move queued -> running -> done/cancelled; batch entries may start out held until released.
+Whoever runs jobs heartbeats while it does; the running entries of a runner silent for longer than
+the heartbeat timeout are returned to the queue.
+"""
+
+from abc import ABC, abstractmethod
+
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+
+
+class JobQueue(ABC):
+    """Base class for job queue backends."""
+
+    @abstractmethod
+    def enqueue(self, job_id: str, payload: dict, tenant: str = "default", priority: str = "normal",
+                batch_id: str | None = None, batch_limit: int | None = None) -> None:
+        """Add a job to the queue. Jobs of one batch never run more than batch_limit at a time."""
+
+    @abstractmethod
+    def enqueue_batch(self, jobs: list[tuple[str, dict, str, str]], batch_id: str, batch_limit: int,
+                      held: bool = False) -> None:
+        """Add (job_id, payload, tenant, priority) jobs of one batch all at once, or none of them.
+        Held jobs are not claimed until release()."""
+
+    @abstractmethod
+    def release(self, batch_id: str | None = None) -> int:
+        """Make the held jobs of a batch (of every batch if None) claimable. Returns how many."""
+
+    @abstractmethod
+    def claim(self, worker: str) -> dict | None:
+        """Atomically move the next fair-share job to 'running' and return it, or None if empty."""
+
+    @abstractmethod
+    def finish(self, job_id: str, worker: str, state: str = "done") -> bool:
+        """Mark a job worker is running as finished ('done' or 'cancelled'). Returns False, changing
+        nothing, if the job is no longer that worker's (requeued after missed heartbeats)."""
+
+    @abstractmethod
+    def cancel_queued(self, job_id: str) -> bool:
+        """Cancel a job that has not started yet. Returns True if it was still queued or held."""
+
+    @abstractmethod
+    def request_cancel(self, job_id: str) -> bool:
+        """Ask whoever runs a job to stop it; returns True if it is running."""
+
+    @abstractmethod
+    def get(self, job_id: str) -> dict | None:
+        """Return a queue entry by job ID."""
+
+    @abstractmethod
+    def depth(self, batch: bool | None = None) -> int:
+        """Number of jobs waiting (queued or held); batch=True/False counts only batch/interactive jobs."""
+
+    @abstractmethod
+    def counts(self) -> dict:
+        """Number of entries per state."""
+
+    @abstractmethod
+    def requeue_running(self) -> int:
+        """Return every running job to the queue. Returns how many."""
+
+    @abstractmethod
+    def heartbeat(self, worker: str, info: dict) -> list[str]:
+        """Record that a worker (with the given host/capacity/busy info) is alive, and so are the jobs
+        it runs. Returns those of its jobs that have a cancellation request."""
+
+    @abstractmethod
+    def requeue_stale(self, timeout: float) -> int:
+        """Return running jobs whose worker has not heartbeated for timeout seconds to the queue, and
+        forget such workers. Returns how many jobs."""
+
+    @abstractmethod
+    def workers(self, timeout: float) -> list[dict]:
+        """Workers that heartbeated within timeout seconds, with the info they last reported."""
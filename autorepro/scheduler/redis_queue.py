@@ -0,0 +1,252 @@
+"""Redis job queue backend (QUEUE_BACKEND=redis) — keeps the queue off the shared DATA_DIR volume,
+where SQLite's file locking is slow or unreliable (network filesystems). The job store, checkpoints
+and artifacts stay in DATA_DIR, which every node still needs to share. Needs the optional redis
+package (requirements-redis.txt).
+
+Works against Redis or any server speaking its protocol with Lua scripting (Valkey, KeyDB, ...).
+Keys, all under REDIS_QUEUE_PREFIX:
+    job:<id>         hash: the entry's fields, as in the SQLite backend's queue table
+    queued           sorted set of waiting job ids, scored priority * 1e10 + enqueued_at
+    held             sorted set of held batch job ids, scored the same, until released
+    depth            hash: waiting (queued or held) "batch" and "interactive" jobs
+    running          set of running job ids
+    running:tenant   hash: running jobs per tenant (fair-share claiming)
+    running:batch    hash: running jobs per batch (batch_limit)
+    worker:<name>    set of the job ids a worker runs
+    workers          hash: worker name -> JSON of its last heartbeat
+Claiming and releasing are Lua scripts, so they are atomic. Finished entries expire after FINISHED_TTL_SECONDS.
+"""
+
+import json
+import time
+
+try:
+    import redis
+except ImportError as e:
+    raise ImportError("QUEUE_BACKEND=redis needs the redis package: pip install -r requirements-redis.txt") from e
+
+from scheduler.queue_backend import PRIORITIES, JobQueue
+
+FINISHED_TTL_SECONDS = 7 * 86400
+
+# Claim candidates considered per call, in (priority, enqueued_at) order.
+CLAIM_SCAN = 256
+
+_FIELDS = ("job_id", "tenant", "priority", "state", "payload", "enqueued_at", "started_at", "finished_at",
+           "worker", "batch_id", "batch_limit", "heartbeat_at", "cancel_requested")
+
+# KEYS: queued, running, running:tenant, running:batch, depth, worker:<name>
+# ARGV: job key prefix, worker, now, scan
+# Picks like the SQLite backend: priority, then the tenant with the fewest running jobs, then FIFO,
+# skipping jobs whose batch is at its limit. Ids whose entry no longer exists are dropped.
+_CLAIM = """
+local best, best_key
+local entries = redis.call('ZRANGE', KEYS[1], 0, tonumber(ARGV[4]) - 1, 'WITHSCORES')
+for i = 1, #entries, 2 do
+  local id, score = entries[i], tonumber(entries[i + 1])
+  local job = redis.call('HMGET', ARGV[1] .. id, 'tenant', 'batch_id', 'batch_limit')
+  if not job[1] then
+    redis.call('ZREM', KEYS[1], id)
+  elseif not job[2] or tonumber(redis.call('HGET', KEYS[4], job[2]) or '0') < tonumber(job[3]) then
+    local key = {math.floor(score / 1e10), tonumber(redis.call('HGET', KEYS[3], job[1]) or '0'), score}
+    if not best or key[1] < best_key[1]
+       or (key[1] == best_key[1] and (key[2] < best_key[2] or (key[2] == best_key[2] and key[3] < best_key[3]))) then
+      best, best_key = id, key
+    end
+  end
+end
+if not best then return false end
+local job = ARGV[1] .. best
+local tenant, batch = unpack(redis.call('HMGET', job, 'tenant', 'batch_id'))
+redis.call('ZREM', KEYS[1], best)
+redis.call('HSET', job, 'state', 'running', 'started_at', ARGV[3], 'heartbeat_at', ARGV[3], 'worker', ARGV[2])
+redis.call('SADD', KEYS[2], best)
+redis.call('SADD', KEYS[6], best)
+redis.call('HINCRBY', KEYS[3], tenant, 1)
+if batch then
+  redis.call('HINCRBY', KEYS[4], batch, 1)
+  redis.call('HINCRBY', KEYS[5], 'batch', -1)
+else
+  redis.call('HINCRBY', KEYS[5], 'interactive', -1)
+end
+return best
+"""
+
+# KEYS: job:<id>, running, running:tenant, running:batch, queued, depth
+# ARGV: id, new state ('queued' to requeue), now, worker key prefix, finished ttl, owner ('' for any)
+# Only a running job is released, and with an owner only while that worker still runs it.
+_RELEASE = """
+local tenant, batch, worker, priority, enqueued =
+  unpack(redis.call('HMGET', KEYS[1], 'tenant', 'batch_id', 'worker', 'priority', 'enqueued_at'))
+if ARGV[6] ~= '' and worker ~= ARGV[6] then return 0 end
+if redis.call('SREM', KEYS[2], ARGV[1]) == 0 then return 0 end
+redis.call('HINCRBY', KEYS[3], tenant, -1)
+if batch then redis.call('HINCRBY', KEYS[4], batch, -1) end
+if worker then redis.call('SREM', ARGV[4] .. worker, ARGV[1]) end
+if ARGV[2] == 'queued' then
+  redis.call('HDEL', KEYS[1], 'started_at', 'heartbeat_at', 'worker')
+  redis.call('HSET', KEYS[1], 'state', 'queued')
+  redis.call('ZADD', KEYS[5], tonumber(priority) * 1e10 + tonumber(enqueued), ARGV[1])
+  redis.call('HINCRBY', KEYS[6], batch and 'batch' or 'interactive', 1)
+else
+  redis.call('HSET', KEYS[1], 'state', ARGV[2], 'finished_at', ARGV[3])
+  redis.call('EXPIRE', KEYS[1], ARGV[5])
+end
+return 1
+"""
+
+# KEYS: held, queued    ARGV: job key prefix, batch id ('' for every batch)
+_RELEASE_HELD = """
+local entries, released = redis.call('ZRANGE', KEYS[1], 0, -1, 'WITHSCORES'), 0
+for i = 1, #entries, 2 do
+  local id = entries[i]
+  if ARGV[2] == '' or redis.call('HGET', ARGV[1] .. id, 'batch_id') == ARGV[2] then
+    redis.call('ZREM', KEYS[1], id)
+    redis.call('ZADD', KEYS[2], entries[i + 1], id)
+    redis.call('HSET', ARGV[1] .. id, 'state', 'queued')
+    released = released + 1
+  end
+end
+return released
+"""
+
+# KEYS: job:<id>, queued, depth, held    ARGV: id, now, finished ttl
+_CANCEL_QUEUED = """
+if redis.call('ZREM', KEYS[2], ARGV[1]) == 0 and redis.call('ZREM', KEYS[4], ARGV[1]) == 0 then return 0 end
+redis.call('HINCRBY', KEYS[3], redis.call('HGET', KEYS[1], 'batch_id') and 'batch' or 'interactive', -1)
+redis.call('HSET', KEYS[1], 'state', 'cancelled', 'finished_at', ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+
+def _entry(fields: dict) -> dict | None:
+    if not fields:
+        return None
+    item = {name: fields.get(name) for name in _FIELDS}
+    item["payload"] = json.loads(item["payload"])
+    for name in ("priority", "batch_limit"):
+        item[name] = int(item[name]) if item[name] is not None else None
+    for name in ("enqueued_at", "started_at", "finished_at", "heartbeat_at"):
+        item[name] = float(item[name]) if item[name] is not None else None
+    item["cancel_requested"] = int(item["cancel_requested"] or 0)
+    return item
+
+
+class RedisJobQueue(JobQueue):
+    """Job queue in Redis, shared by every API and worker process pointed at the same server."""
+
+    def __init__(self, url: str, prefix: str):
+        self.r       = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix  = prefix
+        self._claim  = self.r.register_script(_CLAIM)
+        self._free   = self.r.register_script(_RELEASE)
+        self._cancel = self.r.register_script(_CANCEL_QUEUED)
+        self._unhold = self.r.register_script(_RELEASE_HELD)
+
+    def _key(self, *parts: str) -> str:
+        return ":".join((self.prefix, *parts))
+
+    def _release(self, job_id: str, state: str, owner: str = "") -> bool:
+        keys = [self._key("job", job_id), self._key("running"), self._key("running", "tenant"),
+                self._key("running", "batch"), self._key("queued"), self._key("depth")]
+        return bool(self._free(keys=keys, args=[job_id, state, time.time(), self._key("worker", ""),
+                                                FINISHED_TTL_SECONDS, owner]))
+
+    def enqueue(self, job_id: str, payload: dict, tenant: str = "default", priority: str = "normal",
+                batch_id: str | None = None, batch_limit: int | None = None) -> None:
+        now    = time.time()
+        fields = {"job_id": job_id, "tenant": tenant, "priority": PRIORITIES[priority], "state": "queued",
+                  "payload": json.dumps(payload), "enqueued_at": now}
+        if batch_id is not None:
+            fields.update(batch_id=batch_id, batch_limit=batch_limit)
+        with self.r.pipeline() as p:
+            p.hset(self._key("job", job_id), mapping=fields)
+            p.zadd(self._key("queued"), {job_id: PRIORITIES[priority] * 1e10 + now})
+            p.hincrby(self._key("depth"), "batch" if batch_id is not None else "interactive", 1)
+            p.execute()
+
+    def enqueue_batch(self, jobs: list[tuple[str, dict, str, str]], batch_id: str, batch_limit: int,
+                      held: bool = False) -> None:
+        now   = time.time()
+        state = "held" if held else "queued"
+        with self.r.pipeline() as p:
+            for job_id, payload, tenant, priority in jobs:
+                p.hset(self._key("job", job_id), mapping={
+                    "job_id": job_id, "tenant": tenant, "priority": PRIORITIES[priority], "state": state,
+                    "payload": json.dumps(payload), "enqueued_at": now,
+                    "batch_id": batch_id, "batch_limit": batch_limit,
+                })
+                p.zadd(self._key(state), {job_id: PRIORITIES[priority] * 1e10 + now})
+            p.hincrby(self._key("depth"), "batch", len(jobs))
+            p.execute()
+
+    def release(self, batch_id: str | None = None) -> int:
+        return self._unhold(keys=[self._key("held"), self._key("queued")], args=[self._key("job", ""), batch_id or ""])
+
+    def claim(self, worker: str) -> dict | None:
+        keys = [self._key("queued"), self._key("running"), self._key("running", "tenant"),
+                self._key("running", "batch"), self._key("depth"), self._key("worker", worker)]
+        job_id = self._claim(keys=keys, args=[self._key("job", ""), worker, time.time(), CLAIM_SCAN])
+        return self.get(job_id) if job_id else None
+
+    def finish(self, job_id: str, worker: str, state: str = "done") -> bool:
+        return self._release(job_id, state, worker)
+
+    def cancel_queued(self, job_id: str) -> bool:
+        keys = [self._key("job", job_id), self._key("queued"), self._key("depth"), self._key("held")]
+        return bool(self._cancel(keys=keys, args=[job_id, time.time(), FINISHED_TTL_SECONDS]))
+
+    def request_cancel(self, job_id: str) -> bool:
+        if not self.r.sismember(self._key("running"), job_id):
+            return False
+        self.r.hset(self._key("job", job_id), "cancel_requested", 1)
+        return True
+
+    def get(self, job_id: str) -> dict | None:
+        return _entry(self.r.hgetall(self._key("job", job_id)))
+
+    def depth(self, batch: bool | None = None) -> int:
+        if batch is None:
+            return self.r.zcard(self._key("queued")) + self.r.zcard(self._key("held"))
+        return int(self.r.hget(self._key("depth"), "batch" if batch else "interactive") or 0)
+
+    def counts(self) -> dict:
+        """Held, queued and running entries; finished ones expire and are not counted."""
+        with self.r.pipeline(transaction=False) as p:
+            p.zcard(self._key("held"))
+            p.zcard(self._key("queued"))
+            p.scard(self._key("running"))
+            held, queued, running = p.execute()
+        return {"held": held, "queued": queued, "running": running}
+
+    def requeue_running(self) -> int:
+        return sum(self._release(job_id, "queued") for job_id in self.r.smembers(self._key("running")))
+
+    def heartbeat(self, worker: str, info: dict) -> list[str]:
+        now     = time.time()
+        job_ids = sorted(self.r.smembers(self._key("worker", worker)))
+        with self.r.pipeline(transaction=False) as p:
+            p.hset(self._key("workers"), worker, json.dumps({**info, "heartbeat_at": now}))
+            for job_id in job_ids:
+                p.hset(self._key("job", job_id), "heartbeat_at", now)
+                p.hget(self._key("job", job_id), "cancel_requested")
+            replies = p.execute()[1:]
+        return [job_id for job_id, flag in zip(job_ids, replies[1::2]) if flag == "1"]
+
+    def requeue_stale(self, timeout: float) -> int:
+        cutoff = time.time() - timeout
+        for name, info in self.r.hgetall(self._key("workers")).items():
+            if json.loads(info)["heartbeat_at"] < cutoff:
+                self.r.hdel(self._key("workers"), name)
+        requeued = 0
+        for job_id in self.r.smembers(self._key("running")):
+            beat, started = self.r.hmget(self._key("job", job_id), "heartbeat_at", "started_at")
+            if float(beat or started or 0) < cutoff:
+                requeued += self._release(job_id, "queued")
+        return requeued
+
+    def workers(self, timeout: float) -> list[dict]:
+        cutoff = time.time() - timeout
+        found  = [{"name": name, **json.loads(info)} for name, info in self.r.hgetall(self._key("workers")).items()]
+        return sorted((w for w in found if w["heartbeat_at"] >= cutoff), key=lambda w: w["name"])
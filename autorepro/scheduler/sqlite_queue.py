@@ -0,0 +1,218 @@
+"""SQLite job queue backend — DATA_DIR/queue.sqlite with priority and per-tenant fair claiming.
+
+Every process that opens the same file (the API and any workers mounting a shared DATA_DIR) shares
+the queue; SQLite's file locking serialises claims.
+"""
+
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from scheduler.queue_backend import PRIORITIES, JobQueue
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS queue (
+    job_id       TEXT PRIMARY KEY,
+    tenant       TEXT NOT NULL,
+    priority     INTEGER NOT NULL,
+    state        TEXT NOT NULL,
+    payload      TEXT NOT NULL,
+    enqueued_at  REAL NOT NULL,
+    started_at   REAL,
+    finished_at  REAL,
+    worker       TEXT
+);
+CREATE INDEX IF NOT EXISTS queue_claim ON queue (state, priority, enqueued_at);
+
+CREATE TABLE IF NOT EXISTS workers (
+    name          TEXT PRIMARY KEY,
+    info          TEXT NOT NULL,
+    heartbeat_at  REAL NOT NULL
+);
+"""
+
+# Added after the first release; existing queue databases get them via ALTER TABLE.
+_ADDED_COLUMNS = {
+    "batch_id": "TEXT", "batch_limit": "INTEGER",
+    "heartbeat_at": "REAL", "cancel_requested": "INTEGER NOT NULL DEFAULT 0",
+}
+
+# Highest priority first; within a priority, the tenant with the fewest running jobs, then FIFO.
+# Jobs of a batch already running batch_limit jobs are skipped.
+_NEXT = """
+SELECT q.job_id FROM queue q
+LEFT JOIN (SELECT tenant, COUNT(*) AS n FROM queue WHERE state = 'running' GROUP BY tenant) r
+       ON r.tenant = q.tenant
+WHERE q.state = 'queued'
+  AND (q.batch_id IS NULL
+       OR (SELECT COUNT(*) FROM queue b WHERE b.batch_id = q.batch_id AND b.state = 'running') < q.batch_limit)
+ORDER BY q.priority, COALESCE(r.n, 0), q.enqueued_at
+LIMIT 1
+"""
+
+_REQUEUE = "state = 'queued', started_at = NULL, worker = NULL, heartbeat_at = NULL"
+
+
+def _row(row: sqlite3.Row | None) -> dict | None:
+    if row is None:
+        return None
+    item = dict(row)
+    item["payload"] = json.loads(item["payload"])
+    return item
+
+
+class SqliteJobQueue(JobQueue):
+    """Job queue in one SQLite file; each call opens a short-lived connection."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._db() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")  # persists in the file
+            conn.executescript(_SCHEMA)
+            self._migrate(conn)
+
+    @contextmanager
+    def _db(self):
+        """Yield an autocommit connection, closing it afterwards; the schema was set up by __init__."""
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection) -> None:
+        columns = {r["name"] for r in conn.execute("PRAGMA table_info(queue)")}
+        for name, kind in _ADDED_COLUMNS.items():
+            if name not in columns:
+                conn.execute(f"ALTER TABLE queue ADD COLUMN {name} {kind}")
+        conn.execute("CREATE INDEX IF NOT EXISTS queue_batch ON queue (batch_id, state)")
+        conn.execute("CREATE INDEX IF NOT EXISTS queue_worker ON queue (worker, state)")
+
+    def enqueue(self, job_id: str, payload: dict, tenant: str = "default", priority: str = "normal",
+                batch_id: str | None = None, batch_limit: int | None = None) -> None:
+        with self._db() as conn:
+            conn.execute(
+                "INSERT INTO queue (job_id, tenant, priority, state, payload, enqueued_at, batch_id, batch_limit) "
+                "VALUES (?, ?, ?, 'queued', ?, ?, ?, ?)",
+                (job_id, tenant, PRIORITIES[priority], json.dumps(payload), time.time(), batch_id, batch_limit),
+            )
+
+    def enqueue_batch(self, jobs: list[tuple[str, dict, str, str]], batch_id: str, batch_limit: int,
+                      held: bool = False) -> None:
+        now   = time.time()
+        state = "held" if held else "queued"
+        with self._db() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT INTO queue (job_id, tenant, priority, state, payload, enqueued_at, batch_id, batch_limit) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(job_id, tenant, PRIORITIES[priority], state, json.dumps(payload), now, batch_id, batch_limit)
+                     for job_id, payload, tenant, priority in jobs],
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def release(self, batch_id: str | None = None) -> int:
+        clause = "" if batch_id is None else " AND batch_id = ?"
+        with self._db() as conn:
+            return conn.execute(f"UPDATE queue SET state = 'queued' WHERE state = 'held'{clause}",
+                                () if batch_id is None else (batch_id,)).rowcount
+
+    def claim(self, worker: str) -> dict | None:
+        with self._db() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(_NEXT).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                now = time.time()
+                conn.execute(
+                    "UPDATE queue SET state = 'running', started_at = ?, heartbeat_at = ?, worker = ? WHERE job_id = ?",
+                    (now, now, worker, row["job_id"]),
+                )
+                item = _row(conn.execute("SELECT * FROM queue WHERE job_id = ?", (row["job_id"],)).fetchone())
+                conn.execute("COMMIT")
+                return item
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def finish(self, job_id: str, worker: str, state: str = "done") -> bool:
+        with self._db() as conn:
+            cur = conn.execute(
+                "UPDATE queue SET state = ?, finished_at = ? WHERE job_id = ? AND worker = ? AND state = 'running'",
+                (state, time.time(), job_id, worker),
+            )
+            return cur.rowcount == 1
+
+    def cancel_queued(self, job_id: str) -> bool:
+        with self._db() as conn:
+            cur = conn.execute(
+                "UPDATE queue SET state = 'cancelled', finished_at = ? "
+                "WHERE job_id = ? AND state IN ('queued', 'held')",
+                (time.time(), job_id),
+            )
+            return cur.rowcount == 1
+
+    def request_cancel(self, job_id: str) -> bool:
+        with self._db() as conn:
+            cur = conn.execute(
+                "UPDATE queue SET cancel_requested = 1 WHERE job_id = ? AND state = 'running'", (job_id,),
+            )
+            return cur.rowcount == 1
+
+    def get(self, job_id: str) -> dict | None:
+        with self._db() as conn:
+            return _row(conn.execute("SELECT * FROM queue WHERE job_id = ?", (job_id,)).fetchone())
+
+    def depth(self, batch: bool | None = None) -> int:
+        clause = "" if batch is None else f" AND batch_id IS {'NOT ' if batch else ''}NULL"
+        with self._db() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM queue WHERE state IN ('queued', 'held'){clause}").fetchone()[0]
+
+    def counts(self) -> dict:
+        with self._db() as conn:
+            return {r["state"]: r["n"] for r in conn.execute("SELECT state, COUNT(*) AS n FROM queue GROUP BY state")}
+
+    def requeue_running(self) -> int:
+        with self._db() as conn:
+            return conn.execute(f"UPDATE queue SET {_REQUEUE} WHERE state = 'running'").rowcount
+
+    def heartbeat(self, worker: str, info: dict) -> list[str]:
+        now = time.time()
+        with self._db() as conn:
+            conn.execute(
+                "INSERT INTO workers (name, info, heartbeat_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET info = excluded.info, heartbeat_at = excluded.heartbeat_at",
+                (worker, json.dumps(info), now),
+            )
+            conn.execute("UPDATE queue SET heartbeat_at = ? WHERE worker = ? AND state = 'running'", (now, worker))
+            return [r["job_id"] for r in conn.execute(
+                "SELECT job_id FROM queue WHERE worker = ? AND state = 'running' AND cancel_requested = 1", (worker,),
+            )]
+
+    def requeue_stale(self, timeout: float) -> int:
+        cutoff = time.time() - timeout
+        with self._db() as conn:
+            conn.execute("DELETE FROM workers WHERE heartbeat_at < ?", (cutoff,))
+            return conn.execute(
+                f"UPDATE queue SET {_REQUEUE} WHERE state = 'running' AND COALESCE(heartbeat_at, started_at) < ?",
+                (cutoff,),
+            ).rowcount
+
+    def workers(self, timeout: float) -> list[dict]:
+        cutoff = time.time() - timeout
+        with self._db() as conn:
+            rows = conn.execute(
+                "SELECT name, info, heartbeat_at FROM workers WHERE heartbeat_at >= ? ORDER BY name", (cutoff,),
+            ).fetchall()
+        return [{"name": r["name"], **json.loads(r["info"]), "heartbeat_at": r["heartbeat_at"]} for r in rows]
@@ -0,0 +1,320 @@
+"""Bounded worker pool that drains the persistent job queue into run_agent."""
+
+import asyncio
+import math
+import os
+import socket
+import threading
+import time
+import uuid
+
+from agent.orchestrator import run_agent, run_agent_async
+from scheduler import job_queue
+from storage import jobs as job_store
+from utils import config, events
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+
+class QueueFullError(Exception):
+    """Raised when the queue is at capacity; carries a Retry-After hint in seconds."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Job queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class Scheduler:
+    """Fixed-size pool of workers claiming jobs from the persistent queue.
+
+    In "threads" mode each worker is a thread running the sync graph; in "async" mode each
+    worker is an asyncio task on the API's event loop driving run_agent_async, so the worker
+    count can be far higher than the thread count. In "remote" mode there are no workers here:
+    jobs are only enqueued, and `python -m worker` processes sharing the queue run them.
+    While a local pool runs it heartbeats, so other nodes can tell its jobs from abandoned ones.
+    """
+
+    def __init__(self, workers: int, max_queue: int, mode: str = "threads", name: str | None = None):
+        self.workers   = workers
+        self.max_queue = max_queue
+        self.mode      = mode
+
+        self._threads: list[threading.Thread] = []
+        self._tasks: list[asyncio.Task]       = []
+        self._loop                            = None
+        self._async_wake                      = None
+        self._cancelled: set[str]             = set()
+        self._running: set[str]               = set()
+        self._wake                            = threading.Condition()
+        self._stop                            = threading.Event()
+        self._lock                            = threading.Lock()
+        self._name                            = name or f"api-{uuid.uuid4().hex[:8]}"
+
+        self._stats = {
+            "submitted": 0, "rejected": 0, "completed": 0, "cancelled": 0,
+            "wait_seconds_total": 0.0, "wait_seconds_max": 0.0,
+            "run_seconds_total": 0.0,
+        }
+
+    def start(self) -> None:
+        """Start the worker threads (or tasks) and the heartbeat; interrupted jobs are requeued by recover() beforehand."""
+        if self.mode == "remote":
+            log.info("scheduler_started", mode=self.mode, max_queue=self.max_queue)
+            return
+        if self.mode == "async":
+            self._loop       = asyncio.get_running_loop()
+            self._async_wake = asyncio.Event()
+            self._tasks      = [self._loop.create_task(self._work_async()) for _ in range(self.workers)]
+        else:
+            for i in range(self.workers):
+                t = threading.Thread(target=self._work, name=f"scheduler-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+        threading.Thread(target=self._heartbeat, name="scheduler-heartbeat", daemon=True).start()
+        log.info("scheduler_started", mode=self.mode, workers=self.workers, max_queue=self.max_queue)
+
+    def shutdown(self) -> None:
+        """Stop claiming new jobs. In-flight jobs are requeued by recover() on next start."""
+        self._stop.set()
+        with self._wake:
+            self._wake.notify_all()
+        for task in self._tasks:
+            task.cancel()
+
+    def join(self) -> None:
+        """After shutdown(), wait for the worker threads to finish their current jobs."""
+        for t in self._threads:
+            t.join()
+
+    def submit(self, job_id: str, bug_report: str, target_url: str,
+               tenant: str = "default", priority: str = "normal", **options) -> None:
+        """Enqueue a job, or raise QueueFullError when the queue is at capacity.
+
+        Batch members go through reserve_batch() and submit_batch() instead and do not count
+        against the interactive queue. options are passed through to run_agent as keyword arguments.
+        """
+        if job_queue.depth(batch=False) >= self.max_queue:
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise QueueFullError(self.retry_after())
+        payload = {"bug_report": bug_report, "target_url": target_url, "options": options}
+        job_queue.enqueue(job_id, payload, tenant, priority)
+        with self._lock:
+            self._stats["submitted"] += 1
+        self._notify()
+
+    def submit_batch(self, jobs: list[dict], batch_id: str, batch_limit: int, held: bool = False) -> None:
+        """Enqueue the jobs of a batch admitted by reserve_batch() all at once. Each job is a dict of
+        job_id, bug_report, target_url, tenant, priority and options. Held jobs wait for release_batch()."""
+        job_queue.enqueue_batch(
+            [(job["job_id"], {"bug_report": job["bug_report"], "target_url": job["target_url"],
+                              "options": job["options"]}, job["tenant"], job["priority"]) for job in jobs],
+            batch_id, batch_limit, held,
+        )
+        with self._lock:
+            self._stats["submitted"] += len(jobs)
+        if not held:
+            self._notify(len(jobs))
+
+    def release_batch(self, batch_id: str) -> None:
+        """Let the held jobs of a batch be claimed."""
+        self._notify(job_queue.release(batch_id))
+
+    def _notify(self, jobs: int = 1) -> None:
+        """Wake idle workers for newly claimable jobs."""
+        with self._wake:
+            self._wake.notify(jobs)
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._async_wake.set)
+
+    def reserve_batch(self, size: int) -> None:
+        """Raise QueueFullError unless size more batch jobs fit under BATCH_MAX_QUEUE."""
+        if job_queue.depth(batch=True) + size > config.BATCH_MAX_QUEUE:
+            with self._lock:
+                self._stats["rejected"] += size
+            raise QueueFullError(self.retry_after())
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued job immediately, or flag a running one (here or on another node) to stop after its current node."""
+        if job_queue.cancel_queued(job_id):
+            job_store.update_status(job_id, "cancelled")
+            events.publish(job_id, events.TERMINAL, status="cancelled", success=None)
+            with self._lock:
+                self._stats["cancelled"] += 1
+            return True
+        with self._lock:
+            if job_id in self._running:
+                self._cancelled.add(job_id)
+                return True
+        return job_queue.request_cancel(job_id)
+
+    def is_cancelled(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._cancelled
+
+    def retry_after(self) -> int:
+        """Estimate seconds until a queue slot frees up, from observed run times."""
+        with self._lock:
+            done = self._stats["completed"]
+            avg  = self._stats["run_seconds_total"] / done if done else config.SCHEDULER_RETRY_AFTER_SECONDS
+        return max(1, math.ceil(avg / max(self.workers, 1)))
+
+    def stats(self) -> dict:
+        """Return queue depth, worker occupancy and queue wait-time metrics.
+
+        In remote mode workers and busy add up what the live worker nodes last reported.
+        """
+        counts = job_queue.counts()
+        nodes  = job_queue.workers()
+        remote = self.mode == "remote"
+        with self._lock:
+            started = self._stats["completed"] + len(self._running)
+            return {
+                "mode":        self.mode,
+                "workers":     sum(n["workers"] for n in nodes) if remote else self.workers,
+                "busy":        sum(n["busy"] for n in nodes) if remote else len(self._running),
+                "nodes":       len(nodes),
+                "queue_depth": counts.get("queued", 0) + counts.get("held", 0),
+                "max_queue":   self.max_queue,
+                **self._stats,
+                "wait_seconds_avg": round(self._stats["wait_seconds_total"] / started, 3) if started else 0.0,
+            }
+
+    def _heartbeat(self) -> None:
+        """Every WORKER_HEARTBEAT_SECONDS until stopped and idle: mark this node and its jobs alive,
+        pick up cancellations requested through the queue, and requeue the jobs of silent nodes."""
+        info = {"host": socket.gethostname(), "pid": os.getpid(), "mode": self.mode, "workers": self.workers}
+        while not self._stop.is_set() or self._running:
+            try:
+                with self._lock:
+                    busy = len(self._running)
+                cancel = job_queue.heartbeat(self._name, {**info, "busy": busy})
+                with self._lock:
+                    self._cancelled.update(job_id for job_id in cancel if job_id in self._running)
+                requeued = job_queue.requeue_stale()
+                if requeued:
+                    log.warning("scheduler_requeued_stale", count=requeued)
+            except Exception as e:
+                log.error("scheduler_heartbeat_error", error=str(e))
+            time.sleep(config.WORKER_HEARTBEAT_SECONDS)
+
+    def _begin(self, item: dict) -> None:
+        job_id = item["job_id"]
+        waited = item["started_at"] - item["enqueued_at"]
+        with self._lock:
+            self._running.add(job_id)
+            self._stats["wait_seconds_total"] += waited
+            self._stats["wait_seconds_max"] = max(self._stats["wait_seconds_max"], waited)
+        log.info("scheduler_job_start", job_id=job_id, tenant=item["tenant"], waited=round(waited, 2))
+
+    def _end(self, job_id: str, state: str, started: float) -> None:
+        if not job_queue.finish(job_id, self._name, state):
+            log.warning("scheduler_job_lost", job_id=job_id, state=state)
+        with self._lock:
+            self._running.discard(job_id)
+            self._cancelled.discard(job_id)
+            self._stats["completed"] += 1
+            self._stats["run_seconds_total"] += time.time() - started
+            if state == "cancelled":
+                self._stats["cancelled"] += 1
+
+    def _work(self) -> None:
+        while not self._stop.is_set():
+            item = job_queue.claim(self._name)
+            if item is None:
+                with self._wake:
+                    self._wake.wait(config.SCHEDULER_POLL_SECONDS)
+                continue
+
+            job_id  = item["job_id"]
+            started = time.time()
+            state   = "done"
+            self._begin(item)
+            try:
+                result = run_agent(
+                    item["payload"]["bug_report"], item["payload"]["target_url"], job_id,
+                    should_cancel=lambda: self.is_cancelled(job_id),
+                    **item["payload"].get("options", {}),
+                )
+                if result.get("status") == "cancelled":
+                    state = "cancelled"
+            except Exception as e:
+                log.error("scheduler_job_error", job_id=job_id, error=str(e))
+            finally:
+                self._end(job_id, state, started)
+
+    async def _work_async(self) -> None:
+        while not self._stop.is_set():
+            item = await asyncio.to_thread(job_queue.claim, self._name)
+            if item is None:
+                self._async_wake.clear()
+                try:
+                    await asyncio.wait_for(self._async_wake.wait(), config.SCHEDULER_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            job_id  = item["job_id"]
+            started = time.time()
+            state   = "done"
+            self._begin(item)
+            try:
+                result = await run_agent_async(
+                    item["payload"]["bug_report"], item["payload"]["target_url"], job_id,
+                    should_cancel=lambda: self.is_cancelled(job_id),
+                    **item["payload"].get("options", {}),
+                )
+                if result.get("status") == "cancelled":
+                    state = "cancelled"
+            except Exception as e:
+                log.error("scheduler_job_error", job_id=job_id, error=str(e))
+            finally:
+                await asyncio.to_thread(self._end, job_id, state, started)
+
+
+_scheduler: Scheduler | None = None
+
+
+def recover() -> int:
+    """Requeue jobs a previous process left running; returns how many.
+
+    In remote mode the running jobs belong to worker nodes, so only those of nodes that stopped
+    heartbeating are requeued. Claimed again, each resumes from its last checkpointed node (see
+    agent.checkpoints).
+    """
+    requeued = job_queue.requeue_stale() if config.SCHEDULER_MODE == "remote" else job_queue.requeue_running()
+    if requeued:
+        log.info("scheduler_requeued", count=requeued)
+    released = job_queue.release()  # batches whose analyze priming a previous process did not finish
+    if released:
+        log.info("scheduler_released_held", count=released)
+    return requeued
+
+
+def start() -> None:
+    """Create and start the process-wide scheduler."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = Scheduler(config.SCHEDULER_WORKERS, config.SCHEDULER_MAX_QUEUE, config.SCHEDULER_MODE)
+        _scheduler.start()
+
+
+def shutdown() -> None:
+    """Stop the process-wide scheduler."""
+    global _scheduler
+    if _scheduler is not None:
+        _scheduler.shutdown()
+        _scheduler = None
+
+
+def get() -> Scheduler:
+    """Return the process-wide scheduler, starting it on first use."""
+    if _scheduler is None:
+        start()
+    return _scheduler
+
+
+def stats() -> dict:
+    """Return scheduler metrics, or a stopped marker when not running."""
+    return _scheduler.stats() if _scheduler is not None else {"running": False}
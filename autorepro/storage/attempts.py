@@ -0,0 +1,102 @@
+"""Append-only per-job attempt log — JSONL segments under data/attempts/<job_id>/.
+
+Each finished attempt (script + execution result) and each refinement note is appended as one
+line as soon as it exists; nothing is ever rewritten. The job document and agent state only carry
+a compact per-attempt summary, and the full history is rebuilt lazily from the log on demand.
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Iterator
+
+from utils import config
+
+# Appends to one job's log are serialised; jobs share a fixed set of locks by hash instead of
+# holding one each for the life of the process.
+LOCK_STRIPES = 64
+_locks       = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+
+def log_dir(job_id: str) -> Path:
+    """Return the directory holding a job's attempt log segments."""
+    return Path(config.DATA_DIR) / "attempts" / job_id
+
+
+def _lock(job_id: str) -> threading.Lock:
+    return _locks[hash(job_id) % LOCK_STRIPES]
+
+
+def _segments(job_id: str) -> list[Path]:
+    return sorted(log_dir(job_id).glob("segment_*.jsonl"))
+
+
+def append(job_id: str, record: dict) -> None:
+    """Append one record to the job's current segment, rolling over at ATTEMPT_LOG_SEGMENT_BYTES."""
+    line = (json.dumps(record, default=str) + "\n").encode("utf-8")
+    with _lock(job_id):
+        d = log_dir(job_id)
+        d.mkdir(parents=True, exist_ok=True)
+        segments = _segments(job_id)
+        current  = segments[-1] if segments else d / "segment_00000.jsonl"
+        if current.exists() and current.stat().st_size + len(line) > config.ATTEMPT_LOG_SEGMENT_BYTES:
+            current = d / f"segment_{len(segments):05d}.jsonl"
+        with current.open("ab") as f:
+            f.write(line)
+            f.flush()
+
+
+def read(job_id: str) -> Iterator[dict]:
+    """Yield the job's records in write order, one segment at a time."""
+    for segment in _segments(job_id):
+        with segment.open("rb") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def summary(attempt: int, result: dict) -> dict:
+    """Compact history entry kept in state and in the job document."""
+    return {
+        "attempt":          attempt,
+        "error_type":       result.get("error_type"),
+        "error_message":    result.get("error_message"),
+        "exit_code":        result.get("exit_code"),
+        "duration_seconds": result.get("duration_seconds"),
+    }
+
+
+def record_attempt(job_id: str, attempt: int, script: str, result: dict) -> dict:
+    """Log a finished attempt and return its compact summary."""
+    append(job_id, {"type": "attempt", "attempt": attempt, "script": script, "result": result})
+    return summary(attempt, result)
+
+
+def record_candidate(job_id: str, attempt: int, candidate: int, script: str, result: dict) -> None:
+    """Log one fan-out candidate of an attempt; the attempt's chosen run is logged by record_attempt."""
+    append(job_id, {"type": "candidate", "attempt": attempt, "candidate": candidate, "script": script, "result": result})
+
+
+def record_refinement(job_id: str, attempt: int, note: str) -> None:
+    """Log the refinement note written after an attempt failed."""
+    append(job_id, {"type": "refinement", "attempt": attempt, "refinement_note": note})
+
+
+def history(job_id: str) -> list[dict]:
+    """Rebuild the full history ({attempt, script, result, refinement_note, candidates?}) from the log."""
+    entries: dict[int, dict] = {}
+    for record in read(job_id):
+        entry = entries.setdefault(record["attempt"], {"attempt": record["attempt"]})
+        if record["type"] == "attempt":
+            entry.update(script=record["script"], result=record["result"])
+        elif record["type"] == "refinement":
+            entry["refinement_note"] = record["refinement_note"]
+        elif record["type"] == "candidate":
+            entry.setdefault("candidates", []).append(
+                {"candidate": record["candidate"], "script": record["script"], "result": record["result"]})
+    return [entries[k] for k in sorted(entries)]
+
+
+def exists(job_id: str) -> bool:
+    """True if the job has written at least one attempt record."""
+    return bool(_segments(job_id))
@@ -0,0 +1,67 @@
+"""Batch records — one data/batches/<id>.json per bulk submission, plus aggregate progress."""
+
+import json
+import os
+from pathlib import Path
+
+from storage import jobs as job_store
+from utils import config
+
+FINISHED = ("done", "failed", "cancelled")
+
+
+def _path(batch_id: str) -> Path:
+    d = Path(config.DATA_DIR) / "batches"
+    d.mkdir(parents=True, exist_ok=True)
+    return d / f"{batch_id}.json"
+
+
+def save(batch: dict) -> None:
+    """Atomically write a batch record ({batch_id, created_at, concurrency, jobs: [...]})."""
+    target = _path(batch["batch_id"])
+    tmp    = target.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(batch, indent=2, default=str))
+    os.replace(tmp, target)
+
+
+def get(batch_id: str) -> dict | None:
+    """Load a batch record by ID. Returns None if not found."""
+    p = _path(batch_id)
+    return json.loads(p.read_text()) if p.exists() else None
+
+
+def progress(batch: dict) -> dict:
+    """Aggregate status counts and success rate of a batch, with one row per submitted report."""
+    entries   = batch["jobs"]
+    summaries = job_store.summaries(list(dict.fromkeys(e["job_id"] for e in entries)))
+    counts    = {}
+    succeeded = 0
+    finished  = 0
+    rows      = []
+    for e in entries:
+        job    = summaries.get(e["job_id"], {})
+        status = job.get("status", "unknown")
+        counts[status] = counts.get(status, 0) + 1
+        if status in FINISHED:
+            finished += 1
+            succeeded += bool(job.get("success"))
+        rows.append({
+            **e,
+            "status":        status,
+            "success":       job.get("success"),
+            "attempt_count": job.get("attempt_count"),
+            "result_url":    f"/result/{e['job_id']}",
+        })
+    total = len(entries)
+    return {
+        "batch_id":     batch["batch_id"],
+        "created_at":   batch["created_at"],
+        "concurrency":  batch["concurrency"],
+        "total":        total,
+        "finished":     finished,
+        "succeeded":    succeeded,
+        "counts":       counts,
+        "progress":     round(finished / total, 3) if total else 1.0,
+        "success_rate": round(succeeded / finished, 3) if finished else None,
+        "jobs":         rows,
+    }
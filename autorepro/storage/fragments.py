@@ -0,0 +1,168 @@
+"""Verified step fragments per target page — SQLite under DATA_DIR/cache/fragments.sqlite.
+
+Generated scripts open the code for each inferred step with a ``# @step N`` comment. When a job
+reproduces, every such block is stored under the target's host and path and the normalised text of
+inferred step N. Later jobs against the same page are shown the fragments for their own steps and may write
+``# @fragment <id>`` instead of the code; expand() puts the verified code back before the script runs.
+"""
+
+import hashlib
+import re
+import sqlite3
+import textwrap
+import threading
+import time
+from pathlib import Path
+from typing import NamedTuple
+from urllib.parse import urlsplit
+
+from sandbox.classifier import SUCCESS_MARKER
+from utils import config
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fragments (
+    id           TEXT PRIMARY KEY,
+    host         TEXT NOT NULL,
+    path         TEXT NOT NULL,
+    step         TEXT NOT NULL,
+    code         TEXT NOT NULL,
+    verified     INTEGER NOT NULL,
+    created_at   REAL NOT NULL,
+    verified_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS fragments_page ON fragments (host, path);
+"""
+
+_STEP      = re.compile(r"^(\s*)# @step (\d+)\b")
+_REFERENCE = re.compile(r"^(\s*)# @fragment ([0-9a-f]{10})\b.*$", re.MULTILINE)
+_EXPANDED  = re.compile(r"^\s*# fragment [0-9a-f]{10}\s*$")
+
+
+class Fragment(NamedTuple):
+    id:   str
+    step: int   # 1-based index into the analysis's inferred_steps
+    text: str   # the inferred step
+    code: str
+
+
+def normalise(step: str) -> str:
+    """Lowercase, punctuation-free, single-spaced step text."""
+    return " ".join(re.sub(r"[^\w\s]", " ", step.lower()).split())
+
+
+def page_of(target_url: str) -> tuple[str, str]:
+    """host[:port] and path of the target; fragments are shared between jobs on the same page, since
+    a step's code (its driver.get() above all) only fits the page it was verified on."""
+    parts = urlsplit(target_url)
+    return parts.netloc.lower(), parts.path or "/"
+
+
+def fragment_id(host: str, path: str, step: str) -> str:
+    return hashlib.sha1(f"{host}\0{path}\0{normalise(step)}".encode("utf-8")).hexdigest()[:10]
+
+
+_conn: sqlite3.Connection | None = None
+_lock                            = threading.Lock()
+
+
+def _db() -> sqlite3.Connection:
+    """The shared connection, opened on first use; call with _lock held."""
+    global _conn
+    if _conn is None:
+        path = Path(config.DATA_DIR) / "cache" / "fragments.sqlite"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        columns = {r[1] for r in _conn.execute("PRAGMA table_info(fragments)")}
+        if columns and "path" not in columns:
+            # Keyed by host alone, so not reusable per page; the table is only a cache.
+            _conn.execute("DROP TABLE fragments")
+        _conn.executescript(_SCHEMA)
+    return _conn
+
+
+def lookup(target_url: str, steps: list[str]) -> list[Fragment]:
+    """Verified fragments for the given inferred steps on the target page, in step order."""
+    if not config.FRAGMENTS_ENABLED or not steps:
+        return []
+    host, path = page_of(target_url)
+    ids        = {fragment_id(host, path, s): i for i, s in enumerate(steps, 1)}
+    with _lock:
+        rows = _db().execute(
+            f"SELECT id, code FROM fragments WHERE id IN ({','.join('?' * len(ids))})", list(ids),
+        ).fetchall()
+    found = sorted((ids[fid], fid, code) for fid, code in rows)
+    return [Fragment(fid, i, steps[i - 1], code) for i, fid, code in found]
+
+
+def expand(script: str) -> str:
+    """Replace each ``# @fragment <id>`` line with the stored code at that line's indentation."""
+    refs = {m.group(2) for m in _REFERENCE.finditer(script)}
+    if not refs:
+        return script
+    with _lock:
+        rows = dict(_db().execute(
+            f"SELECT id, code FROM fragments WHERE id IN ({','.join('?' * len(refs))})", list(refs),
+        ).fetchall())
+
+    def replace(m: re.Match) -> str:
+        indent, fid = m.group(1), m.group(2)
+        if fid not in rows:
+            log.warning("fragment_unknown", fragment=fid)
+            return m.group(0)
+        return textwrap.indent(f"# fragment {fid}\n{rows[fid]}", indent)
+
+    return _REFERENCE.sub(replace, script)
+
+
+def blocks(script: str) -> dict[int, str]:
+    """The dedented code under each ``# @step N`` marker, up to the next marker or the end of its block."""
+    found   = {}
+    current = None
+    for line in script.splitlines():
+        m = _STEP.match(line)
+        if m:
+            current = (int(m.group(2)), len(m.group(1)))
+            found[current[0]] = []
+            continue
+        if current is None:
+            continue
+        if line.strip() and len(line) - len(line.lstrip()) < current[1]:
+            current = None
+            continue
+        if not _EXPANDED.match(line):
+            found[current[0]].append(line)
+    return {n: textwrap.dedent("\n".join(lines)).strip("\n") for n, lines in found.items()}
+
+
+def record(target_url: str, steps: list[str], script: str) -> int:
+    """Store the step blocks of a script that reproduced; returns how many were stored or re-verified.
+
+    Blocks that print the success marker are bug-specific checks rather than reusable steps and
+    are skipped, as are empty ones and ones longer than FRAGMENTS_MAX_LINES.
+    """
+    if not config.FRAGMENTS_ENABLED or not steps:
+        return 0
+    host, path = page_of(target_url)
+    now        = time.time()
+    rows       = []
+    for n, code in blocks(script).items():
+        if not 1 <= n <= len(steps) or not code or SUCCESS_MARKER in code or "reproduced(" in code:
+            continue
+        if code.count("\n") + 1 > config.FRAGMENTS_MAX_LINES:
+            continue
+        rows.append((fragment_id(host, path, steps[n - 1]), host, path, normalise(steps[n - 1]), code, now, now))
+    if rows:
+        with _lock:
+            _db().executemany(
+                "INSERT INTO fragments (id, host, path, step, code, verified, created_at, verified_at) "
+                "VALUES (?, ?, ?, ?, ?, 1, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET code = excluded.code, verified = verified + 1, "
+                "verified_at = excluded.verified_at",
+                rows,
+            )
+        log.info("fragments_recorded", host=host, path=path, count=len(rows))
+    return len(rows)
@@ -0,0 +1,67 @@
+"""JobStore interface — the contract every job persistence backend implements."""
+
+from abc import ABC, abstractmethod
+from urllib.parse import urlsplit
+
+
+def target_host(job: dict) -> str | None:
+    """Host part of a job's target URL, used for indexing and filtering."""
+    url = job.get("target_url")
+    return urlsplit(url).hostname if url else None
+
+
+def summary(job: dict) -> dict:
+    """Compact listing view of a job: identity, status and timing, no scripts or logs."""
+    return {
+        "job_id":        job.get("job_id"),
+        "status":        job.get("status"),
+        "success":       job.get("success"),
+        "target_url":    job.get("target_url"),
+        "attempt_count": job.get("attempt_count"),
+        "created_at":    job.get("created_at"),
+        "completed_at":  job.get("completed_at"),
+    }
+
+
+class JobStore(ABC):
+    """Base class for job persistence backends."""
+
+    @abstractmethod
+    def save(self, job_id: str, data: dict) -> None:
+        """Atomically replace a job's record."""
+
+    @abstractmethod
+    def get(self, job_id: str) -> dict | None:
+        """Load a job by ID. Returns None if not found."""
+
+    @abstractmethod
+    def delete(self, job_id: str) -> None:
+        """Remove a job's record if it exists."""
+
+    def update_status(self, job_id: str, status: str) -> None:
+        """Update just the status field of a job."""
+        data = self.get(job_id)
+        if data:
+            self.save(job_id, {**data, "status": status})
+
+    @abstractmethod
+    def index_fingerprint(self, fingerprint: str, job_id: str) -> None:
+        """Point a request fingerprint at the most recent job submitted for it."""
+
+    @abstractmethod
+    def find_by_fingerprint(self, fingerprint: str) -> dict | None:
+        """Return the most recent job submitted with this fingerprint, if it still exists."""
+
+    @abstractmethod
+    def list_jobs(self, status: str | None = None, success: bool | None = None, host: str | None = None,
+                  limit: int = 50, offset: int = 0) -> tuple[list[dict], int]:
+        """Return one page of job summaries, newest first, and the total number matching."""
+
+    def summaries(self, job_ids: list[str]) -> dict[str, dict]:
+        """Return summaries of the given jobs keyed by ID; missing jobs are left out."""
+        jobs = (self.get(job_id) for job_id in job_ids)
+        return {job["job_id"]: summary(job) for job in jobs if job is not None}
+
+    @abstractmethod
+    def list_all(self) -> list[dict]:
+        """Return every persisted job in full."""
@@ -1,42 +1,78 @@
-"""Job CRUD — read/write data/jobs/<id>.json with atomic writes."""
+"""Job CRUD — module-level facade over the configured JobStore backend (JOB_STORE=sqlite|json)."""
 
-import json
-import os
+import threading
 from pathlib import Path
 
-from utils import config
+from storage.job_store import JobStore
+from utils import config, metrics, tracing
 
-JOBS_DIR = Path(config.DATA_DIR) / "jobs"
+_store: JobStore | None = None
+_lock                   = threading.Lock()
 
 
-def _path(job_id: str) -> Path:
-    """Return the path to a job's JSON file, ensuring the directory exists."""
-    JOBS_DIR.mkdir(parents=True, exist_ok=True)
-    return JOBS_DIR / f"{job_id}.json"
+def get_store() -> JobStore:
+    """Return the process-wide job store, creating it on first use."""
+    global _store
+    with _lock:
+        if _store is None:
+            if config.JOB_STORE == "json":
+                from storage.json_store import JsonJobStore
+                _store = JsonJobStore(config.DATA_DIR)
+            else:
+                from storage.sqlite_store import SqliteJobStore
+                path   = Path(config.DATA_DIR) / "jobs.sqlite"
+                legacy = Path(config.DATA_DIR) / "jobs"
+                if not path.exists() and any(legacy.glob("*.json")):
+                    from storage.migrate import migrate  # first start after upgrading from JOB_STORE=json
+                    migrate(legacy, path)
+                _store = SqliteJobStore(path)
+        return _store
 
 
 def save(job_id: str, data: dict) -> None:
-    """Atomically write job data to disk."""
-    target = _path(job_id)
-    tmp    = target.with_suffix(".json.tmp")
-    tmp.write_text(json.dumps(data, indent=2, default=str))
-    os.replace(tmp, target)
+    """Atomically write job data."""
+    with tracing.span("store.save", job_id, metrics.STORE_SECONDS, op="save"):
+        get_store().save(job_id, data)
 
 
 def get(job_id: str) -> dict | None:
     """Load a job by ID. Returns None if not found."""
-    p = _path(job_id)
-    return json.loads(p.read_text()) if p.exists() else None
+    with tracing.span("store.get", job_id, metrics.STORE_SECONDS, op="get"):
+        return get_store().get(job_id)
+
+
+def delete(job_id: str) -> None:
+    """Remove a job's record if it exists."""
+    get_store().delete(job_id)
 
 
 def update_status(job_id: str, status: str) -> None:
     """Update just the status field of a job."""
-    data = get(job_id)
-    if data:
-        save(job_id, {**data, "status": status})
+    with tracing.span("store.update_status", job_id, metrics.STORE_SECONDS, op="update_status"):
+        get_store().update_status(job_id, status)
+
+
+def index_fingerprint(fingerprint: str, job_id: str) -> None:
+    """Point a request fingerprint at the most recent job submitted for it."""
+    get_store().index_fingerprint(fingerprint, job_id)
+
+
+def find_by_fingerprint(fingerprint: str) -> dict | None:
+    """Return the most recent job submitted with this fingerprint, if it still exists."""
+    return get_store().find_by_fingerprint(fingerprint)
+
+
+def list_jobs(status: str | None = None, success: bool | None = None, host: str | None = None,
+              limit: int = 50, offset: int = 0) -> tuple[list[dict], int]:
+    """Return one page of job summaries, newest first, and the total number matching."""
+    return get_store().list_jobs(status=status, success=success, host=host, limit=limit, offset=offset)
+
+
+def summaries(job_ids: list[str]) -> dict[str, dict]:
+    """Return summaries of the given jobs keyed by ID; missing jobs are left out."""
+    return get_store().summaries(job_ids)
 
 
 def list_all() -> list[dict]:
     """List all persisted jobs."""
-    JOBS_DIR.mkdir(parents=True, exist_ok=True)
-    return [json.loads(p.read_text()) for p in JOBS_DIR.glob("*.json")]
+    return get_store().list_all()
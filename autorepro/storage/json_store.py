@@ -0,0 +1,59 @@
+"""JSON-file job backend — one data/jobs/<id>.json per job with atomic writes."""
+
+import json
+import os
+from pathlib import Path
+
+from storage.job_store import JobStore, summary, target_host
+
+
+class JsonJobStore(JobStore):
+    """Stores each job as a pretty-printed JSON file; listing scans the whole directory."""
+
+    def __init__(self, data_dir: str):
+        self.jobs_dir         = Path(data_dir) / "jobs"
+        self.fingerprints_dir = Path(data_dir) / "fingerprints"
+
+    def _path(self, job_id: str) -> Path:
+        """Return the path to a job's JSON file, ensuring the directory exists."""
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        return self.jobs_dir / f"{job_id}.json"
+
+    def save(self, job_id: str, data: dict) -> None:
+        target = self._path(job_id)
+        tmp    = target.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(data, indent=2, default=str))
+        os.replace(tmp, target)
+
+    def get(self, job_id: str) -> dict | None:
+        p = self._path(job_id)
+        return json.loads(p.read_text()) if p.exists() else None
+
+    def delete(self, job_id: str) -> None:
+        self._path(job_id).unlink(missing_ok=True)
+
+    def index_fingerprint(self, fingerprint: str, job_id: str) -> None:
+        self.fingerprints_dir.mkdir(parents=True, exist_ok=True)
+        target = self.fingerprints_dir / fingerprint
+        tmp    = target.with_suffix(".tmp")
+        tmp.write_text(job_id)
+        os.replace(tmp, target)
+
+    def find_by_fingerprint(self, fingerprint: str) -> dict | None:
+        p = self.fingerprints_dir / fingerprint
+        return self.get(p.read_text().strip()) if p.exists() else None
+
+    def list_jobs(self, status: str | None = None, success: bool | None = None, host: str | None = None,
+                  limit: int = 50, offset: int = 0) -> tuple[list[dict], int]:
+        matching = [
+            job for job in self.list_all()
+            if (status is None or job.get("status") == status)
+            and (success is None or job.get("success") == success)
+            and (host is None or target_host(job) == host)
+        ]
+        matching.sort(key=lambda job: job.get("created_at") or "", reverse=True)
+        return [summary(job) for job in matching[offset:offset + limit]], len(matching)
+
+    def list_all(self) -> list[dict]:
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        return [json.loads(p.read_text()) for p in self.jobs_dir.glob("*.json")]
@@ -0,0 +1,215 @@
+"""Per-target knowledge index — locators that resolved or failed, and page inventories, by host and URL path.
+
+Stored in DATA_DIR/cache/locators.sqlite. Every attempt teaches it something: a run that reproduced
+vouches for every locator its script used, an ElementNotFound names the locator that did not
+resolve, and a page source saved by a failing run (see autorepro_helpers.session) becomes a compact
+inventory of the ids, names and controls on the page. The analyze and generate prompts are given
+what is known about the job's page, so a repeat report against the same app can get its locators
+right the first time. Rows are evicted by age, then by how rarely they were useful.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from utils import config
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS locators (
+    host       TEXT NOT NULL,
+    path       TEXT NOT NULL,
+    strategy   TEXT NOT NULL,
+    value      TEXT NOT NULL,
+    ok         INTEGER NOT NULL DEFAULT 0,
+    failed     INTEGER NOT NULL DEFAULT 0,
+    last_seen  REAL NOT NULL,
+    PRIMARY KEY (host, path, strategy, value)
+);
+CREATE TABLE IF NOT EXISTS pages (
+    host       TEXT NOT NULL,
+    path       TEXT NOT NULL,
+    inventory  TEXT NOT NULL,
+    last_seen  REAL NOT NULL,
+    PRIMARY KEY (host, path)
+);
+CREATE INDEX IF NOT EXISTS locators_age ON locators (last_seen);
+CREATE INDEX IF NOT EXISTS pages_age    ON pages (last_seen);
+"""
+
+# Locators in scripts, e.g. (By.ID, "submit") or By.CSS_SELECTOR, '#error'.
+_USED     = re.compile(r"""By\.([A-Z_]+)\s*,\s*(["'])(.+?)\2""")
+# The locator a NoSuchElementException reports; quotes inside the selector may be escaped.
+_MISSING  = re.compile(r'"method":\s*"([^"]+)",\s*"selector":\s*"(.+?)"\s*\}')
+_ATTR     = re.compile(r'^\[(id|name)=\\?"(.+?)\\?"\]$')
+_SNAPSHOT = re.compile(r"Page source saved: (\S+\.html)")
+
+INVENTORY_ITEMS = 40   # per kind of element
+SHOWN_LOCATORS  = 25   # per outcome in a prompt
+
+
+def _key(target_url: str) -> tuple[str, str]:
+    parts = urlsplit(target_url)
+    return parts.netloc.lower(), parts.path or "/"
+
+
+def _strategy(attribute: str) -> str:
+    """By attribute name to its locator strategy, e.g. CSS_SELECTOR -> "css selector"."""
+    return attribute.lower().replace("_", " ")
+
+
+def _missing(text: str) -> tuple[str, str] | None:
+    m = _MISSING.search(text or "")
+    if m is None:
+        return None
+    method, selector = m.group(1), m.group(2).replace('\\"', '"')
+    attr = _ATTR.match(selector)
+    if method == "css selector" and attr:
+        return attr.group(1), attr.group(2)  # how Selenium rewrites By.ID / By.NAME
+    return method, selector
+
+
+class _Inventory(HTMLParser):
+    """Collects the ids, names, test ids and control labels of a page."""
+
+    def __init__(self):
+        super().__init__()
+        self.found = {"ids": [], "names": [], "test_ids": [], "buttons": [], "links": []}
+        self._text = None
+
+    def _add(self, kind: str, value: str | None) -> None:
+        value = " ".join((value or "").split())[:80]
+        items = self.found[kind]
+        if value and value not in items and len(items) < INVENTORY_ITEMS:
+            items.append(value)
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        a = dict(attrs)
+        self._add("ids", a.get("id"))
+        self._add("names", a.get("name"))
+        self._add("test_ids", a.get("data-testid") or a.get("data-test"))
+        if tag == "input" and a.get("type") in ("submit", "button"):
+            self._add("buttons", a.get("value"))
+        if tag in ("button", "a"):
+            self._text = (tag, [])
+
+    def handle_data(self, data: str) -> None:
+        if self._text is not None:
+            self._text[1].append(data)
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._text is not None and self._text[0] == tag:
+            self._add("buttons" if tag == "button" else "links", "".join(self._text[1]))
+            self._text = None
+
+
+def inventory(html: str) -> dict:
+    """Compact summary of a page's addressable elements."""
+    parser = _Inventory()
+    try:
+        parser.feed(html)
+    except Exception:
+        pass
+    return {k: v for k, v in parser.found.items() if v}
+
+
+_conn: sqlite3.Connection | None = None
+_lock                            = threading.Lock()
+
+
+def _db() -> sqlite3.Connection:
+    """The shared connection, opened on first use; call with _lock held."""
+    global _conn
+    if _conn is None:
+        path = Path(config.DATA_DIR) / "cache" / "locators.sqlite"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.executescript(_SCHEMA)
+    return _conn
+
+
+def learn(target_url: str, script: str, result: dict, artifacts_dir: Path) -> None:
+    """Record what one attempt showed about the target page."""
+    if not config.LOCATOR_INDEX_ENABLED:
+        return
+    host, path = _key(target_url)
+    now        = time.time()
+    ok, failed = [], []
+    if result.get("reproduced"):
+        ok = list(dict.fromkeys((_strategy(a), v) for a, _, v in _USED.findall(script)))
+    elif result.get("error_type") == "ElementNotFound":
+        missing = _missing(result.get("error_message")) or _missing(result.get("stderr"))
+        failed  = [missing] if missing else []
+    snapshot = None
+    for name in _SNAPSHOT.findall(result.get("stdout") or "")[-1:]:
+        page = artifacts_dir / Path(name).name
+        if page.is_file():
+            snapshot = inventory(page.read_text(errors="replace"))
+
+    with _lock:
+        db = _db()
+        db.execute("BEGIN")
+        for (strategy, value), column in [*((l, "ok") for l in ok), *((l, "failed") for l in failed)]:
+            db.execute(
+                f"INSERT INTO locators (host, path, strategy, value, {column}, last_seen) VALUES (?, ?, ?, ?, 1, ?) "
+                f"ON CONFLICT DO UPDATE SET {column} = {column} + 1, last_seen = excluded.last_seen",
+                (host, path, strategy, value, now),
+            )
+        if snapshot:
+            db.execute(
+                "INSERT INTO pages (host, path, inventory, last_seen) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT DO UPDATE SET inventory = excluded.inventory, last_seen = excluded.last_seen",
+                (host, path, json.dumps(snapshot), now),
+            )
+        _evict(db, now)
+        db.execute("COMMIT")
+    if ok or failed or snapshot:
+        log.info("locators_learned", host=host, path=path, ok=len(ok), failed=len(failed), page=bool(snapshot))
+
+
+def _evict(db: sqlite3.Connection, now: float) -> None:
+    """Drop rows not seen for LOCATOR_INDEX_MAX_AGE_DAYS, then the least useful beyond LOCATOR_INDEX_MAX_ROWS."""
+    cutoff = now - config.LOCATOR_INDEX_MAX_AGE_DAYS * 86400
+    db.execute("DELETE FROM locators WHERE last_seen < ?", (cutoff,))
+    db.execute("DELETE FROM pages WHERE last_seen < ?", (cutoff,))
+    excess = db.execute("SELECT COUNT(*) FROM locators").fetchone()[0] - config.LOCATOR_INDEX_MAX_ROWS
+    if excess > 0:
+        db.execute(
+            "DELETE FROM locators WHERE rowid IN (SELECT rowid FROM locators "
+            "ORDER BY ok + failed, last_seen LIMIT ?)", (excess,),
+        )
+
+
+def describe(target_url: str) -> str:
+    """What is known about the target page, as prompt text; "None" if nothing is."""
+    if not config.LOCATOR_INDEX_ENABLED:
+        return "None"
+    host, path = _key(target_url)
+    with _lock:
+        db   = _db()
+        rows = db.execute(
+            "SELECT strategy, value, ok, failed FROM locators WHERE host = ? AND path = ? "
+            "ORDER BY ok + failed DESC, last_seen DESC", (host, path),
+        ).fetchall()
+        page = db.execute("SELECT inventory FROM pages WHERE host = ? AND path = ?", (host, path)).fetchone()
+
+    # A locator that resolved in a reproducing run since it last failed counts as verified.
+    verified = [f"{s}={v} ({ok}x)" for s, v, ok, failed in rows if ok > failed][:SHOWN_LOCATORS]
+    broken   = [f"{s}={v} ({failed}x)" for s, v, ok, failed in rows if failed >= ok][:SHOWN_LOCATORS]
+    lines    = []
+    if verified:
+        lines.append("Verified locators (resolved in runs that reproduced): " + ", ".join(verified))
+    if broken:
+        lines.append("Locators that were NOT found on this page: " + ", ".join(broken))
+    if page:
+        lines.append("Elements seen on the page: " + "; ".join(
+            f"{kind}: {', '.join(items)}" for kind, items in json.loads(page[0]).items()))
+    return "\n".join(lines) or "None"
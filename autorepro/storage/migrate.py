@@ -0,0 +1,48 @@
+"""One-shot migration of data/jobs/*.json into the SQLite job store.
+
+Runs automatically the first time the SQLite store is opened next to existing JSON jobs.
+Usage:
+    python -m storage.migrate [--source DATA_DIR/jobs] [--dry-run]
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from storage.sqlite_store import SqliteJobStore
+from utils import config
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+
+def migrate(source: Path, target: Path, dry_run: bool = False) -> dict:
+    """Copy every job JSON file under source into the SQLite store at target. Idempotent."""
+    store  = None if dry_run else SqliteJobStore(target)
+    counts = {"migrated": 0, "skipped": 0}
+    for p in sorted(source.glob("*.json")):
+        try:
+            job = json.loads(p.read_text())
+        except (OSError, json.JSONDecodeError) as e:
+            log.warning("migrate_skip", file=p.name, error=str(e))
+            counts["skipped"] += 1
+            continue
+        job_id = job.get("job_id") or p.stem
+        if store is not None:
+            store.save(job_id, {**job, "job_id": job_id})
+        counts["migrated"] += 1
+    log.info("migrate_complete", source=str(source), target=str(target), dry_run=dry_run, **counts)
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Migrate JSON job files into the SQLite job store.")
+    parser.add_argument("--source", type=Path, default=Path(config.DATA_DIR) / "jobs")
+    parser.add_argument("--target", type=Path, default=Path(config.DATA_DIR) / "jobs.sqlite")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    print(json.dumps(migrate(args.source, args.target, args.dry_run)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""SQLite job backend — indexed job rows with history and large fields in side tables (WAL mode)."""
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from storage.job_store import JobStore, summary, target_host
+
+# Fields kept out of the jobs row so listings never read scripts or logs.
+BLOB_FIELDS = ("script", "final_script", "execution_result", "analysis")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id         TEXT PRIMARY KEY,
+    status         TEXT,
+    success        INTEGER,
+    target_host    TEXT,
+    fingerprint    TEXT,
+    created_at     TEXT,
+    completed_at   TEXT,
+    attempt_count  INTEGER,
+    doc            TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status      ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS jobs_created_at  ON jobs (created_at);
+CREATE INDEX IF NOT EXISTS jobs_success     ON jobs (success, created_at);
+CREATE INDEX IF NOT EXISTS jobs_host        ON jobs (target_host, created_at);
+CREATE INDEX IF NOT EXISTS jobs_fingerprint ON jobs (fingerprint, created_at);
+
+CREATE TABLE IF NOT EXISTS job_history (
+    job_id   TEXT NOT NULL,
+    seq      INTEGER NOT NULL,
+    entry    TEXT NOT NULL,
+    PRIMARY KEY (job_id, seq)
+);
+
+CREATE TABLE IF NOT EXISTS job_blobs (
+    job_id   TEXT NOT NULL,
+    name     TEXT NOT NULL,
+    content  TEXT NOT NULL,
+    PRIMARY KEY (job_id, name)
+);
+"""
+
+
+class SqliteJobStore(JobStore):
+    """Embedded SQLite store; each save is a single transaction, so readers never see partial jobs."""
+
+    def __init__(self, path: Path):
+        self.path   = path
+        self._local = threading.local()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _tx(self):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def save(self, job_id: str, data: dict) -> None:
+        doc     = {k: v for k, v in data.items() if k != "history" and k not in BLOB_FIELDS}
+        success = data.get("success")
+        with self._tx() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, status, success, target_host, fingerprint, created_at, "
+                "completed_at, attempt_count, doc) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, data.get("status"), None if success is None else int(bool(success)),
+                 target_host(data), data.get("fingerprint"), data.get("created_at"),
+                 data.get("completed_at"), data.get("attempt_count"), json.dumps(doc, default=str)),
+            )
+            conn.execute("DELETE FROM job_history WHERE job_id = ?", (job_id,))
+            conn.executemany(
+                "INSERT INTO job_history (job_id, seq, entry) VALUES (?, ?, ?)",
+                [(job_id, i, json.dumps(h, default=str)) for i, h in enumerate(data.get("history") or [])],
+            )
+            conn.execute("DELETE FROM job_blobs WHERE job_id = ?", (job_id,))
+            conn.executemany(
+                "INSERT INTO job_blobs (job_id, name, content) VALUES (?, ?, ?)",
+                [(job_id, name, json.dumps(data[name], default=str)) for name in BLOB_FIELDS if name in data],
+            )
+
+    def get(self, job_id: str) -> dict | None:
+        conn = self._conn()
+        row  = conn.execute("SELECT doc FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = json.loads(row[0])
+        for name, content in conn.execute("SELECT name, content FROM job_blobs WHERE job_id = ?", (job_id,)):
+            job[name] = json.loads(content)
+        history = conn.execute("SELECT entry FROM job_history WHERE job_id = ? ORDER BY seq", (job_id,)).fetchall()
+        if history or "attempt_count" in job:
+            job["history"] = [json.loads(h[0]) for h in history]
+        return job
+
+    def delete(self, job_id: str) -> None:
+        with self._tx() as conn:
+            for table in ("jobs", "job_history", "job_blobs"):
+                conn.execute(f"DELETE FROM {table} WHERE job_id = ?", (job_id,))
+
+    def update_status(self, job_id: str, status: str) -> None:
+        with self._tx() as conn:
+            row = conn.execute("SELECT doc FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None:
+                return
+            doc = {**json.loads(row[0]), "status": status}
+            conn.execute("UPDATE jobs SET status = ?, doc = ? WHERE job_id = ?", (status, json.dumps(doc), job_id))
+
+    def index_fingerprint(self, fingerprint: str, job_id: str) -> None:
+        # The fingerprint column is written by save(); nothing else to index.
+        pass
+
+    def find_by_fingerprint(self, fingerprint: str) -> dict | None:
+        row = self._conn().execute(
+            "SELECT job_id FROM jobs WHERE fingerprint = ? ORDER BY created_at DESC LIMIT 1", (fingerprint,),
+        ).fetchone()
+        return self.get(row[0]) if row else None
+
+    def list_jobs(self, status: str | None = None, success: bool | None = None, host: str | None = None,
+                  limit: int = 50, offset: int = 0) -> tuple[list[dict], int]:
+        where, args = [], []
+        if status is not None:
+            where.append("status = ?")
+            args.append(status)
+        if success is not None:
+            where.append("success = ?")
+            args.append(int(success))
+        if host is not None:
+            where.append("target_host = ?")
+            args.append(host)
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+        conn   = self._conn()
+        total  = conn.execute(f"SELECT COUNT(*) FROM jobs {clause}", args).fetchone()[0]
+        rows   = conn.execute(
+            f"SELECT doc FROM jobs {clause} ORDER BY created_at DESC LIMIT ? OFFSET ?", [*args, limit, offset],
+        ).fetchall()
+        return [summary(json.loads(r[0])) for r in rows], total
+
+    def summaries(self, job_ids: list[str]) -> dict[str, dict]:
+        conn = self._conn()
+        out  = {}
+        # Chunked to stay under SQLite's bound-parameter limit.
+        for i in range(0, len(job_ids), 500):
+            chunk = job_ids[i:i + 500]
+            rows  = conn.execute(
+                f"SELECT job_id, doc FROM jobs WHERE job_id IN ({', '.join('?' * len(chunk))})", chunk,
+            )
+            for job_id, doc in rows:
+                out[job_id] = summary({**json.loads(doc), "job_id": job_id})
+        return out
+
+    def list_all(self) -> list[dict]:
+        ids = [r[0] for r in self._conn().execute("SELECT job_id FROM jobs ORDER BY created_at")]
+        return [job for job in (self.get(i) for i in ids) if job is not None]
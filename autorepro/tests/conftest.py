@@ -0,0 +1,16 @@
+"""Test settings: MockLLM, the in-process fake sandbox and a throwaway DATA_DIR.
+
+Applied at collection, before any autorepro module reads utils.config.
+"""
+
+import os
+import tempfile
+
+os.environ.update({
+    "LLM_PROVIDER":                 "mock",
+    "SANDBOX_BACKEND":              "fake",
+    "POOL_MAX_SIZE":                "0",
+    "FAKE_SANDBOX_LATENCY_SECONDS": "0",
+    "MOCK_LLM_LATENCY_SECONDS":     "0",
+    "DATA_DIR":                     tempfile.mkdtemp(prefix="autorepro-test-"),
+})
@@ -0,0 +1,74 @@
+"""End-to-end runs of the agent graph on the fake sandbox backend against tests/demo_server.py."""
+
+import threading
+
+import pytest
+from werkzeug.serving import make_server
+
+from tests.demo_server import app
+
+BUG_REPORT = (
+    "Login fails with valid credentials. Steps: open the login page, enter username 'testuser' and "
+    "password 'correctpassword123', click Login. Expected: redirect to the dashboard. "
+    "Actual: the page shows 'Invalid credentials'."
+)
+
+
+@pytest.fixture(scope="module")
+def target_url():
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/login"
+    server.shutdown()
+
+
+def test_graph_reproduces_bug(target_url):
+    from agent.orchestrator import run_agent
+    from storage import jobs as job_store
+
+    result = run_agent(BUG_REPORT, target_url, bypass_cache=True)
+
+    assert result["status"] == "done"
+    assert result["success"] is True
+    assert result["execution_result"]["error_type"] is None
+    assert job_store.get(result["job_id"])["success"] is True
+
+
+def test_missing_locator_fails_like_selenium(target_url, tmp_path):
+    from sandbox import runner
+
+    script = tmp_path / "attempt_1.py"
+    script.write_text(
+        "from selenium import webdriver\n"
+        "from selenium.webdriver.common.by import By\n"
+        "driver = webdriver.Chrome()\n"
+        f'driver.get("{target_url}")\n'
+        'driver.find_element(By.ID, "no-such-field").click()\n'
+        'print("REPRODUCED")\n'
+    )
+    result = runner.run(str(script), "fake-missing-locator")
+
+    assert result["exit_code"] == 1
+    assert result["error_type"] == "ElementNotFound"
+    assert "REPRODUCED" not in result["stdout"]
+
+
+def test_reproduced_in_omitted_middle_counts(monkeypatch, tmp_path):
+    from agent.nodes.evaluate import evaluate_node
+    from sandbox import runner
+    from utils import config
+
+    monkeypatch.setattr(config, "LOG_HEAD_BYTES", 100)
+    monkeypatch.setattr(config, "LOG_TAIL_BYTES", 100)
+    script = tmp_path / "attempt_1.py"
+    script.write_text(
+        "".join(f'print("Step {i}: filled in the form field")\n' for i in range(20))
+        + 'print("REPRODUCED")\n'
+        + "".join(f'print("dump line {i} of the page state")\n' for i in range(50))
+    )
+    result = runner.run(str(script), "fake-truncated-marker")
+
+    assert "REPRODUCED" not in result["stdout"]
+    assert result["reproduced"] is True
+    state = {"job_id": "fake-truncated-marker", "execution_result": result, "attempt_count": 1}
+    assert evaluate_node(state)["success"] is True
@@ -10,3 +10,123 @@ SANDBOX_MEMORY_MB: int       = int(os.getenv("SANDBOX_MEMORY_MB", "512"))
 SANDBOX_IMAGE: str           = os.getenv("SANDBOX_IMAGE", "autorepro-sandbox:latest")
 DATA_DIR: str                = os.getenv("DATA_DIR", "./data")
 LOG_LEVEL: str               = os.getenv("LOG_LEVEL", "INFO")
+
+# Warm container pool (POOL_MAX_SIZE=0 disables pooling; every attempt cold-starts)
+POOL_MIN_SIZE: int                  = int(os.getenv("POOL_MIN_SIZE", "2"))
+POOL_MAX_SIZE: int                  = int(os.getenv("POOL_MAX_SIZE", "0"))
+POOL_RECYCLE_AFTER: int             = int(os.getenv("POOL_RECYCLE_AFTER", "20"))
+POOL_LEASE_TIMEOUT_SECONDS: float   = float(os.getenv("POOL_LEASE_TIMEOUT_SECONDS", "2"))
+POOL_HEALTH_INTERVAL_SECONDS: float = float(os.getenv("POOL_HEALTH_INTERVAL_SECONDS", "30"))
+
+# Keep one headless Chromium per job alive across attempts (requires the warm pool)
+SANDBOX_BROWSER_SESSION: bool = os.getenv("SANDBOX_BROWSER_SESSION", "false").lower() in ("1", "true", "yes")
+
+# Job scheduler: workers, queue capacity (429 beyond it) and the global sandbox cap
+SCHEDULER_MODE: str                  = os.getenv("SCHEDULER_MODE", "threads")  # "threads", "async" or "remote"
+SCHEDULER_WORKERS: int               = int(os.getenv("SCHEDULER_WORKERS", "4"))
+SCHEDULER_MAX_QUEUE: int             = int(os.getenv("SCHEDULER_MAX_QUEUE", "100"))
+SCHEDULER_POLL_SECONDS: float        = float(os.getenv("SCHEDULER_POLL_SECONDS", "1"))
+SCHEDULER_RETRY_AFTER_SECONDS: int   = int(os.getenv("SCHEDULER_RETRY_AFTER_SECONDS", "30"))
+SANDBOX_MAX_CONTAINERS: int          = int(os.getenv("SANDBOX_MAX_CONTAINERS", "4"))
+
+# Job queue shared by the API and `python -m worker` processes: "sqlite" (DATA_DIR/queue.sqlite, on a
+# volume every node mounts) or "redis" (REDIS_URL, any Redis-compatible server; needs the redis package).
+# Whoever runs jobs heartbeats every WORKER_HEARTBEAT_SECONDS; the running jobs of a worker silent for
+# WORKER_HEARTBEAT_TIMEOUT_SECONDS are requeued and resume from their checkpoints elsewhere
+QUEUE_BACKEND: str                      = os.getenv("QUEUE_BACKEND", "sqlite")
+REDIS_URL: str                          = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+REDIS_QUEUE_PREFIX: str                 = os.getenv("REDIS_QUEUE_PREFIX", "autorepro")
+WORKER_HEARTBEAT_SECONDS: float         = float(os.getenv("WORKER_HEARTBEAT_SECONDS", "5"))
+WORKER_HEARTBEAT_TIMEOUT_SECONDS: float = float(os.getenv("WORKER_HEARTBEAT_TIMEOUT_SECONDS", "30"))
+
+# LLM response cache (analyze is cached by default; generate/refine only with LLM_CACHE_SAMPLED_NODES)
+LLM_CACHE_ENABLED: bool       = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+LLM_CACHE_SAMPLED_NODES: bool = os.getenv("LLM_CACHE_SAMPLED_NODES", "false").lower() in ("1", "true", "yes")
+LLM_CACHE_TTL_SECONDS: int    = int(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+LLM_CACHE_MAX_ENTRIES: int    = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+LLM_CACHE_MAX_MB: int         = int(os.getenv("LLM_CACHE_MAX_MB", "256"))
+
+# Duplicate submissions of a solved report re-run its script once instead of returning it as-is
+DEDUP_REVALIDATE: bool = os.getenv("DEDUP_REVALIDATE", "true").lower() in ("1", "true", "yes")
+
+# Checkpoint the agent graph after every node (DATA_DIR/cache/checkpoints.sqlite) so jobs interrupted
+# by a restart resume from their last completed node
+CHECKPOINTS_ENABLED: bool = os.getenv("CHECKPOINTS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Job persistence backend: "sqlite" (DATA_DIR/jobs.sqlite) or "json" (one file per job)
+JOB_STORE: str = os.getenv("JOB_STORE", "sqlite")
+
+# Attempt log segments roll over at this size
+ATTEMPT_LOG_SEGMENT_BYTES: int = int(os.getenv("ATTEMPT_LOG_SEGMENT_BYTES", str(4 * 1024 * 1024)))
+
+# Finish an attempt as soon as REPRODUCED or a fatal exception is printed, after a short grace for trailing output
+EARLY_EXIT_ENABLED: bool        = os.getenv("EARLY_EXIT_ENABLED", "true").lower() in ("1", "true", "yes")
+EARLY_EXIT_GRACE_SECONDS: float = float(os.getenv("EARLY_EXIT_GRACE_SECONDS", "1"))
+
+# Speculative fan-out: K candidate scripts per attempt raced in parallel sandboxes (1 disables it).
+# Candidate 0 uses the node's usual temperature; the rest cycle through FANOUT_TEMPERATURES.
+FANOUT_K: int                    = int(os.getenv("FANOUT_K", "1"))
+FANOUT_TEMPERATURES: list[float] = [float(t) for t in os.getenv("FANOUT_TEMPERATURES", "0.5,0.8,1.0").split(",")]
+
+# Batch ingestion (POST /reproduce/batch): size cap, default per-batch concurrency, queued batch jobs overall
+BATCH_MAX_JOBS: int       = int(os.getenv("BATCH_MAX_JOBS", "1000"))
+BATCH_CONCURRENCY: int    = int(os.getenv("BATCH_CONCURRENCY", "4"))
+BATCH_MAX_QUEUE: int      = int(os.getenv("BATCH_MAX_QUEUE", "5000"))
+BATCH_PRIME_ANALYZE: bool = os.getenv("BATCH_PRIME_ANALYZE", "true").lower() in ("1", "true", "yes")
+
+# LLM pricing used for the cost counters in /metrics and per-job timings (USD per million tokens)
+LLM_INPUT_COST_PER_MTOK: float  = float(os.getenv("LLM_INPUT_COST_PER_MTOK", "0"))
+LLM_OUTPUT_COST_PER_MTOK: float = float(os.getenv("LLM_OUTPUT_COST_PER_MTOK", "0"))
+
+# Sandbox backend: "docker", "subprocess" (confined local processes) or "fake" (in-process, no browser)
+SANDBOX_BACKEND: str                = os.getenv("SANDBOX_BACKEND", "docker")
+FAKE_SANDBOX_LATENCY_SECONDS: float = float(os.getenv("FAKE_SANDBOX_LATENCY_SECONDS", "0.2"))
+
+# MockLLM fault injection: added latency per call and the chance a generated script carries a broken
+# locator, per attempt (comma-separated; the last rate applies to every later attempt)
+MOCK_LLM_LATENCY_SECONDS: float     = float(os.getenv("MOCK_LLM_LATENCY_SECONDS", "0"))
+MOCK_LLM_LATENCY_JITTER: float      = float(os.getenv("MOCK_LLM_LATENCY_JITTER", "0"))
+MOCK_LLM_FAILURE_RATES: list[float] = [float(r) for r in os.getenv("MOCK_LLM_FAILURE_RATES", "0").split(",")]
+MOCK_LLM_SEED: int | None           = int(os.getenv("MOCK_LLM_SEED")) if os.getenv("MOCK_LLM_SEED") else None
+
+# Subprocess sandbox backend (SANDBOX_BACKEND=subprocess): interpreter with selenium installed, and
+# optional unshare(1) namespaces and seccomp deny-list around each script
+SUBPROCESS_PYTHON: str   = os.getenv("SUBPROCESS_PYTHON", "python3")
+SUBPROCESS_UNSHARE: bool = os.getenv("SUBPROCESS_UNSHARE", "false").lower() in ("1", "true", "yes")
+SUBPROCESS_SECCOMP: bool = os.getenv("SUBPROCESS_SECCOMP", "true").lower() in ("1", "true", "yes")
+
+# Shared Docker client: HTTP connections kept open (0 sizes it to SANDBOX_MAX_CONTAINERS), reconnect
+# retries per call, and how long a finished cold run waits for its "die" event before polling
+DOCKER_MAX_POOL_SIZE: int                = int(os.getenv("DOCKER_MAX_POOL_SIZE", "0"))
+DOCKER_RECONNECT_ATTEMPTS: int           = int(os.getenv("DOCKER_RECONNECT_ATTEMPTS", "3"))
+DOCKER_EXIT_EVENT_TIMEOUT_SECONDS: float = float(os.getenv("DOCKER_EXIT_EVENT_TIMEOUT_SECONDS", "5"))
+
+# Bounded log capture: head/tail bytes of each stream kept in results and prompts (the full output
+# goes to artifacts/<job>/logs/), and how many rule-matching lines are kept as error excerpts
+LOG_HEAD_BYTES: int    = int(os.getenv("LOG_HEAD_BYTES", str(16 * 1024)))
+LOG_TAIL_BYTES: int    = int(os.getenv("LOG_TAIL_BYTES", str(32 * 1024)))
+LOG_EXCERPT_LINES: int = int(os.getenv("LOG_EXCERPT_LINES", "20"))
+
+# Prompt token budget for generate/refine; sections are trimmed lowest-priority first to fit.
+# PROMPT_TOKENIZER is a tiktoken encoding (empty, or tiktoken unavailable: ~4 characters per token)
+PROMPT_TOKEN_BUDGET: int = int(os.getenv("PROMPT_TOKEN_BUDGET", "6000"))
+PROMPT_TOKENIZER: str    = os.getenv("PROMPT_TOKENIZER", "cl100k_base")
+
+# Re-read prompt templates when their files change (development); otherwise they are loaded once at startup
+PROMPTS_HOT_RELOAD: bool = os.getenv("PROMPTS_HOT_RELOAD", "false").lower() in ("1", "true", "yes")
+
+# Security policy: hosts scripts may not reference in URL literals (cloud metadata endpoints by
+# default), and how many script verdicts are memoised by hash
+SECURITY_BLOCKED_HOSTS: set[str] = {h.strip().lower() for h in os.getenv(
+    "SECURITY_BLOCKED_HOSTS", "169.254.169.254,metadata.google.internal,metadata,100.100.100.200,fd00:ec2::254",
+).split(",") if h.strip()}
+SECURITY_CACHE_SIZE: int         = int(os.getenv("SECURITY_CACHE_SIZE", "1024"))
+
+# Verified step fragments reused across jobs on the same target page (DATA_DIR/cache/fragments.sqlite)
+FRAGMENTS_ENABLED: bool  = os.getenv("FRAGMENTS_ENABLED", "true").lower() in ("1", "true", "yes")
+FRAGMENTS_MAX_LINES: int = int(os.getenv("FRAGMENTS_MAX_LINES", "40"))
+
+# Locators and page inventories learned per target host and path (DATA_DIR/cache/locators.sqlite)
+LOCATOR_INDEX_ENABLED: bool       = os.getenv("LOCATOR_INDEX_ENABLED", "true").lower() in ("1", "true", "yes")
+LOCATOR_INDEX_MAX_AGE_DAYS: float = float(os.getenv("LOCATOR_INDEX_MAX_AGE_DAYS", "30"))
+LOCATOR_INDEX_MAX_ROWS: int       = int(os.getenv("LOCATOR_INDEX_MAX_ROWS", "5000"))
@@ -0,0 +1,74 @@
+"""In-process pub/sub for job progress events, fanned out to SSE/WebSocket watchers.
+
+Publishers (graph nodes, the sandbox runner, the orchestrator) run in worker threads or on the
+event loop; each subscriber owns an asyncio.Queue on its own loop, so watchers never touch the
+job store and a slow watcher only drops its own oldest events.
+"""
+
+import asyncio
+import threading
+import time
+
+_subscribers: dict[str, set["Subscription"]] = {}
+_lock                                        = threading.Lock()
+
+TERMINAL = "end"
+
+
+class Subscription:
+    """A single watcher's bounded queue of events for one job."""
+
+    def __init__(self, job_id: str, maxsize: int = 1000):
+        self.job_id  = job_id
+        self.loop    = asyncio.get_running_loop()
+        self.queue   = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def _put(self, event: dict) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: float | None = None) -> dict | None:
+        """Next event, or None if nothing arrived within timeout."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        with _lock:
+            subs = _subscribers.get(self.job_id)
+            if subs is not None:
+                subs.discard(self)
+                if not subs:
+                    del _subscribers[self.job_id]
+
+
+def subscribe(job_id: str) -> Subscription:
+    """Register a watcher for a job's events. Must be called on the watcher's event loop."""
+    sub = Subscription(job_id)
+    with _lock:
+        _subscribers.setdefault(job_id, set()).add(sub)
+    return sub
+
+
+def publish(job_id: str, event_type: str, **fields) -> None:
+    """Deliver an event to every watcher of the job. Cheap no-op when nobody is watching."""
+    with _lock:
+        subs = list(_subscribers.get(job_id, ()))
+    if not subs:
+        return
+    event = {"type": event_type, "job_id": job_id, "ts": time.time(), **fields}
+    for sub in subs:
+        try:
+            sub.loop.call_soon_threadsafe(sub._put, event)
+        except RuntimeError:
+            sub.close()
+
+
+def watched(job_id: str) -> bool:
+    """True if anyone is currently subscribed to the job."""
+    with _lock:
+        return job_id in _subscribers
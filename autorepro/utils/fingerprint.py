@@ -0,0 +1,21 @@
+"""Request fingerprinting — identifies duplicate (bug_report, target_url) submissions."""
+
+import hashlib
+import re
+from urllib.parse import urlsplit, urlunsplit
+
+
+def _normalize_report(bug_report: str) -> str:
+    return re.sub(r"\s+", " ", bug_report).strip().lower()
+
+
+def _normalize_url(target_url: str) -> str:
+    parts = urlsplit(target_url.strip())
+    path  = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ""))
+
+
+def fingerprint(bug_report: str, target_url: str) -> str:
+    """Return a stable hash of the normalized bug report and target URL."""
+    raw = f"{_normalize_report(bug_report)}\n{_normalize_url(target_url)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
@@ -0,0 +1,37 @@
+"""Shared LLM clients — one chat model instance per (provider, model, temperature), reused by every node.
+
+Reusing the instance reuses its HTTP connection pool, so a node call costs the request itself
+rather than a new client and TLS handshake. The response cache wrapper is cheap and is built
+per call, since whether a call may be cached depends on the node and the job.
+"""
+
+import threading
+
+from utils import config
+from utils.llm_cache import CachedLLM
+
+_clients: dict[tuple[str, str, float], object] = {}
+_lock                                          = threading.Lock()
+
+
+def _client(temperature: float):
+    key = (config.LLM_PROVIDER, config.LLM_MODEL, temperature)
+    with _lock:
+        llm = _clients.get(key)
+        if llm is None:
+            if config.LLM_PROVIDER == "mock":
+                from utils.mock_llm import MockLLM
+                llm = MockLLM()
+            elif config.LLM_PROVIDER == "anthropic":
+                from langchain_anthropic import ChatAnthropic
+                llm = ChatAnthropic(model=config.LLM_MODEL, temperature=temperature)
+            else:
+                from langchain_openai import ChatOpenAI
+                llm = ChatOpenAI(model=config.LLM_MODEL, temperature=temperature)
+            _clients[key] = llm
+        return llm
+
+
+def get(temperature: float, cache: bool = True) -> CachedLLM:
+    """Return the configured LLM at the given temperature behind the response cache (if cache is on)."""
+    return CachedLLM(_client(temperature), temperature=temperature, enabled=cache)
@@ -0,0 +1,205 @@
+"""Content-addressed LLM response cache — SQLite under DATA_DIR with LRU + TTL eviction."""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from utils import config, tracing
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key          TEXT PRIMARY KEY,
+    content      TEXT NOT NULL,
+    size         INTEGER NOT NULL,
+    created_at   REAL NOT NULL,
+    accessed_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_lru ON responses (accessed_at);
+"""
+
+
+class CachedResponse:
+    """Mimics the .content attribute of a LangChain AI message."""
+
+    def __init__(self, content: str):
+        self.content = content
+
+
+def cache_key(provider: str, model: str, temperature: float, prompt: str) -> str:
+    """Hash of everything that determines the response."""
+    raw = json.dumps([provider, model, temperature, prompt], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """Thread-safe on-disk response store bounded by entry count, total bytes and age."""
+
+    def __init__(self, path: Path, ttl_seconds: float, max_entries: int, max_bytes: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes   = max_bytes
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock  = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "writes": 0}
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT content, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._stats["expired"] += 1
+                row = None
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._stats["hits"] += 1
+            return row[0]
+
+    def put(self, key: str, content: str) -> None:
+        now  = time.time()
+        size = len(content.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, content, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, content, size, now, now),
+            )
+            self._stats["writes"] += 1
+            self._evict()
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "entries":  entries,
+                "bytes":    size,
+                "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+            }
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until both the count and byte limits hold."""
+        entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if entries <= self.max_entries and size <= self.max_bytes:
+            return
+        evicted = 0
+        for key, entry_size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            if entries <= self.max_entries and size <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            entries -= 1
+            size    -= entry_size
+            evicted += 1
+        self._stats["evictions"] += evicted
+
+
+class CachedLLM:
+    """Wraps a LangChain chat model (or MockLLM); serves repeat prompts from the cache."""
+
+    def __init__(self, llm, temperature: float, enabled: bool = True):
+        self.llm         = llm
+        self.temperature = temperature
+        self.enabled     = enabled and get_cache() is not None
+
+    def key(self, prompt: str) -> str:
+        return cache_key(config.LLM_PROVIDER, config.LLM_MODEL, self.temperature, prompt)
+
+    def invoke(self, prompt: str):
+        start            = time.perf_counter()
+        response, cached = self._invoke(prompt)
+        tracing.llm_call(time.perf_counter() - start, prompt, cached, getattr(response, "usage_metadata", None))
+        return response
+
+    async def ainvoke(self, prompt: str):
+        start            = time.perf_counter()
+        response, cached = await self._ainvoke(prompt)
+        tracing.llm_call(time.perf_counter() - start, prompt, cached, getattr(response, "usage_metadata", None))
+        return response
+
+    def _invoke(self, prompt: str) -> tuple[object, bool]:
+        if not self.enabled:
+            return self.llm.invoke(prompt), False
+        key    = self.key(prompt)
+        cached = get_cache().get(key)
+        if cached is not None:
+            return CachedResponse(cached), True
+        response = self.llm.invoke(prompt)
+        get_cache().put(key, response.content)
+        return response, False
+
+    async def _ainvoke(self, prompt: str) -> tuple[object, bool]:
+        if not self.enabled:
+            return await self.llm.ainvoke(prompt), False
+        key    = self.key(prompt)
+        cached = await asyncio.to_thread(get_cache().get, key)
+        if cached is not None:
+            return CachedResponse(cached), True
+        response = await self.llm.ainvoke(prompt)
+        await asyncio.to_thread(get_cache().put, key, response.content)
+        return response, False
+
+    def batch(self, prompts: list[str], max_concurrency: int | None = None) -> list:
+        """Answer many prompts at once: hits from the cache, misses in one llm.batch() call."""
+        keys    = [self.key(p) for p in prompts] if self.enabled else [None] * len(prompts)
+        cached  = [get_cache().get(k) if k else None for k in keys]
+        missing = [i for i, c in enumerate(cached) if c is None]
+        answers = []
+        if missing:
+            start   = time.perf_counter()
+            answers = self.llm.batch([prompts[i] for i in missing], config={"max_concurrency": max_concurrency})
+            each    = (time.perf_counter() - start) / len(missing)
+        out = [CachedResponse(c) if c is not None else None for c in cached]
+        for i, response in zip(missing, answers):
+            if self.enabled:
+                get_cache().put(keys[i], response.content)
+            tracing.llm_call(each, prompts[i], False, getattr(response, "usage_metadata", None))
+            out[i] = response
+        return out
+
+    def discard(self, prompt: str) -> None:
+        """Forget a cached response, e.g. one the caller found malformed."""
+        if self.enabled:
+            get_cache().discard(self.key(prompt))
+
+
+_cache: LLMCache | None = None
+_cache_lock             = threading.Lock()
+
+
+def get_cache() -> LLMCache | None:
+    """Return the process-wide cache, or None when caching is disabled."""
+    global _cache
+    if not config.LLM_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache(
+                Path(config.DATA_DIR) / "cache" / "llm.sqlite",
+                ttl_seconds=config.LLM_CACHE_TTL_SECONDS,
+                max_entries=config.LLM_CACHE_MAX_ENTRIES,
+                max_bytes=config.LLM_CACHE_MAX_MB * 1024 * 1024,
+            )
+        return _cache
+
+
+def stats() -> dict:
+    """Return cache counters, or a disabled marker."""
+    cache = get_cache()
+    return cache.stats() if cache is not None else {"enabled": False}
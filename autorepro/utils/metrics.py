@@ -0,0 +1,152 @@
+"""Process-wide Prometheus metrics — counters, histograms and scrape-time gauges in text format 0.0.4.
+
+A deliberately small registry (no prometheus_client dependency): label values are passed as
+keyword arguments and every metric renders itself for GET /metrics.
+"""
+
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable
+
+_registry: list["_Metric"] = []
+_lock                      = threading.Lock()
+
+# Seconds; spans from sub-millisecond store writes up to full sandbox runs and LLM calls.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+class _Metric(ABC):
+    """A registered metric; subclasses render their samples."""
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name   = name
+        self.help   = help
+        self.labels = labels
+        with _lock:
+            _registry.append(self)
+
+    def _key(self, values: dict) -> tuple:
+        return tuple(values.get(n, "") for n in self.labels)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *self._samples()]
+
+    @abstractmethod
+    def _samples(self) -> list[str]:
+        """Sample lines in exposition format."""
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set."""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with _lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self) -> list[str]:
+        with _lock:
+            return [f"{self.name}{_labels(self.labels, k)} {v}" for k, v in self._values.items()]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket distribution of observed values per label set."""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._values: dict[tuple, list] = {}  # key -> [bucket counts..., sum, count]
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with _lock:
+            v = self._values.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    v[i] += 1
+            v[-2] += value
+            v[-1] += 1
+
+    def _samples(self) -> list[str]:
+        out = []
+        with _lock:
+            for key, v in self._values.items():
+                for bound, n in zip(self.buckets, v):
+                    out.append(f"{self.name}_bucket{_labels(self.labels + ('le',), key + (bound,))} {n}")
+                out.append(f"{self.name}_bucket{_labels(self.labels + ('le',), key + ('+Inf',))} {v[-1]}")
+                out.append(f"{self.name}_sum{_labels(self.labels, key)} {round(v[-2], 6)}")
+                out.append(f"{self.name}_count{_labels(self.labels, key)} {v[-1]}")
+        return out
+
+
+class Gauge(_Metric):
+    """Value read at scrape time from a callback returning a number, or {label value: number}."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, fn: Callable[[], float | dict], label: str | None = None):
+        super().__init__(name, help, (label,) if label else ())
+        self.fn = fn
+
+    def _samples(self) -> list[str]:
+        try:
+            value = self.fn()
+        except Exception:
+            return []
+        if isinstance(value, dict):
+            return [f"{self.name}{_labels(self.labels, (k,))} {v}" for k, v in value.items()]
+        return [f"{self.name} {value}"]
+
+
+def render() -> str:
+    """Text exposition of every registered metric."""
+    with _lock:
+        metrics = list(_registry)
+    return "\n".join(line for m in metrics for line in m.render()) + "\n"
+
+
+NODE_SECONDS = Histogram(
+    "autorepro_node_duration_seconds", "Time spent in each agent graph node.", ("node",))
+SANDBOX_PHASE_SECONDS = Histogram(
+    "autorepro_sandbox_phase_seconds", "Time spent in each phase of a sandbox run.", ("phase", "pooled"))
+LLM_SECONDS = Histogram(
+    "autorepro_llm_request_duration_seconds", "LLM call latency, including cache lookups.", ("node", "cached"))
+LLM_PROMPT_CHARS = Histogram(
+    "autorepro_llm_prompt_chars", "Rendered prompt size in characters.", ("node",),
+    buckets=(500, 1000, 2000, 4000, 8000, 16000, 32000, 64000, 128000))
+LLM_PROMPT_TOKENS = Histogram(
+    "autorepro_llm_prompt_tokens", "Rendered prompt size in tokens (see PROMPT_TOKENIZER).", ("node",),
+    buckets=(250, 500, 1000, 2000, 4000, 8000, 16000, 32000))
+PROMPT_SECTION_TOKENS = Histogram(
+    "autorepro_prompt_section_tokens", "Tokens per prompt section after budget trimming.", ("node", "section"),
+    buckets=(0, 50, 100, 250, 500, 1000, 2000, 4000, 8000))
+PROMPT_TRIMS = Counter(
+    "autorepro_prompt_trims_total", "Prompts that had sections trimmed to fit PROMPT_TOKEN_BUDGET.", ("node",))
+LLM_TOKENS = Counter(
+    "autorepro_llm_tokens_total", "LLM tokens reported by the provider.", ("node", "kind"))
+LLM_COST = Counter(
+    "autorepro_llm_cost_usd_total", "Estimated LLM spend from LLM_*_COST_PER_MTOK.", ("node",))
+STORE_SECONDS = Histogram(
+    "autorepro_job_store_seconds", "Job store operation latency.", ("op",))
+JOBS = Counter(
+    "autorepro_jobs_total", "Finished jobs by final status and outcome.", ("status", "success"))
+JOB_SECONDS = Histogram(
+    "autorepro_job_duration_seconds", "Wall-clock time from job start to completion.", ())
+DOCKER_RECONNECTS = Counter(
+    "autorepro_docker_reconnects_total", "Times the shared Docker client was rebuilt after a connection failure.")
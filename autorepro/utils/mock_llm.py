@@ -1,6 +1,22 @@
-"""Mock LLM for testing without API keys. Returns realistic hardcoded responses."""
+"""Mock LLM for testing without API keys. Returns realistic hardcoded responses.
 
+Latency and per-attempt script failures can be injected through the MOCK_LLM_* settings, so the
+benchmark harness can exercise retries without a real model.
+"""
+
+import asyncio
 import json
+import random
+import re
+import time
+
+from utils import config
+
+_ATTEMPT  = re.compile(r"^Attempt \d+:", re.MULTILINE)
+_FRAGMENT = re.compile(r"^# @fragment ([0-9a-f]{10}) — step (\d+):", re.MULTILINE)
+
+# Shared so a seeded run draws one reproducible sequence across every MockLLM instance.
+_rng = random.Random(config.MOCK_LLM_SEED)
 
 
 class MockResponse:
@@ -15,6 +31,24 @@ class MockLLM:
 
     def invoke(self, prompt: str) -> MockResponse:
         """Return a realistic mock response based on the prompt type."""
+        time.sleep(self._latency())
+        return self._respond(prompt)
+
+    async def ainvoke(self, prompt: str) -> MockResponse:
+        """Async variant of invoke."""
+        await asyncio.sleep(self._latency())
+        return self._respond(prompt)
+
+    def batch(self, prompts: list[str], config: dict | None = None) -> list[MockResponse]:
+        """Batch variant of invoke; the prompts are answered together, so latency is paid once."""
+        time.sleep(self._latency())
+        return [self._respond(p) for p in prompts]
+
+    def _latency(self) -> float:
+        jitter = config.MOCK_LLM_LATENCY_JITTER
+        return max(0.0, config.MOCK_LLM_LATENCY_SECONDS + (_rng.uniform(-jitter, jitter) if jitter else 0.0))
+
+    def _respond(self, prompt: str) -> MockResponse:
         if "Analyse the bug report" in prompt or "Analyze the bug report" in prompt:
             return MockResponse(json.dumps({
                 "inferred_steps": [
@@ -52,65 +86,43 @@ class MockLLM:
         return MockResponse('{"error": "unknown prompt type"}')
 
     def _generate_script(self, prompt: str) -> str:
-        """Generate a mock Selenium script."""
+        """Generate a mock Selenium script, with a broken submit locator at the attempt's failure rate.
+
+        Steps the prompt offers verified fragments for are written as fragment references, except
+        a submit step drawn to fail, which is always written out with its broken locator.
+        """
         # Extract target URL from prompt if present
-        import re
         url_match = re.search(r'Target URL:\s*(\S+)', prompt)
         target_url = url_match.group(1) if url_match else "http://host.docker.internal:8080/login"
 
-        return f'''import time
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-
-driver = None
-try:
-    print("Step 1: Setting up Chrome driver")
-    options = Options()
-    options.add_argument("--headless")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.binary_location = "/usr/bin/chromium"
-    service = Service("/usr/bin/chromedriver")
-    driver = webdriver.Chrome(service=service, options=options)
-
-    print("Step 2: Navigating to login page")
-    driver.get("{target_url}")
-
-    print("Step 3: Entering username")
-    username_field = WebDriverWait(driver, 10).until(
-        EC.presence_of_element_located((By.ID, "username"))
-    )
-    username_field.send_keys("testuser")
-
-    print("Step 4: Entering password")
-    password_field = driver.find_element(By.ID, "password")
-    password_field.send_keys("correctpassword123")
-
-    print("Step 5: Clicking submit button")
-    submit_button = driver.find_element(By.ID, "submit")
-    submit_button.click()
-
-    print("Step 6: Checking for error message")
-    error_element = WebDriverWait(driver, 10).until(
-        EC.presence_of_element_located((By.ID, "error"))
-    )
-
-    if "Invalid credentials" in error_element.text:
-        print("Bug confirmed: Login shows Invalid credentials even with correct credentials")
-        print("REPRODUCED")
-    else:
-        raise AssertionError(f"Expected 'Invalid credentials' but got: {{error_element.text}}")
-
-except Exception as e:
-    print(f"Error: {{e}}")
-    if driver:
-        driver.save_screenshot(f"/screenshots/failure_{{int(time.time())}}.png")
-    raise
-finally:
-    if driver:
-        driver.quit()
-'''
+        # Prompts list one "Attempt N:" line per earlier attempt.
+        rates     = config.MOCK_LLM_FAILURE_RATES
+        attempt   = len(_ATTEMPT.findall(prompt)) + 1
+        broken    = _rng.random() < rates[min(attempt, len(rates)) - 1]
+        submit_id = "submit-button" if broken else "submit"
+        offered   = {int(n): fid for fid, n in _FRAGMENT.findall(prompt)}
+        if broken:
+            offered.pop(4, None)
+
+        steps = {
+            1: f'step(1, "Navigating to login page")\ndriver.get("{target_url}")',
+            2: 'step(2, "Entering username")\ntype_text(driver, By.ID, "username", "testuser")',
+            3: 'step(3, "Entering password")\ntype_text(driver, By.ID, "password", "correctpassword123")',
+            4: f'step(4, "Clicking submit button")\nclick(driver, By.ID, "{submit_id}")',
+            5: ('step(5, "Checking for error message")\n'
+                'error_element = wait_for(driver, By.ID, "error")\n'
+                'if "Invalid credentials" in error_element.text:\n'
+                '    reproduced("Login shows Invalid credentials even with correct credentials")\n'
+                'else:\n'
+                '    raise AssertionError(f"Expected \'Invalid credentials\' but got: {error_element.text}")'),
+        }
+        body = "\n\n".join(
+            f"# @step {n}\n" + (f"# @fragment {offered[n]}" if n in offered else code)
+            for n, code in steps.items()
+        )
+        return (
+            "from autorepro_helpers import By, click, reproduced, session, step, type_text, wait_for\n\n"
+            "with session() as driver:\n"
+            + "\n".join(f"    {line}" if line else "" for line in body.splitlines())
+            + "\n"
+        )
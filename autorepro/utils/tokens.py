@@ -0,0 +1,52 @@
+"""Token counting for prompt budgets — tiktoken when it is installed and its encoding loads, else an estimate.
+
+The estimate (about four characters per token) is what the budget falls back to offline; it is
+close enough for English prose and code to keep prompts within a budget, not to bill by.
+"""
+
+import math
+import threading
+
+from utils import config
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+CHARS_PER_TOKEN = 4
+
+_encoding = None
+_loaded   = False
+_lock     = threading.Lock()
+
+
+def _get_encoding():
+    """Load PROMPT_TOKENIZER once; None if it is unset, tiktoken is missing or the encoding can't be fetched."""
+    global _encoding, _loaded
+    with _lock:
+        if not _loaded:
+            _loaded = True
+            if config.PROMPT_TOKENIZER:
+                try:
+                    import tiktoken
+                    _encoding = tiktoken.get_encoding(config.PROMPT_TOKENIZER)
+                except Exception as e:
+                    log.warning("tokenizer_unavailable", tokenizer=config.PROMPT_TOKENIZER, error=str(e))
+        return _encoding
+
+
+def count(text: str) -> int:
+    """Number of tokens in text."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def chars_for(text: str, tokens: int) -> int:
+    """Roughly how many leading characters of text make up the given number of tokens."""
+    total = count(text)
+    if total <= tokens:
+        return len(text)
+    return int(len(text) * tokens / total)
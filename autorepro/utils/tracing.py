@@ -0,0 +1,134 @@
+"""Per-job timing spans and LLM usage, summarised onto the job document when it finishes.
+
+The job and graph node being executed are carried in context variables, so code deep in the
+call stack (the LLM wrapper, the sandbox runner) can attribute its spans without new arguments.
+Worker threads started on a job's behalf must run under bind() to inherit them.
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+from utils import config, metrics, tokens
+
+_job  = contextvars.ContextVar("autorepro_job", default=None)
+_node = contextvars.ContextVar("autorepro_node", default=None)
+
+_jobs: dict[str, dict] = {}
+_lock                  = threading.Lock()
+
+
+def begin(job_id: str) -> None:
+    """Start collecting spans for a job."""
+    with _lock:
+        _jobs[job_id] = {"started": time.time(), "spans": {}, "llm": {
+            "calls": 0, "cached": 0, "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0,
+            "prompt_tokens": 0, "max_prompt_tokens": 0,
+        }}
+
+
+def finish(job_id: str) -> dict:
+    """Stop collecting spans for a job and return its timing summary."""
+    with _lock:
+        data = _jobs.pop(job_id, None)
+    if data is None:
+        return {}
+    return {
+        "wall_seconds": round(time.time() - data["started"], 3),
+        "spans": {
+            name: {**s, "seconds": round(s["seconds"], 4), "max_seconds": round(s["max_seconds"], 4)}
+            for name, s in sorted(data["spans"].items())
+        },
+        "llm": {**data["llm"], "cost_usd": round(data["llm"]["cost_usd"], 6)},
+    }
+
+
+def current_job() -> str | None:
+    return _job.get()
+
+
+def current_node() -> str | None:
+    return _node.get()
+
+
+@contextmanager
+def node_scope(job_id: str, node: str):
+    """Attribute everything run inside the block to the given job and graph node."""
+    job_token  = _job.set(job_id)
+    node_token = _node.set(node)
+    try:
+        yield
+    finally:
+        _node.reset(node_token)
+        _job.reset(job_token)
+
+
+def bind(fn: Callable) -> Callable:
+    """Wrap fn so it runs with the caller's job/node context, e.g. in a thread pool."""
+    ctx = contextvars.copy_context()
+    return lambda *args, **kwargs: ctx.copy().run(fn, *args, **kwargs)
+
+
+def record(job_id: str | None, name: str, seconds: float) -> None:
+    """Add one timed occurrence of a span to the job's summary."""
+    if job_id is None:
+        return
+    with _lock:
+        data = _jobs.get(job_id)
+        if data is None:
+            return
+        s = data["spans"].setdefault(name, {"count": 0, "seconds": 0.0, "max_seconds": 0.0})
+        s["count"]       += 1
+        s["seconds"]     += seconds
+        s["max_seconds"]  = max(s["max_seconds"], seconds)
+
+
+@contextmanager
+def span(name: str, job_id: str | None = None, histogram: "metrics.Histogram | None" = None, **labels):
+    """Time the block as a span of the job (defaulting to the current one) and optionally a histogram."""
+    job_id = job_id or _job.get()
+    start  = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        record(job_id, name, seconds)
+        if histogram is not None:
+            histogram.observe(seconds, **labels)
+
+
+def llm_call(seconds: float, prompt: str, cached: bool, usage: dict | None) -> None:
+    """Record one LLM call against the current job and node: latency, prompt size and tokens, usage and cost."""
+    job_id = _job.get()
+    node   = _node.get() or "unknown"
+    usage  = usage or {}
+    inp    = usage.get("input_tokens", 0) or 0
+    out    = usage.get("output_tokens", 0) or 0
+    cost   = (inp * config.LLM_INPUT_COST_PER_MTOK + out * config.LLM_OUTPUT_COST_PER_MTOK) / 1_000_000
+
+    metrics.LLM_SECONDS.observe(seconds, node=node, cached=str(cached).lower())
+    prompt_tokens = tokens.count(prompt)
+    metrics.LLM_PROMPT_CHARS.observe(len(prompt), node=node)
+    metrics.LLM_PROMPT_TOKENS.observe(prompt_tokens, node=node)
+    if inp or out:
+        metrics.LLM_TOKENS.inc(inp, node=node, kind="input")
+        metrics.LLM_TOKENS.inc(out, node=node, kind="output")
+        metrics.LLM_COST.inc(cost, node=node)
+
+    record(job_id, f"llm.{node}", seconds)
+    if job_id is None:
+        return
+    with _lock:
+        data = _jobs.get(job_id)
+        if data is None:
+            return
+        llm = data["llm"]
+        llm["calls"]         += 1
+        llm["cached"]        += int(cached)
+        llm["input_tokens"]  += inp
+        llm["output_tokens"] += out
+        llm["cost_usd"]      += cost
+        llm["prompt_tokens"] += prompt_tokens
+        llm["max_prompt_tokens"] = max(llm["max_prompt_tokens"], prompt_tokens)
@@ -0,0 +1,65 @@
+"""Worker node — runs jobs from the shared queue on this host's sandbox backend.
+
+Start any number of these, on any hosts that share DATA_DIR (job store, checkpoints and artifacts,
+plus the queue unless QUEUE_BACKEND=redis), next to an API running with SCHEDULER_MODE=remote:
+
+    python -m worker [--workers 4]
+
+Each claims jobs, runs them with run_agent against its own Docker daemon (or SANDBOX_BACKEND) and
+heartbeats. SIGTERM/SIGINT stops claiming and waits for the jobs in flight; a second one exits at once,
+and the jobs left are requeued by the other nodes once the heartbeat times out, resuming from their
+checkpoints.
+"""
+
+import argparse
+import signal
+import socket
+import threading
+import uuid
+from pathlib import Path
+
+from prompts import registry
+from sandbox import runner
+from scheduler import workers as scheduler
+from utils import config
+from utils.logger import get_logger
+
+log = get_logger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AutoRepro worker node.")
+    parser.add_argument("--workers", type=int, default=config.SCHEDULER_WORKERS, help="jobs run at once")
+    parser.add_argument("--name", default=f"worker-{socket.gethostname()}-{uuid.uuid4().hex[:6]}",
+                        help="name this node heartbeats under")
+    args = parser.parse_args()
+
+    registry.load()
+    Path(config.DATA_DIR, "jobs").mkdir(parents=True, exist_ok=True)
+    Path(config.DATA_DIR, "artifacts").mkdir(parents=True, exist_ok=True)
+    runner.start()
+
+    stop = threading.Event()
+
+    def on_signal(signum, frame):
+        if stop.is_set():
+            raise SystemExit(1)
+        log.info("worker_stopping", signal=signal.Signals(signum).name)
+        stop.set()
+
+    signal.signal(signal.SIGTERM, on_signal)
+    signal.signal(signal.SIGINT, on_signal)
+
+    node = scheduler.Scheduler(args.workers, config.SCHEDULER_MAX_QUEUE, "threads", name=args.name)
+    node.start()
+    log.info("worker_started", name=args.name, workers=args.workers, queue=config.QUEUE_BACKEND,
+             backend=config.SANDBOX_BACKEND)
+    stop.wait()
+    node.shutdown()
+    node.join()
+    runner.shutdown()
+    log.info("worker_stopped", name=args.name)
+
+
+if __name__ == "__main__":
+    main()